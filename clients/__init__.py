@@ -1,9 +1,69 @@
 """Модуль реализующий API клиенты"""
 
-from ._request import Handler
-from .users.users import UsersClient
+from ._batch import BatchResult, BatchResults, RequestBatch
+from ._cache import CacheStats, ResponseCache
+from ._cassette import Cassette, CassetteMiss, CassetteMode
+from ._histogram import LatencyHistogram
+from ._journal import RequestJournal, journal
+from ._json import JsonListView, JsonView, register_decoder
+from ._load import LoadContext, LoadReport, LoadRunner, Operation
+from ._paginate import CursorPagination, LinkPagination, OffsetPagination, PagePagination, Pagination, Paginator
+from ._request import AsyncRequest, AsyncWaitRequest, Handler, Request
+from ._route import Route, RouteTable
+from ._session import AsyncSession, PoolStats
+from ._stream import StreamError, StreamStats, iter_json_array
+from ._timings import EndpointTimings, timings
+from ._wait import ExponentialBackoff, FastThenSlow, Poller, RetryAfter, WaitRequestError, WaitStats, WaitStrategy
+from ._wait_group import wait_all, wait_any
+from .users.users import AsyncUsersClient, UsersClient
 
 __all__ = [
+    "AsyncRequest",
+    "AsyncSession",
+    "AsyncUsersClient",
+    "AsyncWaitRequest",
+    "BatchResult",
+    "BatchResults",
+    "CacheStats",
+    "Cassette",
+    "CassetteMiss",
+    "CassetteMode",
+    "CursorPagination",
+    "EndpointTimings",
+    "ExponentialBackoff",
+    "FastThenSlow",
     "Handler",
+    "JsonListView",
+    "JsonView",
+    "LatencyHistogram",
+    "LinkPagination",
+    "LoadContext",
+    "LoadReport",
+    "LoadRunner",
+    "OffsetPagination",
+    "Operation",
+    "PagePagination",
+    "Pagination",
+    "Paginator",
+    "Poller",
+    "PoolStats",
+    "Request",
+    "RequestBatch",
+    "RequestJournal",
+    "ResponseCache",
+    "RetryAfter",
+    "Route",
+    "RouteTable",
+    "StreamError",
+    "StreamStats",
     "UsersClient",
+    "WaitRequestError",
+    "WaitStats",
+    "WaitStrategy",
+    "iter_json_array",
+    "journal",
+    "register_decoder",
+    "timings",
+    "wait_all",
+    "wait_any",
 ]
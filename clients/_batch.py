@@ -0,0 +1,168 @@
+"""Параллельное выполнение подготовленных запросов"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Callable, Iterable, Self
+
+from pydantic import ValidationError
+from requests import Response
+
+from src.cases import step
+
+from ._request import Handler, Request
+from ._session import DEFAULT_CONCURRENCY
+from ._validation import Schema, validate
+
+logger = logging.getLogger(__package__)
+
+
+class BatchStage(StrEnum):
+    """Этап обработки запроса в пакете"""
+
+    REQUEST = "request"
+    STATUS = "status"
+    HANDLER = "handler"
+    SCHEMA = "schema"
+
+
+@dataclass(slots=True, kw_only=True)
+class BatchItem:
+    """Запрос пакета и ожидания к его ответу"""
+
+    request: Request
+    status: int
+    handler: Callable[[Response], Any] | str | None = Handler.json
+    schema: Schema | None = None
+
+
+@dataclass(slots=True, kw_only=True)
+class BatchResult:
+    """Результат выполнения одного запроса пакета"""
+
+    request: Request
+    response: Response | None = None
+    result: Any = None
+    model: Any = None
+    error: BaseException | None = None
+    stage: BatchStage | None = None
+    schema_error: ValidationError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Все проверки пройдены"""
+        return self.error is None and self.schema_error is None
+
+    def __str__(self) -> str:
+        if self.ok:
+            return f"{self.request}: ok"
+        return f"{self.request}: {self.stage} {self.error or self.schema_error}"
+
+
+class BatchResults(list[BatchResult]):
+    """Результаты пакета в порядке добавления запросов"""
+
+    @property
+    def failed(self) -> list[BatchResult]:
+        """Результаты с ошибками"""
+        return [item for item in self if not item.ok]
+
+    @property
+    def results(self) -> list[Any]:
+        """Результаты обработки хендлерами"""
+        return [item.result for item in self]
+
+    @property
+    def models(self) -> list[Any]:
+        """Провалидированные модели схем"""
+        return [item.model for item in self]
+
+    def raise_for_errors(self) -> Self:
+        """Упасть со списком всех ошибок пакета"""
+        failed = self.failed
+        assert not failed, f"Batch errors {len(failed)}/{len(self)}:\n" + "\n".join(str(item) for item in failed)
+        return self
+
+
+class RequestBatch:
+    """
+    Пакет подготовленных запросов
+    Сетевая часть выполняется в ограниченном пуле потоков поверх пула соединений сессии,
+    проверки и степы выполняются в вызывающем потоке в порядке добавления запросов.
+    Ошибки не прерывают пакет, а собираются в результаты
+    """
+
+    def __init__(
+        self,
+        requests: Iterable[Request] = (),
+        *,
+        status: int | None = None,
+        handler: Callable[[Response], Any] | str | None = Handler.json,
+        schema: Schema | None = None,
+        workers: int = DEFAULT_CONCURRENCY,
+    ):
+        """
+        :param requests: Запросы с общими ожиданиями status/handler/schema
+        :param workers: Размер пула потоков. Не стоит делать больше размера пула соединений сессии
+        """
+        self._items: list[BatchItem] = []
+        self._workers = workers
+        for request in requests:
+            assert status is not None, "Status is required for requests passed to the constructor"
+            self.add(request, status=status, handler=handler, schema=schema)
+
+    def add(
+        self,
+        request: Request,
+        *,
+        status: int,
+        handler: Callable[[Response], Any] | str | None = Handler.json,
+        schema: Schema | None = None,
+    ) -> Self:
+        """Добавить запрос в пакет"""
+        self._items.append(BatchItem(request=request, status=status, handler=handler, schema=schema))
+        return self
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def run(self, step_name: str | None = None) -> BatchResults:
+        """Выполнить все запросы пакета"""
+        results = BatchResults()
+        if not self._items:
+            return results
+        with step(_title=step_name):
+            with ThreadPoolExecutor(max_workers=min(self._workers, len(self._items))) as executor:
+                futures = [executor.submit(item.request._send) for item in self._items]  # pylint: disable=W0212
+                for item, future in zip(self._items, futures):
+                    results.append(self._process(item, future))
+        logger.debug(f"Batch done: {len(results) - len(results.failed)}/{len(results)} ok")
+        return results
+
+    @staticmethod
+    def _process(item: BatchItem, future: Future[Response]) -> BatchResult:
+        """Проверки ответа одного запроса"""
+        # pylint: disable=protected-access
+        request = item.request
+        result = BatchResult(request=request)
+        with step(f"Запрос: {request.method} {request.endpoint}"):
+            if (error := future.exception()) is not None:
+                result.error, result.stage = error, BatchStage.REQUEST
+                return result
+            result.response = future.result()
+        stage = BatchStage.STATUS
+        try:
+            request._check_status(result.response, item.status)
+            stage = BatchStage.HANDLER
+            result.result = request._handle(result.response, item.handler)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            result.error, result.stage = err, stage
+            return result
+        if item.schema is not None:
+            with step(f"Валидация схемой: {getattr(item.schema, '__name__', item.schema)}"):
+                try:
+                    result.model = validate(result.result, item.schema)
+                except ValidationError as err:
+                    result.schema_error, result.stage = err, BatchStage.SCHEMA
+        return result
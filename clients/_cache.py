@@ -0,0 +1,173 @@
+"""Кеш ответов идемпотентных запросов с TTL, LRU вытеснением и условной ревалидацией"""
+
+import copy
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Final, Iterable, Mapping
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__package__)
+
+DEFAULT_TTL: Final[float] = 60.0
+DEFAULT_MAXSIZE: Final[int] = 256
+# Методы, ответы которых кешируются
+CACHEABLE_METHODS: Final[frozenset[str]] = frozenset({"GET", "HEAD"})
+# Хедеры запроса, от которых зависит ответ
+DEFAULT_VARY: Final[tuple[str, ...]] = ("Authorization", "Accept", "Accept-Language")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+CacheKey = tuple[Any, ...]
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Счетчики кеша"""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+    evictions: int = 0
+    bypassed: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Словарь для отчета"""
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class _Entry:
+    response: Response
+    expires: float
+    etag: str | None
+    last_modified: str | None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires
+
+    @property
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Кеш ответов в памяти. Ключ: метод, итоговый url, query и значимые хедеры запроса.
+    Устаревший ответ с ETag/Last-Modified ревалидируется условным запросом, 304 продлевает запись
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE, vary: Iterable[str] = DEFAULT_VARY):
+        """
+        :param ttl: Время жизни записи в секундах, Cache-Control: max-age ответа может его уменьшить
+        :param maxsize: Максимальное число записей, при превышении вытесняются давно использованные
+        :param vary: Хедеры запроса, входящие в ключ
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.vary = tuple(vary)
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, method: str, url: str, kwargs: Mapping[str, Any], headers: Mapping[str, Any]) -> CacheKey | None:
+        """Ключ запроса. None - запрос не кешируется"""
+        if method not in CACHEABLE_METHODS or kwargs.get("json") is not None or kwargs.get("data") is not None:
+            return None
+        params = kwargs.get("params") or ()
+        if isinstance(params, Mapping):
+            params = sorted(params.items(), key=lambda item: str(item[0]))
+        merged = CaseInsensitiveDict(headers)
+        merged.update(kwargs.get("headers") or {})
+        return method, url, repr(params), tuple(merged.get(name) for name in self.vary)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        kwargs: dict[str, Any],
+        *,
+        headers: Mapping[str, Any],
+        send: Callable[[str, str, dict[str, Any]], Response],
+    ) -> Response:
+        """
+        Ответ из кеша или отправка запроса
+        :param headers: Хедеры сессии
+        :param send: Отправка запроса: send(method, url, kwargs)
+        """
+        if (key := self.key(method, url, kwargs, headers)) is None:
+            with self._lock:
+                self.stats.bypassed += 1
+            return send(method, url, kwargs)
+        entry, cached = self._lookup(key)
+        if cached is not None:
+            logger.debug(f"Cache hit: {method} {url}")
+            return cached
+        if entry is not None and entry.validators:
+            kwargs = kwargs | {"headers": (kwargs.get("headers") or {}) | entry.validators}
+        response = send(method, url, kwargs)
+        if entry is not None and response.status_code == 304:
+            logger.debug(f"Cache revalidated: {method} {url}")
+            with self._lock:
+                self.stats.revalidated += 1
+                entry.expires = self._expires(response)
+            return copy.copy(entry.response)
+        with self._lock:
+            self.stats.misses += 1
+        self._store(key, response)
+        return response
+
+    def _lookup(self, key: CacheKey) -> tuple[_Entry | None, Response | None]:
+        """Запись по ключу и копия ее ответа, если запись свежая"""
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None, None
+            self._entries.move_to_end(key)
+            if not entry.fresh:
+                return entry, None
+            self.stats.hits += 1
+            return entry, copy.copy(entry.response)
+
+    def _expires(self, response: Response) -> float:
+        ttl = self.ttl
+        if match := _MAX_AGE.search(response.headers.get("Cache-Control", "")):
+            ttl = min(ttl, float(match.group(1)))
+        return time.monotonic() + ttl
+
+    def _store(self, key: CacheKey, response: Response) -> None:
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        entry = _Entry(
+            response=response,
+            expires=self._expires(response),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self.stats.stores += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Очистить записи и счетчики"""
+        with self._lock:
+            self._entries.clear()
+            self.stats = CacheStats()
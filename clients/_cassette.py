@@ -0,0 +1,236 @@
+"""
+Запись и воспроизведение обменов сессии через JSONL кассету
+Каждая строка кассеты - один обмен, ключ сопоставления записан первым полем, поэтому индекс
+строится по mmap файла без разбора json, а тело записи разбирается только при воспроизведении
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from collections import deque
+from datetime import timedelta
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Callable, Final, Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__package__)
+
+# Правила сопоставления запросов: method, template, path, query, body
+MATCH_RULES: Final[tuple[str, ...]] = ("method", "template", "path", "query", "body")
+DEFAULT_MATCH: Final[tuple[str, ...]] = ("method", "path", "query", "body")
+
+_KEY_PREFIX: Final[bytes] = b'{"key": "'
+_KEY_LENGTH: Final[int] = 40
+
+
+class CassetteMode(StrEnum):
+    """Режим кассеты"""
+
+    RECORD = "record"  # Запросы отправляются, обмены дописываются в кассету
+    REPLAY = "replay"  # Ответы только из кассеты, без сети
+    AUTO = "auto"  # Ответ из кассеты, если найден, иначе запрос с записью
+
+
+class CassetteMiss(Exception):
+    """В кассете нет обмена для запроса в режиме replay"""
+
+
+def _body_hash(kwargs: dict[str, Any]) -> str:
+    if (body := kwargs.get("json")) is not None:
+        data = json.dumps(body, sort_keys=True, default=str).encode("utf-8")
+    elif (body := kwargs.get("data")) is not None:
+        data = body if isinstance(body, bytes) else json.dumps(body, sort_keys=True, default=str).encode("utf-8")
+    else:
+        return ""
+    return hashlib.sha1(data).hexdigest()
+
+
+class Cassette:
+    """JSONL кассета обменов с индексом в памяти"""
+
+    def __init__(
+        self, path: Path | str, mode: CassetteMode | str = CassetteMode.REPLAY, match: Iterable[str] = DEFAULT_MATCH
+    ):
+        """
+        :param path: Файл кассеты
+        :param mode: Режим: record / replay / auto
+        :param match: Правила сопоставления из MATCH_RULES
+        """
+        self.path = Path(path)
+        self.mode = CassetteMode(mode)
+        self.match = tuple(match)
+        unknown = set(self.match) - set(MATCH_RULES)
+        assert not unknown, f"Unknown cassette match rules: {sorted(unknown)}, available: {MATCH_RULES}"
+        self.played = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._index: dict[str, deque[tuple[int, int]]] = {}
+        self._last: dict[str, tuple[int, int]] = {}
+        self._mmap: mmap.mmap | None = None
+        self._fd: int | None = None
+        if self.mode != CassetteMode.RECORD:
+            self._load()
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self._index.values())
+
+    def _load(self) -> None:
+        """Индекс key -> смещения строк в порядке записи"""
+        if not self.path.exists() or not self.path.stat().st_size:
+            return
+        data = self._map()
+        start, size = 0, len(data)
+        while start < size:
+            end = data.find(b"\n", start)
+            end = size if end == -1 else end
+            key_start = start + len(_KEY_PREFIX)
+            key_end = key_start + _KEY_LENGTH
+            if data[start:key_start] == _KEY_PREFIX:
+                self._index.setdefault(data[key_start:key_end].decode("ascii"), deque()).append((start, end - start))
+            start = end + 1
+        logger.debug(f"Cassette {self.path}: {len(self)} exchanges")
+
+    def key(self, method: str, url: str, kwargs: dict[str, Any], template: str | None = None) -> str:
+        """Ключ сопоставления запроса по правилам match"""
+        prepared = requests.Request(method=method, url=url, params=kwargs.get("params")).prepare()
+        parts = urlsplit(str(prepared.url))
+        values = {
+            "method": method.upper(),
+            "template": template or "",
+            "path": parts.path,
+            "query": urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True))),
+            "body": _body_hash(kwargs),
+        }
+        raw = "\n".join(f"{rule}={values[rule]}" for rule in self.match)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        kwargs: dict[str, Any],
+        *,
+        template: str | None,
+        send: Callable[[str, str, dict[str, Any]], Response],
+    ) -> Response:
+        """
+        Ответ из кассеты или отправка запроса с записью, по режиму
+        :param send: Отправка запроса: send(method, url, kwargs)
+        :raises CassetteMiss: Обмен не найден в режиме replay
+        """
+        key = self.key(method, url, kwargs, template)
+        if self.mode != CassetteMode.RECORD and (record := self._take(key)) is not None:
+            self.played += 1
+            return self._response(record, method, url, kwargs)
+        if self.mode == CassetteMode.REPLAY:
+            raise CassetteMiss(
+                f"No recorded exchange for {method} {url} in {self.path} (match: {', '.join(self.match)})"
+            )
+        response = send(method, url, kwargs)
+        self._append(key, method, url, template, response)
+        return response
+
+    def _take(self, key: str) -> dict[str, Any] | None:
+        """Следующий обмен по ключу. Повторы одного запроса воспроизводятся по порядку, последний - до конца"""
+        with self._lock:
+            if offsets := self._index.get(key):
+                self._last[key] = offsets.popleft()
+            if (position := self._last.get(key)) is None:
+                return None
+            start, length = position
+            end = start + length
+            data = self._mmap if self._mmap is not None and end <= len(self._mmap) else self._map()
+        return json.loads(data[start:end])
+
+    def _map(self) -> mmap.mmap:
+        """
+        Отобразить файл кассеты в память. Обмены, дописанные в режиме auto, требуют нового отображения,
+        прежнее закрывается сборщиком, когда его перестают читать
+        """
+        with self.path.open("rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    @staticmethod
+    def _response(record: dict[str, Any], method: str, url: str, kwargs: dict[str, Any]) -> Response:
+        response = Response()
+        response.status_code = record["status"]
+        response.reason = record.get("reason", "")
+        response.headers = CaseInsensitiveDict(record["headers"])
+        body = record["body"]
+        content = base64.b64decode(body) if record.get("b64") else body.encode("utf-8")
+        response._content = content  # pylint: disable=protected-access
+        response.encoding = record.get("encoding")
+        response.request = requests.Request(method=method, url=url, params=kwargs.get("params")).prepare()
+        response.url = str(response.request.url)
+        response.elapsed = timedelta(0)
+        return response
+
+    def _append(self, key: str, method: str, url: str, template: str | None, response: Response) -> None:
+        content = response.content
+        try:
+            body, b64 = content.decode("utf-8"), False
+        except UnicodeDecodeError:
+            body, b64 = base64.b64encode(content).decode("ascii"), True
+        record = {
+            "key": key,
+            "method": method,
+            "url": url,
+            "template": template,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "b64": b64,
+            "body": body,
+        }
+        line = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        start = self._write(line + b"\n")
+        self.recorded += 1
+        if self.mode == CassetteMode.AUTO:
+            # Повтор того же запроса воспроизводится, а не отправляется и записывается снова
+            with self._lock:
+                self._index.setdefault(key, deque()).append((start, len(line)))
+
+    def _write(self, line: bytes) -> int:
+        """
+        Дописать строку одним write в O_APPEND дескриптор под блокировкой файла.
+        Безопасно для нескольких потоков и процессов
+        :return: Смещение начала строки в файле
+        """
+        with self._lock:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                os.write(self._fd, line)
+                return os.lseek(self._fd, 0, os.SEEK_CUR) - len(line)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Закрыть файл кассеты"""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
@@ -0,0 +1,88 @@
+"""Потоковая гистограмма задержек с фиксированным объемом памяти"""
+
+import math
+import threading
+from typing import Any, Final, Iterable
+
+# Диапазон значений в секундах: от 1 мкс до 100 с, значения вне диапазона попадают в крайние корзины
+MIN_VALUE: Final[float] = 1e-6
+MAX_VALUE: Final[float] = 100.0
+# Относительная погрешность перцентилей
+PRECISION: Final[float] = 0.01
+PERCENTILES: Final[tuple[float, ...]] = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """
+    Гистограмма с логарифмическими корзинами: ширина корзины - PRECISION от ее нижней границы.
+    Память не зависит от числа значений, перцентили считаются с относительной погрешностью PRECISION
+    """
+
+    __slots__ = ("_counts", "_log_base", "count", "total", "min", "max", "_lock")
+
+    def __init__(self) -> None:
+        self._log_base = math.log1p(PRECISION)
+        self._counts = [0] * (self._index(MAX_VALUE) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, value: float) -> int:
+        if value <= MIN_VALUE:
+            return 0
+        return int(math.log(value / MIN_VALUE) / self._log_base) + 1
+
+    def _value(self, index: int) -> float:
+        """Верхняя граница корзины"""
+        return MIN_VALUE * (1 + PRECISION) ** index
+
+    def record(self, value: float) -> None:
+        """Добавить значение в секундах"""
+        index = min(self._index(value), len(self._counts) - 1)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Добавить значения другой гистограммы"""
+        with self._lock:
+            for index, count in enumerate(other._counts):  # pylint: disable=protected-access
+                self._counts[index] += count
+            self.count += other.count
+            self.total += other.total
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Значение перцентиля, не больше максимального значения"""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * percent / 100), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+    def as_dict(self, percentiles: Iterable[float] = PERCENTILES) -> dict[str, Any]:
+        """Сводка в миллисекундах"""
+        summary: dict[str, Any] = {"count": self.count}
+        if self.count:
+            summary |= {"min": self.min * 1000, "mean": self.mean * 1000}
+            summary |= {f"p{percent:g}": self.percentile(percent) * 1000 for percent in percentiles}
+            summary["max"] = self.max * 1000
+        return summary
+
+    def __repr__(self) -> str:
+        return f"LatencyHistogram({', '.join(f'{k}={v:.2f}' for k, v in self.as_dict().items())})"
@@ -0,0 +1,269 @@
+"""Журнал запросов и ответов сессий"""
+
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final
+
+from requests import Response
+
+logger = logging.getLogger(__package__)
+
+DEFAULT_BODY_LIMIT: Final[int] = 2048
+DEFAULT_BUFFER_SIZE: Final[int] = 100
+
+
+def _truncate(data: bytes | str | None, limit: int, size: int | None = None) -> str:
+    """
+    Обрезать тело до limit символов
+    :param size: Полный размер, если data уже обрезана
+    """
+    if data is None:
+        return ""
+    size = len(data) if size is None else size
+    text = data[:limit]
+    if isinstance(text, bytes):
+        text = text.decode("utf-8", errors="replace")
+    return text if size <= limit else f"{text}... ({size} total)"
+
+
+def _arguments(kwargs: dict[str, Any], limit: int) -> str:
+    """Аргументы запроса с обрезанным телом"""
+    return _truncate(str(kwargs), limit) if kwargs else ""
+
+
+class _Lazy:
+    """Откладывает форматирование до момента записи в лог"""
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func: Any, *args: Any):
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return self._func(*self._args)
+
+
+@dataclass(slots=True, kw_only=True)
+class Exchange:
+    """Запрос и ответ одной отправки. Строковое представление строится только при выгрузке"""
+
+    number: int
+    session: str
+    method: str
+    url: str
+    limit: int = DEFAULT_BODY_LIMIT
+    arguments: dict[str, Any] = field(default_factory=dict)
+    status: int | None = None
+    body: bytes | str = b""
+    size: int = 0
+    error: str | None = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Представление для записи в jsonl"""
+        return {
+            "number": self.number,
+            "timestamp": self.timestamp,
+            "session": self.session,
+            "method": self.method,
+            "url": self.url,
+            "request": _arguments(self.arguments, self.limit),
+            "status": self.status,
+            "body": _truncate(self.body, self.limit, self.size),
+            "error": self.error,
+        }
+
+    def __str__(self) -> str:
+        data = self.to_dict()
+        result = f"#{self.number} {self.session} {self.method} {self.url}"
+        if data["request"]:
+            result += f"\n  request: {data['request']}"
+        if self.error is not None:
+            return f"{result}\n  error: {self.error}"
+        return f"{result}\n  response: {self.status}\n  {data['body']}"
+
+
+class RequestJournal:
+    """
+    Журнал обменов сессий
+    Форматирование выполняется только при включенном уровне логирования, тела обрезаются до body_limit,
+    последние buffer_size обменов хранятся в памяти для выгрузки при падении теста,
+    запись в файл выполняется фоновым потоком
+    """
+
+    def __init__(
+        self,
+        *,
+        level: int = logging.INFO,
+        body_limit: int = DEFAULT_BODY_LIMIT,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        path: Path | str | None = None,
+    ):
+        """
+        :param level: Уровень логирования обменов
+        :param body_limit: Максимальная длина тела запроса/ответа в журнале
+        :param buffer_size: Число последних обменов в памяти, 0 отключает буфер
+        :param path: Файл журнала (jsonl), записывается фоновым потоком
+        """
+        self.level = level
+        self.body_limit = body_limit
+        self._buffer: deque[Exchange] = deque(maxlen=buffer_size)
+        self._numbers = itertools.count(1)
+        self._last_number = 0
+        self._queue: queue.SimpleQueue[Exchange | None] | None = None
+        self._writer: threading.Thread | None = None
+        if path is not None:
+            self.open(path)
+
+    def configure(
+        self,
+        *,
+        level: int | None = None,
+        body_limit: int | None = None,
+        buffer_size: int | None = None,
+        path: Path | str | None = None,
+    ) -> None:
+        """Изменить настройки журнала, не переданные параметры не меняются"""
+        if level is not None:
+            self.level = level
+        if body_limit is not None:
+            self.body_limit = body_limit
+        if buffer_size is not None:
+            self._buffer = deque(self._buffer, maxlen=buffer_size)
+        if path is not None:
+            self.open(path)
+
+    @property
+    def last_number(self) -> int:
+        """Номер последнего начатого обмена"""
+        return self._last_number
+
+    def open(self, path: Path | str) -> None:
+        """Начать запись журнала в файл"""
+        self.close()
+        self._queue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write, args=(Path(path), self._queue), daemon=True)
+        self._writer.start()
+
+    def close(self) -> None:
+        """Дописать очередь и остановить запись в файл"""
+        if self._queue is not None and self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+        self._queue, self._writer = None, None
+
+    @staticmethod
+    def _write(path: Path, records: "queue.SimpleQueue[Exchange | None]") -> None:
+        """Фоновая запись обменов в файл"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as file:
+            while (exchange := records.get()) is not None:
+                file.write(json.dumps(exchange.to_dict(), ensure_ascii=False) + "\n")
+                if records.empty():
+                    file.flush()
+
+    def _store(self, exchange: Exchange) -> None:
+        if self._buffer.maxlen:
+            self._buffer.append(exchange)
+        if self._queue is not None:
+            self._queue.put(exchange)
+
+    @property
+    def _enabled(self) -> bool:
+        return self._buffer.maxlen != 0 or self._queue is not None
+
+    def request(self, session: str, method: str, url: str, kwargs: dict[str, Any]) -> int:
+        """Запись об отправке запроса, возвращает номер обмена"""
+        number = self._last_number = next(self._numbers)
+        if logger.isEnabledFor(self.level):
+            logger.log(
+                self.level,
+                "%s Request %s: %s %s %s",
+                session,
+                number,
+                method,
+                url,
+                _Lazy(_arguments, kwargs, self.body_limit),
+            )
+        return number
+
+    def response(self, number: int, session: str, kwargs: dict[str, Any], response: Response) -> None:
+        """Запись о полученном ответе"""
+        streamed = bool(kwargs.get("stream"))
+        self._log_response(number, session, response, streamed=streamed)
+        if self._enabled:
+            self._store(
+                Exchange(
+                    number=number,
+                    session=session,
+                    method=str(response.request.method),
+                    url=str(response.request.url),
+                    limit=self.body_limit,
+                    arguments=dict(kwargs),
+                    status=response.status_code,
+                    body="<stream>" if streamed else response.content[: self.body_limit],
+                    size=0 if streamed else len(response.content),
+                ),
+            )
+
+    def _log_response(self, number: int, session: str, response: Response, *, streamed: bool) -> None:
+        if not logger.isEnabledFor(self.level):
+            return
+        logger.log(
+            self.level,
+            "%s Response %s: %s %s %s\n%s",
+            session,
+            number,
+            response.status_code,
+            response.request.method,
+            response.request.url,
+            "<stream>" if streamed else _Lazy(_truncate, response.content, self.body_limit),
+        )
+
+    def error(
+        self,
+        number: int,
+        session: str,
+        *,
+        method: str,
+        url: str,
+        kwargs: dict[str, Any],
+        error: BaseException,
+    ) -> None:
+        """Запись об ошибке отправки"""
+        logger.error("%s Error %s: %s", session, number, error)
+        if self._enabled:
+            self._store(
+                Exchange(
+                    number=number,
+                    session=session,
+                    method=method,
+                    url=url,
+                    limit=self.body_limit,
+                    arguments=dict(kwargs),
+                    error=repr(error),
+                ),
+            )
+
+    def exchanges(self, since: int = 0) -> list[Exchange]:
+        """Обмены из буфера с номером больше since"""
+        return [exchange for exchange in self._buffer if exchange.number > since]
+
+    def dump(self, since: int = 0) -> str:
+        """Текстовая выгрузка буфера для отчета о падении"""
+        return "\n\n".join(str(exchange) for exchange in self.exchanges(since))
+
+    def clear(self) -> None:
+        """Очистить буфер"""
+        self._buffer.clear()
+
+
+journal = RequestJournal()
@@ -0,0 +1,113 @@
+"""Десериализация json: реестр декодеров и ленивое представление с доступом через точку"""
+
+import json
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+Decoder = Callable[[bytes], Any]
+
+DECODERS: dict[str, Decoder] = {"json": json.loads}
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+# Декодер по умолчанию: самый быстрый из установленных
+DEFAULT_DECODER: str = "orjson" if "orjson" in DECODERS else "json"
+
+
+def register_decoder(name: str, decoder: Decoder) -> None:
+    """Зарегистрировать декодер, принимающий тело ответа в байтах"""
+    DECODERS[name] = decoder
+
+
+def decode(content: bytes, decoder: str | None = None) -> Any:
+    """Десериализация байт декодером по имени"""
+    try:
+        return DECODERS[decoder or DEFAULT_DECODER](content)
+    except KeyError:
+        raise KeyError(f"Unknown decoder: {decoder}. Available: {', '.join(DECODERS)}") from None
+
+
+def wrap(value: Any) -> Any:
+    """Обернуть dict/list в ленивое представление, остальное вернуть как есть"""
+    if isinstance(value, dict):
+        return JsonView(value)
+    if isinstance(value, list):
+        return JsonListView(value)
+    return value
+
+
+class JsonView(Mapping):
+    """
+    Ленивое представление словаря с доступом через точку: view.user.id, view["user.id"]
+    Вложенные узлы оборачиваются только при обращении к ним
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return wrap(self._data[key])
+        except KeyError:
+            if not isinstance(key, str) or "." not in key:
+                raise
+        value: Any = self
+        for part in key.split("."):
+            value = value[int(part)] if isinstance(value, JsonListView) else value[part]
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        return self._data == (other.to_dict() if isinstance(other, JsonView) else other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Исходный словарь без копирования"""
+        return self._data
+
+
+class JsonListView(Sequence):
+    """Ленивое представление списка, элементы оборачиваются при обращении"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list[Any]):
+        self._data = data
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return JsonListView(self._data[index])
+        return wrap(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        return self._data == (other.to_list() if isinstance(other, JsonListView) else other)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    def to_list(self) -> list[Any]:
+        """Исходный список без копирования"""
+        return self._data
@@ -0,0 +1,257 @@
+"""Генерация нагрузки по маршрутам клиента: заданный RPS или число параллельных пользователей"""
+
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Final, Iterable
+
+from requests import Response
+
+from ._histogram import LatencyHistogram
+from ._request import Request
+from ._session import DEFAULT_CONCURRENCY, Session
+
+logger = logging.getLogger(__package__)
+
+# Сколько последних значений хранит контекст по каждому имени
+CONTEXT_SIZE: Final[int] = 10_000
+
+
+class LoadContext:
+    """Общие для операций значения, например id созданных сущностей"""
+
+    def __init__(self, size: int = CONTEXT_SIZE):
+        self._values: dict[str, deque[Any]] = {}
+        self._size = size
+        self._lock = threading.Lock()
+
+    def remember(self, name: str, value: Any) -> None:
+        """Запомнить значение, хранятся последние size значений"""
+        with self._lock:
+            self._values.setdefault(name, deque(maxlen=self._size)).append(value)
+
+    def choice(self, name: str) -> Any | None:
+        """Случайное запомненное значение, None если значений нет"""
+        with self._lock:
+            values = self._values.get(name)
+            return random.choice(values) if values else None
+
+
+@dataclass(slots=True, kw_only=True)
+class Operation:
+    """
+    Операция нагрузки: запрос маршрута клиента из route_table
+    :param prepare: Подготовка запроса: path/body/query. None - пропустить операцию (нет данных)
+    :param collect: Обработка успешного ответа, например сохранение id в контекст
+    """
+
+    route: str
+    weight: float = 1.0
+    status: int = 200
+    prepare: Callable[[Request, LoadContext], Request | None] | None = None
+    collect: Callable[[Response, LoadContext], None] | None = None
+
+
+@dataclass(slots=True)
+class OperationStats:
+    """Статистика операции"""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter = field(default_factory=Counter)
+    count: int = 0
+    skipped: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, latency: float | None = None, error: str | None = None) -> None:
+        """Учесть выполненный запрос: задержку, если ответ получен, и ошибку, если есть"""
+        if latency is not None:
+            self.latency.record(latency)
+        with self._lock:
+            self.count += 1
+            if error is not None:
+                self.errors[error] += 1
+
+    def skip(self) -> None:
+        """Учесть пропущенную операцию"""
+        with self._lock:
+            self.skipped += 1
+
+    @property
+    def error_count(self) -> int:
+        """Число ошибок: неожиданный код ответа или исключение"""
+        return sum(self.errors.values())
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """Итог нагрузки по операциям"""
+
+    duration: float
+    operations: dict[str, OperationStats]
+
+    @property
+    def total(self) -> int:
+        """Всего выполненных запросов"""
+        return sum(stats.count for stats in self.operations.values())
+
+    @property
+    def throughput(self) -> float:
+        """Запросов в секунду"""
+        return self.total / self.duration if self.duration else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Сводка для сохранения в json"""
+        return {
+            "duration": self.duration,
+            "total": self.total,
+            "throughput": self.throughput,
+            "operations": {
+                name: {
+                    "count": stats.count,
+                    "errors": dict(stats.errors),
+                    "error_rate": stats.error_count / stats.count if stats.count else 0.0,
+                    "skipped": stats.skipped,
+                    "throughput": stats.count / self.duration if self.duration else 0.0,
+                    "latency_ms": stats.latency.as_dict(),
+                }
+                for name, stats in self.operations.items()
+            },
+        }
+
+    def __str__(self) -> str:
+        header = f"{'operation':<20} {'count':>7} {'err%':>6} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        lines = [header]
+        for name, data in self.as_dict()["operations"].items():
+            latency = data["latency_ms"]
+            times = " ".join(f"{latency.get(key, 0):>8.1f}" for key in ("p50", "p95", "p99", "max"))
+            lines.append(
+                f"{name:<20} {data['count']:>7} {data['error_rate'] * 100:>6.1f} {data['throughput']:>8.1f} {times}"
+            )
+        lines.append(f"total {self.total} requests in {self.duration:.1f}s: {self.throughput:.1f} rps")
+        return "\n".join(lines)
+
+
+class _Pacer:
+    """Расписание запросов открытой модели: линейный рост RPS за ramp_up, затем постоянный"""
+
+    def __init__(self, rps: float, ramp_up: float):
+        self.rps = rps
+        self.ramp_up = ramp_up
+        self._number = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> float:
+        """Смещение от начала нагрузки для следующего запроса"""
+        with self._lock:
+            number = self._number
+            self._number += 1
+        # Число запросов к моменту t при линейном росте: rps * t^2 / (2 * ramp_up)
+        ramp_count = self.rps * self.ramp_up / 2
+        if number < ramp_count:
+            return math.sqrt(2 * self.ramp_up * number / self.rps)
+        return self.ramp_up + (number - ramp_count) / self.rps
+
+
+class LoadRunner:
+    """
+    Нагрузка по взвешенной смеси операций.
+    С rps - открытая модель: запросы по расписанию, concurrency ограничивает число одновременных запросов.
+    Без rps - закрытая модель: concurrency пользователей шлют запросы без пауз, ramp_up растягивает их старт
+    """
+
+    def __init__(
+        self,
+        client: Session,
+        operations: Iterable[Operation],
+        *,
+        rps: float | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        duration: float = 10.0,
+        ramp_up: float = 0.0,
+    ):
+        self.client = client
+        self.operations = [operation for operation in operations if operation.weight > 0]
+        assert self.operations, "At least one operation with positive weight is required"
+        for operation in self.operations:
+            assert (
+                operation.route in client.route_table
+            ), f"Unknown route '{operation.route}' for {type(client).__name__}"
+        self.rps = rps
+        self.concurrency = concurrency
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.context = LoadContext()
+        self._weights = [operation.weight for operation in self.operations]
+
+    def run(self) -> LoadReport:
+        """Выполнить нагрузку"""
+        stats = {operation.route: OperationStats() for operation in self.operations}
+        pacer = _Pacer(self.rps, self.ramp_up) if self.rps else None
+        start = time.monotonic()
+        workers = [
+            threading.Thread(target=self._worker, args=(index, start, pacer, stats), name=f"load-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        report = LoadReport(duration=time.monotonic() - start, operations=stats)
+        logger.info(f"Load done:\n{report}")
+        return report
+
+    def _worker(self, index: int, start: float, pacer: _Pacer | None, stats: dict[str, OperationStats]) -> None:
+        end = start + self.duration
+        if pacer is None and self.ramp_up:
+            time.sleep(self.ramp_up * index / self.concurrency)
+        while self._wait_turn(start, end, pacer):
+            operation = random.choices(self.operations, weights=self._weights)[0]
+            self._execute(operation, stats[operation.route])
+
+    @staticmethod
+    def _wait_turn(start: float, end: float, pacer: _Pacer | None) -> bool:
+        """Дождаться времени следующей операции. False - время нагрузки вышло"""
+        if pacer is None:
+            return time.monotonic() < end
+        at = start + pacer.next()
+        if at >= end:
+            return False
+        time.sleep(max(at - time.monotonic(), 0.0))
+        return True
+
+    def _execute(self, operation: Operation, stats: OperationStats) -> None:
+        """Выполнить операцию. Исключения подготовки, отправки и сбора учитываются ошибками, поток не падает"""
+        try:
+            request = self._prepare(operation)
+            if request is None:
+                stats.skip()
+                return
+            started = time.perf_counter()
+            response = request._send()  # pylint: disable=protected-access
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            stats.add(error=type(err).__name__)
+            return
+        latency = time.perf_counter() - started
+        if response.status_code != operation.status:
+            stats.add(latency, error=str(response.status_code))
+            return
+        stats.add(latency, error=self._collect(operation, response))
+
+    def _prepare(self, operation: Operation) -> Request | None:
+        """Запрос операции, None - операция пропускается"""
+        request = self.client.route(operation.route)
+        return request if operation.prepare is None else operation.prepare(request, self.context)
+
+    def _collect(self, operation: Operation, response: Response) -> str | None:
+        """Сбор данных ответа в контекст. :return: Имя исключения при ошибке сбора"""
+        if operation.collect is None:
+            return None
+        try:
+            operation.collect(response, self.context)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            return type(err).__name__
+        return None
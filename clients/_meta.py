@@ -4,14 +4,20 @@ from functools import wraps
 from types import MethodType
 from typing import Any, Callable
 
-from ._request import Method, Request
-from ._session import Session
+from ._request import AsyncRequest, Method, Request
+from ._route import CategoryProperty, RouteProperty, RouteTable
+from ._session import AsyncSession, Session
 
 
 class MetaCategory:  # pylint: disable=too-few-public-methods
     """Meta category class"""
 
     _session: Session
+    route_table: RouteTable = RouteTable({})
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.route_table = RouteTable.build(cls)
 
     def __init__(self, session: Session) -> None:
         self._session = session
@@ -32,13 +38,15 @@ class request:  # noqa pylint: disable=invalid-name
         def wrapper(func: MethodType) -> property:
             @wraps(func)
             def _request(self: Session | MetaCategory) -> Request:
-                return Request(
-                    session=self.s if isinstance(self, MetaCategory) else self,
+                session = self.s if isinstance(self, MetaCategory) else self
+                request_class = AsyncRequest if isinstance(session, AsyncSession) else Request
+                return request_class(
+                    session=session,
                     method=method,
                     endpoint=endpoint,
                 )
 
-            return property(_request, None, None)
+            return RouteProperty(_request, method=method, endpoint=endpoint)
 
         return wrapper
 
@@ -71,8 +79,13 @@ def category(cls: type[MetaCategory]) -> Callable[..., Any]:
 
         @wraps(func)
         def _category(self: Session | MetaCategory) -> MetaCategory:
-            return cls(session=self.s if isinstance(self, MetaCategory) else self)
-
-        return property(_category, None, None)
+            session = self.s if isinstance(self, MetaCategory) else self
+            # Объекты категорий не хранят состояния, поэтому кешируются на сессии
+            categories = session._categories  # pylint: disable=protected-access
+            if (instance := categories.get(cls)) is None:
+                instance = categories[cls] = cls(session=session)
+            return instance
+
+        return CategoryProperty(_category, category=cls)
 
     return wrapper
@@ -0,0 +1,234 @@
+"""Постраничный обход списков: стратегии пагинации и ленивый итератор с фоновой подгрузкой страниц"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Self
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import Response
+
+logger = logging.getLogger(__package__)
+
+Params = dict[str, Any]
+
+# Период проверки остановки фонового потока в секундах
+_STOP_POLL = 0.05
+
+
+def _get(data: Any, path: str | None) -> Any:
+    """Значение по пути через точку: "data.items". None - сами данные"""
+    if path is None:
+        return data
+    for part in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+@dataclass(slots=True, kw_only=True)
+class Pagination:
+    """
+    Стратегия пагинации: параметры первой страницы, элементы страницы и параметры следующей.
+    Базовая стратегия запрашивает одну страницу
+    """
+
+    # Путь до списка элементов в теле через точку, None - тело и есть список
+    items: str | None = None
+    # Размер страницы, None - не передается, размер выбирает сервис
+    limit: int | None = None
+    limit_param: str = "limit"
+
+    def first(self) -> Params:
+        """Query параметры первой страницы"""
+        return {} if self.limit is None else {self.limit_param: self.limit}
+
+    def page_items(self, data: Any) -> list[Any]:
+        """Элементы страницы"""
+        value = _get(data, self.items)
+        assert isinstance(value, list), f"Page items '{self.items or '<body>'}' is not a list: {type(value).__name__}"
+        return value
+
+    def next(self, params: Params, response: Response, data: Any, items: list[Any]) -> Params | None:
+        """Query параметры следующей страницы, None - страниц больше нет"""
+        return None
+
+    def _full(self, items: list[Any]) -> bool:
+        """Страница заполнена, значит может быть следующая. Без limit - непустая"""
+        return bool(items) and (self.limit is None or len(items) >= self.limit)
+
+
+@dataclass(slots=True, kw_only=True)
+class PagePagination(Pagination):
+    """Номер страницы и размер: ?page=1&limit=100. Последняя страница - неполная"""
+
+    page_param: str = "page"
+    start: int = 1
+
+    def first(self) -> Params:
+        return Pagination.first(self) | {self.page_param: self.start}
+
+    def next(self, params: Params, response: Response, data: Any, items: list[Any]) -> Params | None:
+        if not self._full(items):
+            return None
+        return params | {self.page_param: int(params[self.page_param]) + 1}
+
+
+@dataclass(slots=True, kw_only=True)
+class OffsetPagination(Pagination):
+    """Смещение и размер: ?offset=0&limit=100. Последняя страница - неполная"""
+
+    offset_param: str = "offset"
+    start: int = 0
+
+    def first(self) -> Params:
+        return Pagination.first(self) | {self.offset_param: self.start}
+
+    def next(self, params: Params, response: Response, data: Any, items: list[Any]) -> Params | None:
+        if not self._full(items):
+            return None
+        return params | {self.offset_param: int(params[self.offset_param]) + len(items)}
+
+
+@dataclass(slots=True, kw_only=True)
+class CursorPagination(Pagination):
+    """Курсор из тела страницы: {"items": [...], "next_cursor": "..."} -> ?cursor=.... Пустой курсор - конец"""
+
+    items: str | None = "items"
+    cursor: str = "next_cursor"
+    cursor_param: str = "cursor"
+
+    def next(self, params: Params, response: Response, data: Any, items: list[Any]) -> Params | None:
+        if not (value := _get(data, self.cursor)):
+            return None
+        return params | {self.cursor_param: value}
+
+
+@dataclass(slots=True, kw_only=True)
+class LinkPagination(Pagination):
+    """Заголовок Link: <...?page=2>; rel="next". Параметры следующей страницы берутся из ссылки"""
+
+    rel: str = "next"
+
+    def next(self, params: Params, response: Response, data: Any, items: list[Any]) -> Params | None:
+        if (link := response.links.get(self.rel)) is None:
+            return None
+        return dict(parse_qsl(urlsplit(link["url"]).query, keep_blank_values=True))
+
+
+@dataclass(slots=True)
+class Page:
+    """Полученная страница. Ошибка запроса или разбора сохраняется и поднимается при обработке"""
+
+    number: int
+    params: Params
+    response: Response | None = None
+    data: Any = None
+    items: list[Any] = field(default_factory=list)
+    error: BaseException | None = None
+
+
+class Paginator:
+    """
+    Ленивый итератор элементов всех страниц.
+    Страницы запрашиваются в фоновом потоке, опережая обработку не больше чем на prefetch страниц.
+    Проверки страниц выполняются в вызывающем потоке функцией process
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Params], Response],
+        strategy: Pagination,
+        *,
+        status: int,
+        parse: Callable[[Response], Any],
+        process: Callable[[Page], list[Any]],
+        prefetch: int = 1,
+        max_pages: int | None = None,
+    ):
+        """
+        :param fetch: Запрос страницы с query параметрами
+        :param status: Ожидаемый код ответа, на другом коде следующие страницы не запрашиваются
+        :param parse: Десериализация тела страницы
+        :param process: Проверка страницы, возвращает ее элементы
+        :param prefetch: Сколько страниц запрашивается заранее
+        :param max_pages: Ограничение числа страниц
+        """
+        assert prefetch >= 1, "Prefetch must be at least 1"
+        self._fetch = fetch
+        self._strategy = strategy
+        self._status = status
+        self._parse = parse
+        self._process = process
+        self._max_pages = max_pages
+        self._queue: queue.SimpleQueue[Page | None] = queue.SimpleQueue()
+        self._slots = threading.Semaphore(prefetch)
+        self._stop = threading.Event()
+        self._executor: ThreadPoolExecutor | None = None
+        self.pages = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        assert self._executor is None, "Paginator can be iterated only once"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paginate")
+        self._executor.submit(self._produce)
+        try:
+            while (page := self._queue.get()) is not None:
+                self._slots.release()
+                self.pages += 1
+                yield from self._process(page)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Остановить подгрузку страниц"""
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
+        self.close()
+
+    def _produce(self) -> None:
+        """Фоновый поток: страницы по очереди, пока стратегия возвращает параметры следующей"""
+        params: Params | None = self._strategy.first()
+        number = 1
+        try:
+            while params is not None and self._acquire():
+                page = Page(number=number, params=params)
+                params = self._load(page)
+                logger.debug(f"Page {number} fetched: {len(page.items)} items, next: {params}")
+                self._queue.put(page)
+                number += 1
+        finally:
+            self._queue.put(None)
+
+    def _load(self, page: Page) -> Params | None:
+        """
+        Запрос и разбор страницы, ошибка сохраняется в странице
+        :return: Параметры следующей страницы, None - страница последняя
+        """
+        try:
+            page.response = self._fetch(page.params)
+            if page.response.status_code != self._status:
+                return None
+            page.data = self._parse(page.response)
+            page.items = self._strategy.page_items(page.data)
+            if self._max_pages is not None and page.number >= self._max_pages:
+                return None
+            return self._strategy.next(page.params, page.response, page.data, page.items)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            page.error = err
+            return None
+
+    def _acquire(self) -> bool:
+        """Дождаться свободного места для страницы. False - итератор закрыт"""
+        while not self._stop.is_set():
+            if self._slots.acquire(timeout=_STOP_POLL):
+                return True
+        return False
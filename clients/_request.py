@@ -1,25 +1,30 @@
 """Реализует отправку запроса и последующую его обработку"""
 
+import copy
 import logging
-import time
 import urllib.parse as urlparse
 from dataclasses import asdict, dataclass, field, is_dataclass
 from enum import StrEnum
-from json import loads
-from typing import Any, Callable, Final, Self
-
-from box import Box, BoxList
+from typing import TYPE_CHECKING, Any, Callable, Final, Iterator, Self
 
 # import marshmallow_dataclass
 from pydantic import BaseModel, ValidationError
 from requests import Response
 
-from src.cases import step
+from src.cases import attach, step
 
-from ._session import Session
+from ._json import JsonListView, JsonView, decode, wrap
+from ._paginate import Page, Pagination, Paginator, Params
+from ._session import AsyncSession, Session
+from ._stream import DEFAULT_CHUNK_SIZE, StreamStats, stream_items
+from ._validation import Schema, describe, validate
+from ._wait import Poller, WaitRequestError, WaitStats, WaitStrategy
 
 # from src.schemas import Schema
 
+if TYPE_CHECKING:
+    from box import Box, BoxList
+
 
 logger = logging.getLogger(__package__)
 
@@ -33,16 +38,41 @@ DEFAULT_INTERVAL: Final[int] = 1
 class Handler:
     """Дефолтные обработчики ответа"""
 
+    # Декодер json по имени из реестра clients._json.DECODERS, None - самый быстрый из установленных
+    decoder: str | None = None
+
+    @classmethod
+    def register(cls, name: str | None = None) -> Callable[[Callable[[Response], Any]], Callable[[Response], Any]]:
+        """Декоратор регистрации обработчика, доступного по имени: request(..., handler="name")"""
+
+        def wrapper(func: Callable[[Response], Any]) -> Callable[[Response], Any]:
+            setattr(cls, name or func.__name__, staticmethod(func))
+            return func
+
+        return wrapper
+
     @staticmethod
-    def json(response: Response) -> Box | BoxList | str:
+    def json(response: Response) -> "Box | BoxList | str":
         """Десериализация json"""
-        _json = loads(response.text)
+        from box import Box, BoxList  # pylint: disable=import-outside-toplevel
+
+        _json = decode(response.content, Handler.decoder)
         if isinstance(_json, dict):
             return Box(_json, box_dots=True)
         if isinstance(_json, list):
             return BoxList(_json, box_dots=True)
         return _json
 
+    @staticmethod
+    def raw(response: Response) -> Any:
+        """Десериализация json в dict/list без обертки"""
+        return decode(response.content, Handler.decoder)
+
+    @staticmethod
+    def lazy(response: Response) -> JsonView | JsonListView | Any:
+        """Десериализация json в ленивое представление с доступом через точку"""
+        return wrap(decode(response.content, Handler.decoder))
+
 
 class Method(StrEnum):
     """Enum методов запроса"""
@@ -53,10 +83,6 @@ class Method(StrEnum):
     DELETE = "DELETE"
 
 
-class WaitRequestError(Exception):
-    """Базовый exception для ожидания"""
-
-
 @dataclass(slots=True, kw_only=True)
 class WaitRequest:
     """Ожидание"""
@@ -66,34 +92,59 @@ class WaitRequest:
     timeout: int | float = field(default=DEFAULT_WAIT)
     interval: int | float = field(default=DEFAULT_INTERVAL)
     err_msg: str | None = field(default=None)
+    strategy: WaitStrategy | None = field(default=None)
+    stats: WaitStats = field(default_factory=WaitStats, init=False)
 
     def __call__(  # noqa: CCR001
         self,
         status: int,
         *,
         handler: Callable[[Response], Any] | str | None = Handler.json,
-        schema: type[BaseModel] | list[type[BaseModel]] | None = None,
+        schema: Schema | None = None,
         step_name: str | None = None,
         return_result: bool = False,
+        strict: bool = False,
+        return_model: bool = False,
     ) -> Any:
         """Выполнить запрос"""
         error = None
+        poller = Poller(timeout=self.timeout, strategy=self.strategy or WaitStrategy(self.interval))
+        self.stats = poller.stats
         with step(step_name):
-            start_time = time.time()
-            logger.debug(f"Start wait: timeout: {self.timeout}")
-            while time.time() - start_time < self.timeout:
-                try:
-                    response = self.request(status=status, handler=handler, schema=schema)
-                    if result := (self.func(response) if self.func is not None else True):
-                        logger.debug("Wait done")
-                        return result if return_result else response
-                    raise WaitRequestError(self.err_msg or f"{result=} request: {self.request}")
-                except Exception as err:  # pylint: disable=broad-exception-caught
-                    logger.error(f"Wait error: {err}")
-                    error = err
-                time.sleep(self.interval)
+            logger.debug(f"Start wait: timeout: {self.timeout} strategy: {poller.strategy}")
+            try:
+                while True:
+                    poller.attempt()
+                    try:
+                        response = self.request(
+                            status=status,
+                            handler=handler,
+                            schema=schema,
+                            strict=strict,
+                            return_model=return_model,
+                        )
+                        result = self.check(response, return_result=return_result)
+                        poller.success()
+                        logger.debug(f"Wait done: {self.stats}")
+                        return result
+                    except Exception as err:  # pylint: disable=broad-exception-caught
+                        logger.error(f"Wait error: {err}")
+                        error = err
+                    if not poller.pause(self.request.last_response):
+                        break
+            finally:
+                attach("Wait stats", self.stats.as_dict())
             raise error  # type: ignore
 
+    def check(self, response: Any, *, return_result: bool = False) -> Any:
+        """
+        Проверка условия ожидания для обработанного ответа
+        :raises WaitRequestError: Условие не выполнено
+        """
+        if result := (self.func(response) if self.func is not None else True):
+            return result if return_result else response
+        raise WaitRequestError(self.err_msg or f"{result=} request: {self.request}")
+
 
 class Request:
     """Класс запроса"""
@@ -109,6 +160,8 @@ class Request:
         self._session = session
         self._args: dict[str, Any] = {}
         self._extra: dict[str, Any] = {}
+        self._last_response: Response | None = None
+        self._stream_stats: StreamStats | None = None
 
     @property
     def method(self) -> Method:
@@ -120,6 +173,16 @@ class Request:
         """Возвращает конечную точку запроса"""
         return self._endpoint
 
+    @property
+    def last_response(self) -> Response | None:
+        """Последний полученный ответ"""
+        return self._last_response
+
+    @property
+    def stream_stats(self) -> StreamStats | None:
+        """Статистика последнего потокового запроса, заполняется по мере чтения элементов"""
+        return self._stream_stats
+
     def set_arguments(self, **kwargs) -> Self:
         """Добавление/обновление аргументов для передачи в запрос"""
         self._args.update(kwargs)
@@ -163,6 +226,11 @@ class Request:
             self.set_headers({"Content-Type": "application/x-www-form-urlencoded"})
         return self
 
+    def no_cache(self) -> Self:
+        """Отправить запрос в обход кеша ответов сессии"""
+        self._extra["cache"] = False
+        return self
+
     def set_headers(self, headers: dict) -> Self:
         """Добавить headers в запрос"""
         arg = self._args.setdefault("headers", {})
@@ -174,6 +242,8 @@ class Request:
         arg = self._args.setdefault("json", {})
         if is_dataclass(_data):
             arg.update(_data.as_dict() if hasattr(_data, "as_dict") else asdict(_data))
+        elif isinstance(_data, BaseModel):
+            arg.update(_data.model_dump(mode="json"))
         elif isinstance(_data, dict):
             arg.update(_data)
         arg.update(kwargs)
@@ -188,61 +258,331 @@ class Request:
         timeout: int | float = DEFAULT_WAIT,
         interval: int | float = DEFAULT_INTERVAL,
         err_msg: str | None = None,
+        strategy: WaitStrategy | None = None,
     ) -> WaitRequest:
-        """Ожидание"""
-        return WaitRequest(request=self, func=func, timeout=timeout, interval=interval, err_msg=err_msg)
+        """
+        Ожидание
+        :param strategy: Стратегия пауз между попытками, по умолчанию фиксированный interval
+        """
+        return WaitRequest(
+            request=self,
+            func=func,
+            timeout=timeout,
+            interval=interval,
+            err_msg=err_msg,
+            strategy=strategy,
+        )
 
     def __call__(
         self,
         status: int,
         *,
         handler: Callable[[Response], Any] | str | None = Handler.json,
-        schema: type[BaseModel] | list[type[BaseModel]] | None = None,
+        schema: Schema | None = None,
         step_name: str | None = None,
+        strict: bool = False,
+        return_model: bool = False,
     ) -> Any:
         """
         Непосредственый запрос
         :param status: Ожидаемый код ответа
         :param handler: Функция обработчик ответа или имя обработчика из Handlers
+        :param schema: Схема ответа: модель, [Модель] для списка, любой тип поддерживаемый TypeAdapter
         :param step_name: Имя степа для передачи в allure
+        :param strict: Падать при ошибке валидации схемой
+        :param return_model: Вернуть провалидированную модель схемы вместо результата хендлера
         :return: Если не указан handler возврацает requests.Response. Если указан handler резльтат обработки
         """
         with step(_title=step_name):
             with step(f"Запрос: {self._method} {self._endpoint}", args=self._args):
-                response = self._session.request(
-                    endpoint=self.endpoint,
-                    method=self.method,
-                    extra=self._extra,
-                    **self._args,
-                )
-            with step(f"Проверить код ответа: '{status}'"):
-                assert (
-                    response.status_code == status
-                ), f"{self} Status code error: Expected: '{status}'. Actual: '{response.status_code}'"
-            if callable(handler):
-                with step(f"Десериализация ответа хендлером: {handler.__name__}"):
-                    response = handler(response)  # type: ignore
-            elif isinstance(handler, str) and hasattr(Handler, handler):
-                with step(f"Десериализация ответа хендлером: {handler}"):
-                    response = getattr(Handler, handler)(response)
-            if schema is not None:
-                self.__validator(response, schema)
-            return response
+                response = self._send()
+            return self._process(
+                response,
+                status=status,
+                handler=handler,
+                schema=schema,
+                strict=strict,
+                return_model=return_model,
+            )
+
+    def iter_items(
+        self,
+        status: int,
+        *,
+        schema: Schema | None = None,
+        step_name: str | None = None,
+        strict: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Any]:
+        """
+        Потоковый запрос списка: тело читается чанками, элементы json массива разбираются и валидируются по одному.
+        Ответ не кешируется и не хранится целиком, в журнал попадает как <stream>
+        :param schema: Схема элемента массива, например UserResponse
+        :param strict: Падать на невалидном элементе, иначе он пропускается и учитывается в stream_stats
+        :return: Итератор элементов или моделей схемы
+        """
+        request = self._copy(args={"stream": True}, extra={"cache": False})
+        with step(_title=step_name):
+            with step(f"Потоковый запрос: {self._method} {self._endpoint}", args=self._args):
+                response = self._last_response = request._send()  # pylint: disable=protected-access
+            try:
+                self._check_status(response, status)
+            except AssertionError:
+                response.close()
+                raise
+        self._stream_stats = StreamStats()
+        return self._iter_stream(response, schema, strict=strict, chunk_size=chunk_size)
+
+    def stream_summary(
+        self,
+        status: int,
+        *,
+        schema: Schema | None = None,
+        step_name: str | None = None,
+        strict: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> StreamStats:
+        """Потоковый запрос списка ради статистики: элементы валидируются и сразу отбрасываются"""
+        for _ in self.iter_items(status, schema=schema, step_name=step_name, strict=strict, chunk_size=chunk_size):
+            pass
+        return self._stream_stats  # type: ignore[return-value]
+
+    def paginate(
+        self,
+        status: int,
+        strategy: Pagination,
+        *,
+        schema: Schema | None = None,
+        strict: bool = False,
+        prefetch: int = 1,
+        max_pages: int | None = None,
+    ) -> Paginator:
+        """
+        Ленивый обход всех страниц списка. Следующие страницы запрашиваются в фоне, пока обрабатывается текущая.
+        Каждая страница проверяется кодом ответа и схемой в вызывающем потоке
+        :param strategy: Стратегия пагинации: PagePagination, OffsetPagination, CursorPagination, LinkPagination
+        :param schema: Схема элемента страницы: модель или [модель]
+        :param strict: Падать при ошибке валидации страницы, иначе отдаются элементы без валидации
+        :param prefetch: Сколько страниц запрашивается заранее
+        :param max_pages: Ограничение числа страниц
+        :return: Итератор элементов или моделей схемы всех страниц
+        """
+        page_schema = None if schema is None else schema if isinstance(schema, (list, tuple)) else [schema]
+        return Paginator(
+            lambda params: self._page(params)._send(),  # pylint: disable=protected-access
+            strategy,
+            status=status,
+            parse=Handler.raw,
+            process=lambda page: self._page_items(page, status, page_schema, strict=strict),
+            prefetch=prefetch,
+            max_pages=max_pages,
+        )
+
+    def _copy(self, args: dict[str, Any] | None = None, extra: dict[str, Any] | None = None) -> "Request":
+        """
+        Независимая копия запроса для отдельной отправки, параметры исходного не меняются
+        :param args: Аргументы requests, дополняющие аргументы копии
+        :param extra: Параметры сессии, дополняющие параметры копии
+        """
+        request = Request(self._session, self._method, self._endpoint)
+        request._args = copy.deepcopy(self._args) | (args or {})  # pylint: disable=protected-access
+        request._extra = copy.deepcopy(self._extra) | (extra or {})  # pylint: disable=protected-access
+        return request
+
+    def _page(self, params: Params) -> "Request":
+        """Копия запроса с query параметрами страницы"""
+        return self._copy().query(params)
+
+    def _page_items(self, page: Page, status: int, schema: Schema | None, *, strict: bool) -> list[Any]:
+        """Проверка загруженной страницы в вызывающем потоке: элементы или модели схемы"""
+        with step(f"Страница {page.number}: {self._method} {self._endpoint}", args=page.params):
+            if page.error is not None:
+                raise page.error
+            self._last_response = page.response
+            self._check_status(page.response, status)  # type: ignore[arg-type]
+        if schema is None:
+            return page.items
+        models = self._validate(page.items, schema, strict=strict)
+        return page.items if models is None else models
+
+    def _iter_stream(
+        self,
+        response: Response,
+        schema: Schema | None,
+        *,
+        strict: bool,
+        chunk_size: int,
+    ) -> Iterator[Any]:
+        stats = self._stream_stats
+        try:
+            yield from stream_items(response, schema, strict=strict, stats=stats, chunk_size=chunk_size)
+        finally:
+            attach("Stream stats", stats.as_dict())  # type: ignore[union-attr]
+
+    def _send(self) -> Response:
+        """Отправка запроса без проверок"""
+        self._last_response = self._session.request(
+            endpoint=self.endpoint,
+            method=self.method,
+            extra=self._extra,
+            **self._args,
+        )
+        return self._last_response
+
+    def _process(
+        self,
+        response: Response,
+        *,
+        status: int,
+        handler: Callable[[Response], Any] | str | None,
+        schema: Schema | None,
+        strict: bool = False,
+        return_model: bool = False,
+    ) -> Any:
+        """Проверка кода ответа, обработка хендлером и валидация схемой"""
+        self._check_status(response, status)
+        response = self._handle(response, handler)
+        if schema is not None:
+            model = self._validate(response, schema, strict=strict)
+            if return_model:
+                return model
+        return response
+
+    def _check_status(self, response: Response, status: int) -> None:
+        """Проверка кода ответа"""
+        with step(f"Проверить код ответа: '{status}'"):
+            assert (
+                response.status_code == status
+            ), f"{self} Status code error: Expected: '{status}'. Actual: '{response.status_code}'"
 
     @staticmethod
-    def __validator(data: Any, schema: BaseModel | list[BaseModel]) -> None:
-        """Schema validator"""
-        if isinstance(data, Box):
-            data = data.to_dict()
-        elif isinstance(data, BoxList):
-            data = [item.to_dict() for item in data]
-        elif isinstance(data, Response):
-            data = data.json()
+    def _handle(response: Response, handler: Callable[[Response], Any] | str | None) -> Any:
+        """Обработка ответа хендлером"""
+        if callable(handler):
+            with step(f"Десериализация ответа хендлером: {handler.__name__}"):
+                return handler(response)
+        if isinstance(handler, str) and hasattr(Handler, handler):
+            with step(f"Десериализация ответа хендлером: {handler}"):
+                return getattr(Handler, handler)(response)
+        return response
+
+    def _validate(self, data: Any, schema: Schema, strict: bool = False) -> Any:
+        """
+        Валидация схемой
+        :param strict: Падать при ошибке валидации, иначе ошибки только выводятся
+        :return: Типизированная модель или None при ошибке валидации
+        """
+        with step(f"Валидация схемой: {getattr(schema, '__name__', schema)}"):
+            try:
+                return validate(data, schema)
+            except ValidationError as err:
+                message = describe(err)
+                if strict:
+                    raise AssertionError(f"{self} Schema error:\n{message}") from err
+                print(message)
+        return None
+
+
+class AsyncRequest(Request):
+    """Асинхронный запрос, создается для сессий AsyncSession"""
+
+    _session: AsyncSession
+
+    async def __call__(  # type: ignore[override]
+        self,
+        status: int,
+        *,
+        handler: Callable[[Response], Any] | str | None = Handler.json,
+        schema: Schema | None = None,
+        step_name: str | None = None,
+        strict: bool = False,
+        return_model: bool = False,
+    ) -> Any:
+        """
+        Непосредственый запрос, аналог Request.__call__
+        Степы открываются после получения ответа, чтобы конкурентные корутины не перемешивали вложенность в allure
+        """
+        response = self._last_response = await self._session.arequest(
+            endpoint=self.endpoint,
+            method=self.method,
+            extra=self._extra,
+            **self._args,
+        )
+        with step(_title=step_name):
+            with step(f"Запрос: {self._method} {self._endpoint}", args=self._args):
+                pass
+            return self._process(
+                response,
+                status=status,
+                handler=handler,
+                schema=schema,
+                strict=strict,
+                return_model=return_model,
+            )
+
+    def wait(
+        self,
+        func: Callable[[Any], Any],
+        timeout: int | float = DEFAULT_WAIT,
+        interval: int | float = DEFAULT_INTERVAL,
+        err_msg: str | None = None,
+        strategy: WaitStrategy | None = None,
+    ) -> "AsyncWaitRequest":
+        """Асинхронное ожидание, аналог Request.wait"""
+        return AsyncWaitRequest(
+            request=self,
+            func=func,
+            timeout=timeout,
+            interval=interval,
+            err_msg=err_msg,
+            strategy=strategy,
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class AsyncWaitRequest(WaitRequest):
+    """
+    Асинхронное ожидание: попытки через await запроса, паузы через asyncio.sleep.
+    Степ со статистикой открывается после ожидания, как у AsyncRequest
+    """
+
+    async def __call__(  # type: ignore[override]
+        self,
+        status: int,
+        *,
+        handler: Callable[[Response], Any] | str | None = Handler.json,
+        schema: Schema | None = None,
+        step_name: str | None = None,
+        return_result: bool = False,
+        strict: bool = False,
+        return_model: bool = False,
+    ) -> Any:
+        """Выполнить запрос"""
+        error: BaseException | None = None
+        poller = Poller(timeout=self.timeout, strategy=self.strategy or WaitStrategy(self.interval))
+        self.stats = poller.stats
+        logger.debug(f"Start async wait: timeout: {self.timeout} strategy: {poller.strategy}")
         try:
-            schema(**data)
-        except ValidationError as e:
-            for error in e.errors():
-                field = error.get("loc", ["unknown"])[0]
-                error_type = error.get("type", "unknown")
-                message = error.get("msg", "unknown error")
-                print(f"Ошибка в поле '{field}': {message} (тип ошибки: {error_type})")
+            while True:
+                poller.attempt()
+                try:
+                    response = await self.request(
+                        status=status,
+                        handler=handler,
+                        schema=schema,
+                        strict=strict,
+                        return_model=return_model,
+                    )
+                    result = self.check(response, return_result=return_result)
+                    poller.success()
+                    logger.debug(f"Async wait done: {self.stats}")
+                    return result
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    logger.error(f"Wait error: {err}")
+                    error = err
+                if not await poller.apause(self.request.last_response):
+                    break
+        finally:
+            with step(step_name):
+                attach("Wait stats", self.stats.as_dict())
+        raise error  # type: ignore[misc]
@@ -0,0 +1,146 @@
+"""Таблица маршрутов клиентов и скомпилированные шаблоны путей"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Callable, Iterator, Mapping
+
+from src.user_types import Missing
+
+
+class PathTemplate:
+    """
+    Разобранный один раз шаблон пути: /users/{user_id}
+    Неизвестные подстановки остаются в пути как есть, аналогично src.user_types.Missing
+    """
+
+    __slots__ = ("template", "placeholders", "_parts", "_fallback")
+
+    def __init__(self, template: str):
+        self.template = template
+        parsed = list(Formatter().parse(template))
+        self._parts: list[tuple[str, str | None]] = [(literal, name) for literal, name, _, _ in parsed]
+        fields = [(name, spec, conversion) for _, name, spec, conversion in parsed if name is not None]
+        # Форматирование и сложные подстановки отдаются str.format_map
+        self._fallback = any(spec or conversion or not name.isidentifier() for name, spec, conversion in fields)
+        self.placeholders: tuple[str, ...] = tuple(dict.fromkeys(name for name, _, _ in fields))
+
+    def format(self, *values: Mapping[str, Any]) -> str:
+        """Подставить значения, при совпадении ключей приоритет у последнего словаря"""
+        if not self.placeholders:
+            return self.template
+        if self._fallback:
+            merged: dict[str, Any] = {}
+            for mapping in values:
+                merged.update(mapping)
+            return self.template.format_map(Missing(merged))
+        result = []
+        for literal, name in self._parts:
+            result.append(literal)
+            if name is not None:
+                result.append(self._lookup(name, values))
+        return "".join(result)
+
+    @staticmethod
+    def _lookup(name: str, values: tuple[Mapping[str, Any], ...]) -> str:
+        for mapping in reversed(values):
+            if name in mapping:
+                return str(mapping[name])
+        return "{%s}" % name  # pylint: disable=C0209
+
+    def __repr__(self) -> str:
+        return f"PathTemplate({self.template!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_path(template: str) -> PathTemplate:
+    """Закешированный разобранный шаблон пути"""
+    return PathTemplate(template)
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """Маршрут клиента"""
+
+    name: str
+    method: str
+    template: PathTemplate
+
+    @property
+    def endpoint(self) -> str:
+        """Неформатированный шаблон пути"""
+        return self.template.template
+
+    @property
+    def placeholders(self) -> tuple[str, ...]:
+        """Имена подстановок пути"""
+        return self.template.placeholders
+
+
+class RouteProperty(property):
+    """Свойство запроса, созданное декоратором request.<method>"""
+
+    def __init__(self, fget: Callable[[Any], Any], method: str, endpoint: str):
+        super().__init__(fget)
+        self.method = method
+        self.template = compile_path(endpoint)
+
+
+class CategoryProperty(property):
+    """Свойство категории, созданное декоратором category"""
+
+    def __init__(self, fget: Callable[[Any], Any], category: type):
+        super().__init__(fget)
+        self.category = category
+
+
+class RouteTable(Mapping[str, Route]):
+    """Маршруты класса клиента или категории по полному имени: post.create_user"""
+
+    def __init__(self, routes: Mapping[str, Route]):
+        self._routes = dict(routes)
+
+    @classmethod
+    def build(cls, owner: type) -> "RouteTable":
+        """Собрать таблицу по свойствам класса, включая вложенные категории и наследование"""
+        routes: dict[str, Route] = {}
+        for klass in reversed(owner.__mro__):
+            for attr, value in vars(klass).items():
+                routes.update((route.name, route) for route in cls._routes_of(attr, value))
+        return cls(routes)
+
+    @staticmethod
+    def _routes_of(attr: str, value: Any) -> Iterator[Route]:
+        """Маршруты атрибута класса: свойство запроса или маршруты категории с префиксом имени атрибута"""
+        if isinstance(value, RouteProperty):
+            yield Route(name=attr, method=value.method, template=value.template)
+        elif isinstance(value, CategoryProperty):
+            for name, route in getattr(value.category, "route_table", {}).items():
+                yield Route(name=f"{attr}.{name}", method=route.method, template=route.template)
+
+    def __getitem__(self, name: str) -> Route:
+        return self._routes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._routes)
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    @property
+    def endpoints(self) -> dict[str, str]:
+        """Шаблоны путей по имени маршрута"""
+        return {name: route.endpoint for name, route in self._routes.items()}
+
+    @property
+    def methods(self) -> dict[str, str]:
+        """Методы по имени маршрута"""
+        return {name: route.method for name, route in self._routes.items()}
+
+    @property
+    def placeholders(self) -> dict[str, tuple[str, ...]]:
+        """Подстановки по имени маршрута"""
+        return {name: route.placeholders for name, route in self._routes.items()}
+
+    def __repr__(self) -> str:
+        return "\n".join(f"{name}: {route.method} {route.endpoint}" for name, route in self._routes.items())
@@ -1,30 +1,168 @@
 """Реализация ваимодействия с сессией"""
 
+import asyncio
 import logging
-from typing import Any, Self
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from threading import Lock
+from typing import Any, Final, Self
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool
 
-from src.user_types import Missing
+from src.user_types import PoolSettings
+
+from ._cache import ResponseCache
+from ._cassette import Cassette
+from ._journal import RequestJournal, journal
+from ._route import RouteTable, compile_path
+from ._timings import EndpointTimings, timings
 
 logger = logging.getLogger(__package__)
 
+DEFAULT_CONCURRENCY: Final[int] = 10
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """Статистика пула соединений хоста"""
+
+    opened: int
+    requests: int
+
+    @property
+    def reused(self) -> int:
+        """Запросы, отправленные через уже открытое соединение"""
+        return max(self.requests - self.opened, 0)
+
+
+class PoolAdapter(HTTPAdapter):
+    """HTTPAdapter, запоминающий пулы соединений для статистики"""
+
+    def __init__(self, pool: PoolSettings):
+        self._pools: dict[int, tuple[str, HTTPConnectionPool]] = {}
+        self._pools_lock = Lock()
+        super().__init__(
+            pool_connections=pool.connections,
+            pool_maxsize=pool.maxsize,
+            max_retries=pool.retries,
+            pool_block=pool.block,
+        )
+
+    def _track(self, connection: HTTPConnectionPool) -> HTTPConnectionPool:
+        if id(connection) not in self._pools:
+            with self._pools_lock:
+                self._pools[id(connection)] = (f"{connection.scheme}://{connection.host}:{connection.port}", connection)
+        return connection
+
+    def get_connection_with_tls_context(self, *args, **kwargs) -> HTTPConnectionPool:
+        return self._track(super().get_connection_with_tls_context(*args, **kwargs))
+
+    def get_connection(self, *args, **kwargs) -> HTTPConnectionPool:  # requests < 2.32
+        return self._track(super().get_connection(*args, **kwargs))  # pylint: disable=no-member
+
+    def stats(self) -> dict[str, PoolStats]:
+        """Статистика по хостам"""
+        result: dict[str, PoolStats] = {}
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for host, connection in pools:
+            current = result.get(host, PoolStats(opened=0, requests=0))
+            result[host] = PoolStats(
+                opened=current.opened + connection.num_connections,
+                requests=current.requests + connection.num_requests,
+            )
+        return result
+
 
 class Session:
     """Класс сессии"""
 
-    def __init__(self, host: str, *, verify: bool = False, default_path: dict[str, Any] | None = None):
+    route_table: RouteTable = RouteTable({})
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.route_table = RouteTable.build(cls)
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        verify: bool = False,
+        default_path: dict[str, Any] | None = None,
+        pool: PoolSettings | None = None,
+        request_journal: RequestJournal | None = None,
+        cache: ResponseCache | None = None,
+        cassette: Cassette | None = None,
+        endpoint_timings: EndpointTimings | None = None,
+    ):
+        """
+        :param host: Хост сервиса
+        :param verify: Проверка сертификата
+        :param default_path: Значения подстановок в урл по умолчанию
+        :param pool: Настройки пула соединений
+        :param request_journal: Журнал запросов. По умолчанию общий журнал clients._journal.journal
+        :param cache: Кеш ответов GET запросов, может быть общим для нескольких сессий. По умолчанию выключен
+        :param cassette: Кассета записи/воспроизведения обменов. По умолчанию запросы идут в сеть
+        :param endpoint_timings: Гистограммы времени по эндпоинтам. По умолчанию общие clients._timings.timings
+        """
         self._host = host.removesuffix("/")
         self._session = requests.Session()
         self._session.verify = verify
-        self._counter = 0
+        self._journal = request_journal or journal
+        self._cache = cache
+        self._cassette = cassette
+        self._timings = timings if endpoint_timings is None else endpoint_timings
+        self._name = f"{type(self).__name__}({id(self)})"
         self._default_path = default_path or {}
+        self._categories: dict[type, Any] = {}
+        self._pool = pool or PoolSettings()
+        self._adapter = PoolAdapter(self._pool)
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+        if not self._pool.keep_alive:
+            self.add_headers({"Connection": "close"})
 
     @property
     def host(self) -> str:
         """Возвращает хост сессии"""
         return self._host
 
+    @property
+    def pool(self) -> PoolSettings:
+        """Возвращает настройки пула соединений"""
+        return self._pool
+
+    def route(self, name: str) -> Any:
+        """Запрос по полному имени маршрута из route_table: client.route("post.create_user")"""
+        assert name in self.route_table, f"Unknown route '{name}' for {type(self).__name__}"
+        result: Any = self
+        for attr in name.split("."):
+            result = getattr(result, attr)
+        return result
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        """Кеш ответов сессии"""
+        return self._cache
+
+    @property
+    def cassette(self) -> Cassette | None:
+        """Кассета записи/воспроизведения сессии"""
+        return self._cassette
+
+    @property
+    def timings(self) -> EndpointTimings:
+        """Гистограммы времени запросов по эндпоинтам"""
+        return self._timings
+
+    def pool_stats(self) -> dict[str, PoolStats]:
+        """Статистика соединений по хостам: открытые и переиспользованные"""
+        return self._adapter.stats()
+
     def add_headers(self, headers: dict[str, Any]) -> None:
         """Добавить хедеры в сессию"""
         self._session.headers.update(headers)
@@ -34,25 +172,108 @@ class Session:
         self.add_headers({"Authorization": f"Bearer {token}", "Content-Type": "application/json; charset=utf-8"})
 
     def request(self, *, endpoint: str, method: str, extra: dict, **kwargs) -> requests.Response:
-        """Запрос в сессии"""
-        self._counter += 1
-        path = extra.get("path", {})
-        endpoint = endpoint.format_map(Missing(self._default_path | path))
-        url = f"{self.host}{endpoint}"
+        """
+        Запрос в сессии
+        :param extra: path - подстановки в урл, cache=False - запрос в обход кеша
+        Потоковые запросы (stream=True) не кешируются
+        """
+        url = f"{self.host}{compile_path(endpoint).format(self._default_path, extra.get('path', {}))}"
+        send = partial(self._send, endpoint=endpoint)
+        if self._cache is not None and extra.get("cache", True) and not kwargs.get("stream"):
+            return self._cache.request(method, url, kwargs, headers=self._session.headers, send=send)
+        return send(method, url, kwargs)
+
+    def _send(self, method: str, url: str, kwargs: dict[str, Any], endpoint: str | None = None) -> requests.Response:
+        """Отправка запроса с записью в журнал, через кассету, если она задана"""
+        number = self._journal.request(self._name, method, url, kwargs)
         try:
-            logger.info(f"{type(self).__name__}({id(self)}) Request {self._counter}: {method} {url} {kwargs}")
-            response = self._session.request(method=method, url=url, **kwargs)
+            network = partial(self._network, endpoint=endpoint)
+            if self._cassette is not None:
+                response = self._cassette.request(method, url, kwargs, template=endpoint, send=network)
+            else:
+                response = network(method, url, kwargs)
         except Exception as error:
-            logger.error(f"{type(self).__name__}({id(self)}) Error {self._counter}: {error}")
+            self._journal.error(number, self._name, method=method, url=url, kwargs=kwargs, error=error)
             raise error
-        logger.info(
-            f"{type(self).__name__}({id(self)}) Response {self._counter}: "
-            f"{response.status_code} {response.request.method} {response.request.url}\n{response.text}",
-        )
+        self._journal.response(number, self._name, kwargs, response)
         return response
 
+    def _network(self, method: str, url: str, kwargs: dict[str, Any], endpoint: str | None = None) -> requests.Response:
+        """Запрос в сеть: полное время и время до заголовков ответа (response.elapsed) по шаблону эндпоинта"""
+        start = time.perf_counter()
+        response = self._session.request(method=method, url=url, **kwargs)
+        self._timings.record(method, endpoint or url, time.perf_counter() - start, response.elapsed.total_seconds())
+        return response
+
+    def close(self) -> None:
+        """Закрыть соединения сессии"""
+        self._session.close()
+
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
-        self._session.close()
+        self.close()
+
+
+class AsyncSession(Session):
+    """
+    Асинхронная сессия
+    Запросы выполняются в ограниченном пуле потоков поверх общего пула соединений requests,
+    поэтому asyncio.gather по множеству запросов не открывает новое соединение на каждый вызов
+    """
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        verify: bool = False,
+        default_path: dict[str, Any] | None = None,
+        pool: PoolSettings | None = None,
+        request_journal: RequestJournal | None = None,
+        cache: ResponseCache | None = None,
+        cassette: Cassette | None = None,
+        endpoint_timings: EndpointTimings | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        """
+        :param pool: Настройки пула соединений. По умолчанию размер пула на хост равен concurrency
+        :param concurrency: Максимальное число одновременных запросов
+        """
+        pool = pool or PoolSettings(maxsize=concurrency)
+        super().__init__(
+            host,
+            verify=verify,
+            default_path=default_path,
+            pool=pool,
+            request_journal=request_journal,
+            cache=cache,
+            cassette=cassette,
+            endpoint_timings=endpoint_timings,
+        )
+        self._concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=type(self).__name__)
+
+    @property
+    def concurrency(self) -> int:
+        """Максимальное число одновременных запросов"""
+        return self._concurrency
+
+    async def arequest(self, *, endpoint: str, method: str, extra: dict, **kwargs) -> requests.Response:
+        """Асинхронный запрос в сессии"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(self.request, endpoint=endpoint, method=method, extra=extra, **kwargs),
+        )
+
+    def close(self) -> None:
+        """Дождаться запросов в работе и закрыть соединения"""
+        self._executor.shutdown(wait=True)
+        super().close()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
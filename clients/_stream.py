@@ -0,0 +1,204 @@
+"""
+Потоковый разбор json массива: элементы верхнего уровня читаются и валидируются по одному,
+поэтому память не зависит от размера ответа
+"""
+
+import codecs
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from functools import reduce
+from operator import or_
+from typing import Any, Final, Iterable, Iterator
+
+from pydantic import ValidationError
+from requests import Response
+
+from ._validation import Schema, adapter, describe
+
+DEFAULT_CHUNK_SIZE: Final[int] = 64 * 1024
+# Сколько описаний ошибок валидации хранится в статистике
+ERRORS_LIMIT: Final[int] = 10
+_WHITESPACE: Final[str] = " \t\n\r"
+_DELIMITERS: Final[str] = _WHITESPACE + ",]"
+_SPACES: Final[re.Pattern] = re.compile(f"[{_WHITESPACE}]*")
+
+
+class StreamError(ValueError):
+    """Тело ответа не является json массивом"""
+
+
+@dataclass(slots=True)
+class StreamStats:
+    """Статистика потокового разбора"""
+
+    items: int = 0
+    invalid: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> int:
+        """Элементы, прошедшие валидацию"""
+        return self.items - self.invalid
+
+    def as_dict(self) -> dict[str, Any]:
+        """Статистика для отчета"""
+        return asdict(self) | {"valid": self.valid}
+
+
+class _ArrayReader:
+    """Буфер из последовательности чанков с позицией разбора"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._source = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self.buffer, self.pos, self.eof = "", 0, False
+
+    def read(self) -> bool:
+        """Дочитать чанк в буфер, отбросив разобранное. False - данных больше нет"""
+        if self.eof:
+            return False
+        chunk = next(self._source, None)
+        self.eof = chunk is None
+        start, self.pos = self.pos, 0
+        self.buffer = self.buffer[start:] + self._utf8.decode(chunk or b"", final=self.eof)
+        return True
+
+    def peek(self) -> str | None:
+        """Следующий значащий символ, None - конец данных"""
+        while True:
+            self.pos = _SPACES.match(self.buffer, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read():
+                return None
+
+    def items(self) -> Iterator[Any]:
+        """Элементы массива до закрывающей скобки"""
+        while True:
+            if self.peek() is None:
+                raise StreamError("Unexpected end of json array")
+            yield self._item()
+            if self._separator() == "]":
+                return
+
+    def _item(self) -> Any:
+        """
+        Элемент с текущей позиции. Элемент принимается только перед разделителем или в конце данных:
+        число на границе чанка может продолжиться в следующем
+        """
+        while True:
+            decoded = self._decode()
+            if decoded is not None and (self.eof or self._delimited(decoded[1])):
+                item, self.pos = decoded
+                return item
+            self.read()
+
+    def _decode(self) -> tuple[Any, int] | None:
+        """Элемент и позиция его конца, None - элемент еще не дочитан"""
+        try:
+            return self._decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError as err:
+            if self.eof:
+                raise StreamError(f"Broken json array: {err}") from err
+            return None
+
+    def _delimited(self, end: int) -> bool:
+        return end < len(self.buffer) and self.buffer[end] in _DELIMITERS
+
+    def _separator(self) -> str:
+        """Разделитель после элемента: ',' или ']'"""
+        separator = self.peek()
+        if separator is None or separator not in ",]":
+            raise StreamError(f"Expected ',' or ']' after item, got {separator!r}")
+        self.pos += 1
+        return separator
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Элементы json массива из последовательности чанков байт.
+    Элемент разбирается json.JSONDecoder.raw_decode, как только в буфере есть он и следующий за ним разделитель
+    :raises StreamError: Данные не являются json массивом или оборваны
+    """
+    reader = _ArrayReader(chunks)
+    if reader.peek() != "[":
+        raise StreamError("Expected json array")
+    reader.pos += 1
+    if reader.peek() == "]":
+        reader.pos += 1
+    else:
+        yield from reader.items()
+    if reader.peek() is not None:
+        raise StreamError("Unexpected data after json array")
+
+
+def item_schema(schema: Schema) -> Any:
+    """Схема элемента: [Model] -> Model, [ModelA, ModelB] -> ModelA | ModelB"""
+    if isinstance(schema, (list, tuple)):
+        return reduce(or_, schema)
+    return schema
+
+
+def _counted_chunks(response: Response, chunk_size: int, stats: StreamStats) -> Iterator[bytes]:
+    for chunk in response.iter_content(chunk_size):
+        stats.bytes += len(chunk)
+        yield chunk
+
+
+def _counted_items(items: Iterator[Any], stats: StreamStats) -> Iterator[Any]:
+    for item in items:
+        stats.items += 1
+        yield item
+
+
+def _record_invalid(stats: StreamStats, index: int, err: ValidationError, *, strict: bool) -> None:
+    """Учесть невалидный элемент, при strict - упасть"""
+    stats.invalid += 1
+    message = f"[{index}] {describe(err)}"
+    if strict:
+        raise AssertionError(f"Schema error:\n{message}") from err
+    if len(stats.errors) < ERRORS_LIMIT:
+        stats.errors.append(message)
+
+
+def _validated_items(items: Iterator[Any], schema: Schema, *, strict: bool, stats: StreamStats) -> Iterator[Any]:
+    """Элементы, прошедшие валидацию схемой элемента"""
+    item_adapter = adapter(item_schema(schema))
+    for index, item in enumerate(items):
+        try:
+            model = item_adapter.validate_python(item)
+        except ValidationError as err:
+            _record_invalid(stats, index, err, strict=strict)
+            continue
+        yield model
+
+
+def stream_items(
+    response: Response,
+    schema: Schema | None = None,
+    *,
+    strict: bool = False,
+    stats: StreamStats | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Элементы json массива из тела ответа, полученного с stream=True. Ответ закрывается по окончании
+    :param schema: Схема элемента: модель или [модель], без схемы - элементы как есть
+    :param strict: Падать на невалидном элементе, иначе элемент пропускается и учитывается в stats
+    :param stats: Статистика, заполняемая по ходу разбора
+    """
+    stats = StreamStats() if stats is None else stats
+    start = time.perf_counter()
+    items = _counted_items(iter_json_array(_counted_chunks(response, chunk_size, stats)), stats)
+    if schema is not None:
+        items = _validated_items(items, schema, strict=strict, stats=stats)
+    try:
+        yield from items
+    finally:
+        stats.elapsed = time.perf_counter() - start
+        response.close()
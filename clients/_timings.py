@@ -0,0 +1,71 @@
+"""Время запросов по шаблонам эндпоинтов: полное время и время до первого байта"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from ._histogram import LatencyHistogram
+
+
+@dataclass(slots=True)
+class EndpointTiming:
+    """Гистограммы одного эндпоинта"""
+
+    wall: LatencyHistogram = field(default_factory=LatencyHistogram)
+    ttfb: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Сводка в миллисекундах"""
+        return {"wall_ms": self.wall.as_dict(), "ttfb_ms": self.ttfb.as_dict()}
+
+
+class EndpointTimings:
+    """
+    Гистограммы по ключу "METHOD /template/{placeholder}".
+    Память ограничена числом эндпоинтов и не зависит от числа запросов
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._endpoints: dict[str, EndpointTiming] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, template: str, wall: float, ttfb: float) -> None:
+        """Учесть запрос: полное время и время до получения заголовков ответа в секундах"""
+        if not self.enabled:
+            return
+        key = f"{method} {template}"
+        if (timing := self._endpoints.get(key)) is None:
+            with self._lock:
+                timing = self._endpoints.setdefault(key, EndpointTiming())
+        timing.wall.record(wall)
+        timing.ttfb.record(ttfb)
+
+    def __getitem__(self, key: str) -> EndpointTiming:
+        return self._endpoints[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._endpoints))
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Сводка по эндпоинтам"""
+        return {key: self._endpoints[key].as_dict() for key in sorted(self)}
+
+    def dump(self, path: Path | str) -> None:
+        """Сохранить сводку в json"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def clear(self) -> None:
+        """Сбросить гистограммы"""
+        with self._lock:
+            self._endpoints.clear()
+
+
+timings = EndpointTimings()
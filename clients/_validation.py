@@ -0,0 +1,66 @@
+"""Валидация ответов схемами pydantic через закешированные TypeAdapter"""
+
+import sys
+from functools import lru_cache, reduce
+from operator import or_
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from requests import Response
+
+from ._json import JsonListView, JsonView
+
+Schema = type[BaseModel] | list[type[BaseModel]] | Any
+
+
+def normalize(schema: Schema) -> Any:
+    """
+    Привести схему к типу для TypeAdapter
+    [Model] -> list[Model], [ModelA, ModelB] -> list[ModelA | ModelB], остальное без изменений
+    """
+    if isinstance(schema, (list, tuple)):
+        return list[reduce(or_, schema)]  # type: ignore[misc]
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def adapter(schema: Schema) -> TypeAdapter:
+    """Закешированный TypeAdapter схемы"""
+    return _adapter(normalize(schema))
+
+
+def _is_box(data: Any, name: str) -> bool:
+    """Проверка типа box без импорта: если box не загружен, данных Box быть не может"""
+    box = sys.modules.get("box")
+    return box is not None and isinstance(data, getattr(box, name))
+
+
+def validate(data: Any, schema: Schema) -> Any:
+    """
+    Валидация данных схемой, возвращает типизированную модель
+    Ответ и байты валидируются validate_json за один проход без промежуточной десериализации
+    :raises ValidationError: Данные не соответствуют схеме
+    """
+    type_adapter = adapter(schema)
+    if isinstance(data, Response):
+        return type_adapter.validate_json(data.content)
+    if isinstance(data, (bytes, bytearray, str)):
+        return type_adapter.validate_json(data)
+    if isinstance(data, JsonView) or _is_box(data, "Box"):
+        data = data.to_dict()
+    elif isinstance(data, JsonListView) or _is_box(data, "BoxList"):
+        data = data.to_list()
+    return type_adapter.validate_python(data)
+
+
+def describe(error: ValidationError) -> str:
+    """Человекочитаемое описание ошибок валидации"""
+    lines = []
+    for item in error.errors():
+        field = ".".join(str(loc) for loc in item.get("loc", ["unknown"])) or "root"
+        lines.append(f"Ошибка в поле '{field}': {item.get('msg', 'unknown error')} (тип ошибки: {item.get('type')})")
+    return "\n".join(lines)
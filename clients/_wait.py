@@ -0,0 +1,192 @@
+"""Стратегии ожидания и статистика ожиданий"""
+
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from requests import Response
+
+
+class WaitRequestError(Exception):
+    """Базовый exception для ожидания"""
+
+
+@dataclass(slots=True)
+class WaitStats:
+    """Статистика одного ожидания"""
+
+    attempts: int = 0
+    waited: float = 0.0
+    elapsed: float = 0.0
+    time_to_success: float | None = None
+
+    @property
+    def success(self) -> bool:
+        """Ожидание завершилось успешно"""
+        return self.time_to_success is not None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Словарь для отчета"""
+        return asdict(self) | {"success": self.success}
+
+
+class Deadline:
+    """Дедлайн на монотонных часах"""
+
+    __slots__ = ("start", "timeout")
+
+    def __init__(self, timeout: float):
+        self.start = time.monotonic()
+        self.timeout = timeout
+
+    @property
+    def elapsed(self) -> float:
+        """Прошло с начала"""
+        return time.monotonic() - self.start
+
+    @property
+    def remaining(self) -> float:
+        """Осталось до дедлайна"""
+        return max(self.timeout - self.elapsed, 0.0)
+
+    @property
+    def expired(self) -> bool:
+        """Дедлайн наступил"""
+        return self.remaining <= 0
+
+    def sleep(self, delay: float) -> float:
+        """Сон, ограниченный оставшимся временем. Возвращает фактическую длительность"""
+        delay = min(max(delay, 0.0), self.remaining)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def asleep(self, delay: float) -> float:
+        """Асинхронный сон, аналог sleep"""
+        delay = min(max(delay, 0.0), self.remaining)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class WaitStrategy:
+    """Базовая стратегия ожидания: фиксированный интервал между попытками"""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+
+    def delay(self, attempt: int, response: Response | None = None) -> float:
+        """
+        Пауза перед следующей попыткой
+        :param attempt: Номер завершенной попытки, начиная с 1
+        :param response: Последний полученный ответ, если есть
+        """
+        return self.interval
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={v}' for k, v in vars(self).items())})"
+
+
+class ExponentialBackoff(WaitStrategy):
+    """Экспоненциальный рост паузы с ограничением и случайным разбросом"""
+
+    def __init__(self, initial: float = 0.1, factor: float = 2.0, max_delay: float = 5.0, jitter: float = 0.5):
+        """
+        :param initial: Пауза после первой попытки
+        :param factor: Множитель паузы
+        :param max_delay: Максимальная пауза
+        :param jitter: Доля паузы, на которую она случайно уменьшается (0 - без разброса, 1 - full jitter)
+        """
+        super().__init__(interval=initial)
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt: int, response: Response | None = None) -> float:
+        delay = min(self.interval * self.factor ** (attempt - 1), self.max_delay)
+        return delay * (1 - self.jitter * random.random())
+
+
+class FastThenSlow(WaitStrategy):
+    """Несколько частых попыток, затем редкие"""
+
+    def __init__(self, fast: float = 0.1, fast_attempts: int = 5, slow: float = 1.0):
+        super().__init__(interval=slow)
+        self.fast = fast
+        self.fast_attempts = fast_attempts
+
+    def delay(self, attempt: int, response: Response | None = None) -> float:
+        return self.fast if attempt <= self.fast_attempts else self.interval
+
+
+class RetryAfter(WaitStrategy):
+    """Пауза из заголовка Retry-After ответа, при его отсутствии - резервная стратегия"""
+
+    def __init__(self, fallback: WaitStrategy | None = None, max_delay: float = 30.0):
+        super().__init__()
+        self.fallback = fallback or ExponentialBackoff()
+        self.max_delay = max_delay
+
+    @staticmethod
+    def parse(value: str) -> float | None:
+        """Значение Retry-After в секундах: число секунд или HTTP дата"""
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self, attempt: int, response: Response | None = None) -> float:
+        if response is not None and (value := response.headers.get("Retry-After")):
+            if (delay := self.parse(value)) is not None:
+                return min(max(delay, 0.0), self.max_delay)
+        return self.fallback.delay(attempt, response)
+
+
+@dataclass(slots=True)
+class Poller:
+    """Цикл попыток по стратегии с дедлайном и статистикой"""
+
+    timeout: float
+    strategy: WaitStrategy
+    stats: WaitStats = field(default_factory=WaitStats)
+    deadline: Deadline = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.deadline = Deadline(self.timeout)
+
+    def attempt(self) -> int:
+        """Начать попытку, возвращает ее номер"""
+        self.stats.attempts += 1
+        return self.stats.attempts
+
+    def success(self) -> None:
+        """Отметить успех"""
+        self.stats.elapsed = self.stats.time_to_success = self.deadline.elapsed
+
+    def pause(self, response: Response | None = None) -> bool:
+        """
+        Пауза перед следующей попыткой, не дольше оставшегося времени.
+        False - время ожидания вышло, после паузы до дедлайна выполняется последняя попытка
+        """
+        if self.deadline.expired:
+            self.stats.elapsed = self.deadline.elapsed
+            return False
+        self.stats.waited += self.deadline.sleep(self.strategy.delay(self.stats.attempts, response))
+        self.stats.elapsed = self.deadline.elapsed
+        return True
+
+    async def apause(self, response: Response | None = None) -> bool:
+        """Асинхронная пауза, аналог pause: не блокирует цикл событий"""
+        if self.deadline.expired:
+            self.stats.elapsed = self.deadline.elapsed
+            return False
+        self.stats.waited += await self.deadline.asleep(self.strategy.delay(self.stats.attempts, response))
+        self.stats.elapsed = self.deadline.elapsed
+        return True
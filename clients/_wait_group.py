@@ -0,0 +1,150 @@
+"""Конкурентное ожидание множества запросов по общему расписанию"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable
+
+from requests import Response
+
+from src.cases import attach, step
+
+from ._request import Handler, WaitRequest
+from ._session import DEFAULT_CONCURRENCY
+from ._validation import Schema
+from ._wait import Poller, WaitRequestError, WaitStats, WaitStrategy
+
+logger = logging.getLogger(__package__)
+
+
+def _poll(  # noqa: CCR001
+    waits: list[WaitRequest],
+    *,
+    need: int,
+    status: int,
+    handler: Callable[[Response], Any] | str | None,
+    schema: Schema | None,
+    return_result: bool,
+    timeout: float | None,
+    strategy: WaitStrategy | None,
+    workers: int,
+) -> dict[int, Any]:
+    """
+    Опрос целей до получения need результатов
+    Каждый тик отправляет запросы всех неготовых целей параллельно, проверки выполняются в вызывающем потоке.
+    Готовые цели исключаются из опроса
+    """
+    # pylint: disable=protected-access
+    poller = Poller(
+        timeout=timeout if timeout is not None else max(wait.timeout for wait in waits),
+        strategy=strategy or WaitStrategy(min(wait.interval for wait in waits)),
+    )
+    pending = dict(enumerate(waits))
+    results: dict[int, Any] = {}
+    errors: dict[int, BaseException] = {}
+    for wait in waits:
+        wait.stats = WaitStats()
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(waits))) as executor:
+            while True:
+                poller.attempt()
+                futures = {executor.submit(wait.request._send): index for index, wait in pending.items()}
+                # Пауза учитывает последний по времени ответ неготовой цели: ответы готовых целей на нее не влияют
+                last_response = None
+                for future in as_completed(futures):
+                    index = futures[future]
+                    wait = pending[index]
+                    wait.stats.attempts += 1
+                    response = None
+                    try:
+                        response = future.result()
+                        processed = wait.request._process(response, status=status, handler=handler, schema=schema)
+                        results[index] = wait.check(processed, return_result=return_result)
+                    except Exception as err:  # pylint: disable=broad-exception-caught
+                        errors[index] = err
+                        last_response = last_response if response is None else response
+                        continue
+                    wait.stats.elapsed = wait.stats.time_to_success = poller.deadline.elapsed
+                    del pending[index]
+                    errors.pop(index, None)
+                logger.debug(f"Wait group tick {poller.stats.attempts}: {len(results)}/{len(waits)} done")
+                if len(results) >= need:
+                    poller.success()
+                    return results
+                if not poller.pause(last_response):
+                    break
+    finally:
+        for wait in pending.values():
+            wait.stats.waited = poller.stats.waited
+            wait.stats.elapsed = poller.stats.elapsed
+        attach("Wait stats", poller.stats.as_dict() | {"done": len(results), "targets": len(waits)})
+    report = "\n".join(f"{waits[index].request}: {errors.get(index)}" for index in pending)
+    raise WaitRequestError(f"Targets did not converge {len(pending)}/{len(waits)}:\n{report}")
+
+
+def wait_all(
+    *waits: WaitRequest,
+    status: int,
+    handler: Callable[[Response], Any] | str | None = Handler.json,
+    schema: Schema | None = None,
+    step_name: str | None = None,
+    return_result: bool = False,
+    timeout: float | None = None,
+    strategy: WaitStrategy | None = None,
+    workers: int = DEFAULT_CONCURRENCY,
+) -> list[Any]:
+    """
+    Дождаться выполнения условий всех ожиданий
+    :param waits: Ожидания, созданные через request.wait(...)
+    :param timeout: Общий таймаут, по умолчанию максимальный из ожиданий
+    :param strategy: Общая стратегия пауз, по умолчанию минимальный интервал из ожиданий
+    :param workers: Число параллельных запросов в тике
+    :return: Результаты в порядке ожиданий
+    :raises WaitRequestError: Со списком целей, не дождавшихся условия
+    """
+    if not waits:
+        return []
+    with step(step_name):
+        results = _poll(
+            list(waits),
+            need=len(waits),
+            status=status,
+            handler=handler,
+            schema=schema,
+            return_result=return_result,
+            timeout=timeout,
+            strategy=strategy,
+            workers=workers,
+        )
+    return [results[index] for index in range(len(waits))]
+
+
+def wait_any(
+    *waits: WaitRequest,
+    status: int,
+    handler: Callable[[Response], Any] | str | None = Handler.json,
+    schema: Schema | None = None,
+    step_name: str | None = None,
+    return_result: bool = False,
+    timeout: float | None = None,
+    strategy: WaitStrategy | None = None,
+    workers: int = DEFAULT_CONCURRENCY,
+) -> tuple[int, Any]:
+    """
+    Дождаться выполнения условия любого из ожиданий, параметры как у wait_all
+    :return: Индекс первого выполненного ожидания и его результат
+    """
+    assert waits, "At least one wait is required"
+    with step(step_name):
+        results = _poll(
+            list(waits),
+            need=1,
+            status=status,
+            handler=handler,
+            schema=schema,
+            return_result=return_result,
+            timeout=timeout,
+            strategy=strategy,
+            workers=workers,
+        )
+    index = min(results)
+    return index, results[index]
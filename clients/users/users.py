@@ -1,13 +1,17 @@
 """Users Client https://jsonplaceholder.typicode.com"""
 
-from .._meta import MetaCategory, request
+from .._meta import MetaCategory, category, request
 from .._request import Request
-from .._session import Session
+from .._session import AsyncSession, Session
 
 
 class UsersGet(MetaCategory):
     """Get запросы"""
 
+    @request.get("/users")
+    def get_users(self) -> Request:
+        """Список пользователей: json массив, ?page=1&limit=100"""
+
     @request.get("/users/{user_id}")
     def get_user(self) -> Request:
         """get_address"""
@@ -32,12 +36,14 @@ class UsersPost(MetaCategory):
 class UsersClient(Session):
     """Клиент для взаимодействия с сервисом авторизации"""
 
-    @property
+    @category(UsersGet)
     def get(self) -> UsersGet:
         """GET Requests"""
-        return UsersGet(self)
 
-    @property
+    @category(UsersPost)
     def post(self) -> UsersPost:
         """POST Requests"""
-        return UsersPost(self)
+
+
+class AsyncUsersClient(AsyncSession, UsersClient):
+    """Асинхронный клиент Users сервиса: запросы категорий возвращают awaitable AsyncRequest"""
@@ -1,10 +1,14 @@
-# Auto-generate 2025-03-26 20:44:59 UTC
+# Auto-generate 2026-10-17 19:43:26 UTC
+
+from typing import type_check_only
 
 from .._meta import MetaCategory
-from .._request import Request
-from .._session import Session
+from .._request import AsyncRequest, Request
+from .._session import AsyncSession, Session
 
 class UsersGet(MetaCategory):
+    @property
+    def get_users(self) -> Request: ...
     @property
     def get_user(self) -> Request: ...
     @property
@@ -21,3 +25,25 @@ class UsersClient(Session):
     def get(self) -> UsersGet: ...
     @property
     def post(self) -> UsersPost: ...
+
+class AsyncUsersClient(AsyncSession, UsersClient):
+    @property
+    def get(self) -> AsyncUsersGet: ...
+    @property
+    def post(self) -> AsyncUsersPost: ...
+
+@type_check_only
+class AsyncUsersGet(UsersGet):
+    @property
+    def get_users(self) -> AsyncRequest: ...
+    @property
+    def get_user(self) -> AsyncRequest: ...
+    @property
+    def get_order(self) -> AsyncRequest: ...
+
+@type_check_only
+class AsyncUsersPost(UsersPost):
+    @property
+    def create_user(self) -> AsyncRequest: ...
+    @property
+    def create_order(self) -> AsyncRequest: ...
@@ -3,17 +3,27 @@
 # pylint: disable=redefined-outer-name
 
 import logging
+import time
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, Generator, Iterator
 
+import allure
 import pytest
 import urllib3
 from environs import Env
+from pluggy import Result
 from pytest import Function
 
-from clients import UsersClient
-from src.db_client import DataBaseClient
-from src.user_types import DBSettings
+from clients import Cassette, ResponseCache, UsersClient, journal, timings
+from src.cases import ReportMode, report_mode, set_report_mode
+from src.durations import DurationStore, longest_first, lpt, module_of
+from src.factory import factory
+from src.user_types import DBSettings, PoolSettings
+from src.workers import MASTER, Rendezvous, partition, worker_count, worker_id
+
+if TYPE_CHECKING:
+    # SQLAlchemy загружается только в тестах, которым нужна БД
+    from src.db_client import DataBaseClient, EngineRegistry
 
 for i in ("faker.factory",):
     logging.getLogger(i).setLevel(level=logging.ERROR)
@@ -24,6 +34,14 @@ logger = logging.getLogger("pytest")
 
 PROJECT_ROOT = Path(__file__).parent
 ALLURE_RESULTS_DIR = PROJECT_ROOT / "allure-results"
+JOURNAL_MARK = pytest.StashKey[int]()
+DURATIONS = pytest.StashKey[DurationStore]()
+DURATION_KEY = pytest.StashKey[str]()
+STARTED = pytest.StashKey[float]()
+# Значение HOST, при котором тесты идут в заглушку Users сервиса
+FAKE_HOST = "fake"
+# Пользователи и заказы, которые заглушка создает при старте
+FAKE_SEED = 20
 
 
 def pytest_addoption(parser: pytest.Parser) -> None:
@@ -33,6 +51,17 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default="test.env",
         help="Полное имя файла из корня проекта",
     )
+    parser.addoption(
+        "--durations-store",
+        default="test_durations.json",
+        help="Файл времени тестов из корня проекта, пустое значение - время не сохраняется",
+    )
+    parser.addoption(
+        "--schedule",
+        default="duration",
+        choices=("duration", "collection"),
+        help="Порядок тестов: duration - долгие модули первыми по времени прошлых запусков, collection - как собраны",
+    )
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -45,6 +74,42 @@ def pytest_configure(config: pytest.Config) -> None:
     # Установка опции для Allure
     config.option.allure_report_dir = str(ALLURE_RESULTS_DIR)
 
+    config.addinivalue_line("markers", "report_mode(mode): режим отчета allure для теста (full/summary/off)")
+
+    store = config.getoption("durations_store")
+    config.stash[DURATIONS] = DurationStore(PROJECT_ROOT / store if store else None)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """
+    Долгие модули запускаются первыми. С --dist loadgroup модули делятся по воркерам по LPT через xdist_group.
+    Выполняется до xdist, который добавляет группу к nodeid
+    """
+    for item in items:
+        item.stash[DURATION_KEY] = item.nodeid
+    store = config.stash[DURATIONS]
+    if config.getoption("schedule") != "duration" or not store.known:
+        return
+    costs = store.module_costs(item.nodeid for item in items)
+    order = {module: position for position, module in enumerate(longest_first(costs))}
+    items.sort(key=lambda item: order[module_of(item.nodeid)])
+    if getattr(config.option, "loadgroup", False):
+        _mark_lpt_groups(items, costs)
+
+
+def _mark_lpt_groups(items: list[pytest.Item], costs: dict[str, float]) -> None:
+    """Группа xdist по модулю теста, явно заданные группы не меняются"""
+    groups = lpt(costs, worker_count())
+    for item in items:
+        if item.get_closest_marker("xdist_group") is None:
+            item.add_marker(pytest.mark.xdist_group(f"lpt{groups[module_of(item.nodeid)]}"))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Сохраняет время тестов текущего процесса"""
+    session.config.stash[DURATIONS].save()
+
 
 @pytest.fixture(scope="session")
 def _env(pytestconfig) -> Env:
@@ -57,42 +122,224 @@ def _env(pytestconfig) -> Env:
     return env
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session", autouse=True)
+def _request_journal(_env: Env) -> Iterator[None]:
+    """Настройка журнала запросов"""
+    with _env.prefixed("JOURNAL_"):
+        journal.configure(
+            body_limit=_env.int("BODY_LIMIT", None),
+            buffer_size=_env.int("BUFFER_SIZE", None),
+            path=_env.str("FILE", "") or None,
+        )
+    yield
+    journal.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _endpoint_timings(_env: Env) -> Iterator[None]:
+    """Сводка времени запросов по эндпоинтам в json в конце сессии"""
+    with _env.prefixed("TIMINGS_"):
+        timings.enabled = _env.bool("ENABLED", True)
+        path = _env.str("FILE", "")
+    yield
+    if timings.enabled and path and len(timings):
+        if (worker := worker_id()) != MASTER:
+            path = str(Path(path).with_suffix(f".{worker}.json"))
+        timings.dump(PROJECT_ROOT / path)
+        logger.info(f"Endpoint timings: {PROJECT_ROOT / path}")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _data_factory(_env: Env) -> None:
+    """Настройка фабрики тестовых данных"""
+    with _env.prefixed("FACTORY_"):
+        factory.configure(
+            seed=_env.int("SEED", None),
+            pool_size=_env.int("POOL_SIZE", None),
+            cache_dir=_env.str("CACHE_DIR", "") or None,
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _report_settings(_env: Env) -> None:
+    """Режим отчета allure из .env файла"""
+    with _env.prefixed("REPORT_"):
+        set_report_mode(_env.str("MODE", ReportMode.FULL), param_limit=_env.int("PARAM_LIMIT", None))
+
+
+@pytest.fixture(autouse=True)
+def _report_mode_marker(request: pytest.FixtureRequest) -> Iterator[None]:
+    """Режим отчета для теста из маркера report_mode"""
+    if (marker := request.node.get_closest_marker("report_mode")) is None:
+        yield
+        return
+    with report_mode(marker.args[0]):
+        yield
+
+
+@pytest.fixture(scope="session")
+def pool_config(_env: Env) -> PoolSettings:
+    """Настройки пула HTTP соединений"""
+    default = PoolSettings()
+    with _env.prefixed("POOL_"):
+        return PoolSettings(
+            connections=_env.int("CONNECTIONS", default.connections),
+            maxsize=_env.int("MAXSIZE", default.maxsize),
+            block=_env.bool("BLOCK", default.block),
+            keep_alive=_env.bool("KEEP_ALIVE", default.keep_alive),
+            retries=_env.int("RETRIES", default.retries),
+        )
+
+
+@pytest.fixture(scope="session")
+def response_cache(_env: Env) -> Iterator[ResponseCache | None]:
+    """Общий для модулей кеш ответов GET запросов, None если выключен"""
+    default = ResponseCache()
+    with _env.prefixed("CACHE_"):
+        if not _env.bool("ENABLED", False):
+            yield None
+            return
+        cache = ResponseCache(ttl=_env.float("TTL", default.ttl), maxsize=_env.int("MAXSIZE", default.maxsize))
+    yield cache
+    logger.info(f"Response cache: {cache.stats}")
+
+
+@pytest.fixture(scope="session")
+def cassette(_env: Env) -> Iterator[Cassette | None]:
+    """Кассета записи/воспроизведения обменов, None если режим off"""
+    with _env.prefixed("CASSETTE_"):
+        mode = _env.str("MODE", "off")
+        if mode == "off":
+            yield None
+            return
+        cassette = Cassette(
+            path=PROJECT_ROOT / _env.str("PATH", "cassettes/session.jsonl"),
+            mode=mode,
+            match=_env.list("MATCH", ["method", "path", "query", "body"]),
+        )
+    yield cassette
+    logger.info(f"Cassette {cassette.path}: played {cassette.played}, recorded {cassette.recorded}")
+    cassette.close()
+
+
+@pytest.fixture(scope="session")
+def rendezvous(tmp_path_factory: pytest.TempPathFactory) -> Rendezvous:
+    """Однократная настройка на все воркеры xdist через общую временную папку"""
+    root = tmp_path_factory.getbasetemp()
+    return Rendezvous(root if worker_id() == MASTER else root.parent)
+
+
+@pytest.fixture(scope="session")
+def users_service_host(_env: Env, request: pytest.FixtureRequest, rendezvous: Rendezvous) -> Iterator[str]:
+    """
+    Хост Users сервиса. HOST=fake - заглушка в процессе, пишущая в БД из настроек DATABASE_.
+    Настройки и движки БД нужны только заглушке, с настоящим сервисом они не создаются
+    """
+    if (host := _env.str("HOST")) != FAKE_HOST:
+        yield host
+        return
+    from src.fake_service import FakeUsersService  # pylint: disable=import-outside-toplevel
+
+    db_config: DBSettings = request.getfixturevalue("db_config")
+    db_engines: "EngineRegistry" = request.getfixturevalue("db_engines")
+    with FakeUsersService(engine=db_engines.engine(db_config)) as service:
+        # База общая для воркеров, заполняется один раз
+        rendezvous.run_once("fake-users-seed", lambda: bool(service.seed(users=FAKE_SEED, orders=FAKE_SEED)))
+        yield service.url
+
+
+@pytest.fixture(scope="session")
+def worker_user_ids() -> list[int]:
+    """Пользователи заглушки, закрепленные за текущим воркером xdist"""
+    return list(partition(range(1, FAKE_SEED + 1)))
+
+
+@pytest.fixture(scope="session")
 def not_authorize_users_client(
-    _env: Env,
+    users_service_host: str,
+    pool_config: PoolSettings,
+    response_cache: ResponseCache | None,
+    cassette: Cassette | None,
 ) -> Iterator[UsersClient]:
-    """Не авторизованный клиент Users сервиса"""
+    """Не авторизованный клиент Users сервиса, один на воркер"""
     with UsersClient(
-        host=_env.str("HOST"),
+        host=users_service_host,
+        pool=pool_config,
+        cache=response_cache,
+        cassette=cassette,
     ) as session:
         yield session
 
 
 @pytest.fixture(scope="session")
-def db_config(_env: Env) -> DBSettings:
-    """Настройки базы"""
+def db_config(_env: Env, rendezvous: Rendezvous) -> DBSettings:
+    """Настройки базы. Sqlite без имени - файл во временной папке, общий для воркеров и заглушки"""
+    default = DBSettings(host="", port=0, name="", user="", password="")
     with _env.prefixed("DATABASE_"):
+        client = _env.str("CLIENT", default.client)
+        name = _env.str("NAME")
+        if client == "sqlite" and not name:
+            name = str(rendezvous.root / "users.sqlite")
         return DBSettings(
             host=_env.str("HOST"),
             port=_env.int("PORT"),
-            name=_env.str("NAME"),
+            name=name,
             user=_env.str("USER"),
             password=_env.str("PASSWORD"),
+            client=client,
+            pool_size=_env.int("POOL_SIZE", default.pool_size),
+            max_overflow=_env.int("MAX_OVERFLOW", default.max_overflow),
+            pool_pre_ping=_env.bool("POOL_PRE_PING", default.pool_pre_ping),
+            pool_recycle=_env.int("POOL_RECYCLE", default.pool_recycle),
+            trusted_rows=_env.bool("TRUSTED_ROWS", default.trusted_rows),
         )
 
 
-@pytest.fixture(scope="module")
-def db_client(db_config: DBSettings) -> DataBaseClient:  # type:ignore[misc]
-    """Клиент базы данных"""
+@pytest.fixture(scope="session")
+def db_engines() -> Iterator["EngineRegistry"]:
+    """Общие для процесса движки БД, закрываются в конце сессии"""
+    from src.db_client import engines  # pylint: disable=import-outside-toplevel
+
+    yield engines
+    engines.dispose_all()
+
+
+@pytest.fixture
+def db_client(db_config: DBSettings, db_engines: "EngineRegistry") -> "DataBaseClient":  # type:ignore[misc]
+    """Клиент базы данных: легкая сессия на общем движке"""
+    from src.db_client import DataBaseClient  # pylint: disable=import-outside-toplevel
+
     with DataBaseClient(**db_config.get()) as data_base:  # type:ignore[arg-type]
         yield data_base
 
 
+def pytest_runtest_setup(item: Function) -> None:
+    """Запоминает номер последнего запроса и время до начала теста"""
+    item.stash[STARTED] = time.perf_counter()
+    item.stash[JOURNAL_MARK] = journal.last_number
+
+
 def pytest_runtest_call(item: Function) -> None:
     """Start test logging"""
     logger.debug(f"Test started: {item.nodeid}")
 
 
-def pytest_runtest_teardown(item: Function) -> None:
-    """End test logging"""
-    logger.debug(f"Test finished: {item.nodeid}")
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item: Function) -> Generator[None, Result[pytest.TestReport], None]:
+    """Прикладывает к упавшему тесту последние запросы из журнала"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed and report.when == "call" and (dump := journal.dump(since=item.stash.get(JOURNAL_MARK, 0))):
+        allure.attach(dump, name="Requests journal", attachment_type=allure.attachment_type.TEXT)
+        report.sections.append(("Requests journal", dump))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Function) -> Iterator[None]:
+    """Записывает время теста от начала setup до конца teardown, включая фикстуры"""
+    yield
+    if (started := item.stash.get(STARTED, None)) is None:
+        return
+    duration = time.perf_counter() - started
+    item.config.stash[DURATIONS].record(item.stash.get(DURATION_KEY, item.nodeid), duration)
+    logger.debug(f"Test finished: {item.nodeid} in {duration:.3f}s")
@@ -0,0 +1,83 @@
+"""
+Время импорта модулей по данным python -X importtime
+Модули импортируются в отдельном процессе, чтобы не учитывать уже загруженные
+"""
+
+import subprocess
+import sys
+from argparse import ArgumentParser, Namespace
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+ROOT: Final[Path] = Path(__file__).parent.parent
+# Модули, импортируемые при старте pytest
+DEFAULT_MODULES: Final[tuple[str, ...]] = ("conftest",)
+
+
+@dataclass(slots=True)
+class ImportTime:
+    """Строка importtime: собственное и суммарное с зависимостями время в микросекундах"""
+
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(output: str) -> list[ImportTime]:
+    """Разбор stderr python -X importtime"""
+    result = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        result.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+    return result
+
+
+def measure(modules: tuple[str, ...]) -> list[ImportTime]:
+    """Время импорта модулей в новом процессе"""
+    code = "; ".join(f"import {module}" for module in modules)
+    process = subprocess.run(
+        (sys.executable, "-X", "importtime", "-c", code), cwd=ROOT, capture_output=True, text=True, check=False
+    )
+    if process.returncode:
+        raise SystemExit(process.stderr.splitlines()[-1] if process.stderr else f"Import failed: {modules}")
+    return parse(process.stderr)
+
+
+def by_package(times: list[ImportTime]) -> dict[str, int]:
+    """Собственное время, сложенное по пакетам верхнего уровня, от самого долгого"""
+    packages: dict[str, int] = {}
+    for item in times:
+        package = item.name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + item.self_us
+    return dict(sorted(packages.items(), key=lambda pair: -pair[1]))
+
+
+def report(times: list[ImportTime], top: int) -> str:
+    """Итог, самые долгие пакеты и модули"""
+    total = sum(item.cumulative_us for item in times if item.depth == 0)
+    lines = [f"Total: {total / 1000:.1f} ms, modules: {len(times)}", "", f"{'self ms':>9}  package"]
+    lines += [f"{us / 1000:9.1f}  {name}" for name, us in list(by_package(times).items())[:top]]
+    lines += ["", f"{'cumul ms':>9} {'self ms':>9}  module"]
+    for item in sorted(times, key=lambda item: -item.cumulative_us)[:top]:
+        lines.append(f"{item.cumulative_us / 1000:9.1f} {item.self_us / 1000:9.1f}  {item.name}")
+    return "\n".join(lines)
+
+
+def run(args: Namespace) -> None:
+    print(report(measure(tuple(args.modules) or DEFAULT_MODULES), args.top))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Время импорта модулей")
+    parser.add_argument("modules", nargs="*", help=f"Модули, по умолчанию {', '.join(DEFAULT_MODULES)}")
+    parser.add_argument("--top", type=int, default=20, help="Число строк в разделах отчета")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Нагрузка на Users сервис по маршрутам UsersClient
+Без --host поднимается заглушка src.fake_service в текущем процессе
+"""
+
+import json
+import logging
+import sys
+from argparse import ArgumentParser, Namespace
+from http import HTTPStatus
+from pathlib import Path
+from typing import Final
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position
+from clients import LoadContext, LoadRunner, Operation, Request, UsersClient  # noqa: E402
+from src.fake_service import FakeUsersService  # noqa: E402
+from src.models import OrderCreate, UserCreate  # noqa: E402
+from src.user_types import PoolSettings  # noqa: E402
+
+# Смесь операций по умолчанию: маршрут -> вес
+DEFAULT_MIX: Final[str] = "post.create_user=1,get.get_user=5,post.create_order=2"
+
+
+def _create_user(request: Request, context: LoadContext) -> Request:
+    return request.body(_data=UserCreate.generate().model_dump())
+
+
+def _get_user(request: Request, context: LoadContext) -> Request | None:
+    if (user_id := context.choice("user_id")) is None:
+        return None
+    return request.path(user_id=user_id)
+
+
+def _create_order(request: Request, context: LoadContext) -> Request | None:
+    if (user_id := context.choice("user_id")) is None:
+        return None
+    return request.body(_data=OrderCreate.generate(user_id=user_id).model_dump())
+
+
+def _get_order(request: Request, context: LoadContext) -> Request | None:
+    if (order_id := context.choice("order_id")) is None:
+        return None
+    return request.path(order_id=order_id)
+
+
+def users_operations(mix: dict[str, float]) -> list[Operation]:
+    """Операции Users сервиса с весами из mix"""
+    operations = {
+        "post.create_user": Operation(
+            route="post.create_user",
+            status=HTTPStatus.CREATED,
+            prepare=_create_user,
+            collect=lambda response, context: context.remember("user_id", response.json()["id"]),
+        ),
+        "get.get_user": Operation(route="get.get_user", prepare=_get_user),
+        "post.create_order": Operation(
+            route="post.create_order",
+            status=HTTPStatus.CREATED,
+            prepare=_create_order,
+            collect=lambda response, context: context.remember("order_id", response.json()["id"]),
+        ),
+        "get.get_order": Operation(route="get.get_order", prepare=_get_order),
+    }
+    unknown = set(mix) - set(operations)
+    assert not unknown, f"Unknown operations: {sorted(unknown)}, available: {sorted(operations)}"
+    for name, weight in mix.items():
+        operations[name].weight = weight
+    return [operation for name, operation in operations.items() if name in mix]
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """post.create_user=1,get.get_user=5 -> {"post.create_user": 1.0, "get.get_user": 5.0}"""
+    result = {}
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        result[name.strip()] = float(weight or 1)
+    return result
+
+
+def run(args: Namespace) -> None:
+    service = None
+    host = args.host
+    if host is None:
+        service = FakeUsersService().start()
+        host = service.url
+    try:
+        with UsersClient(host=host, pool=PoolSettings(maxsize=args.concurrency)) as client:
+            runner = LoadRunner(
+                client,
+                users_operations(parse_mix(args.mix)),
+                rps=args.rps,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                ramp_up=args.ramp_up,
+            )
+            report = runner.run()
+    finally:
+        if service is not None:
+            service.stop()
+    print(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report.as_dict(), indent=2), encoding="utf-8")
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Нагрузка на Users сервис")
+    parser.add_argument("--host", default=None, help="Хост сервиса, по умолчанию локальная заглушка")
+    parser.add_argument("--rps", type=float, default=None, help="Целевой RPS, без него - максимальный поток")
+    parser.add_argument("--concurrency", type=int, default=10, help="Число параллельных запросов")
+    parser.add_argument("--duration", type=float, default=10.0, help="Длительность в секундах")
+    parser.add_argument("--ramp-up", dest="ramp_up", type=float, default=0.0, help="Время разгона в секундах")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Веса операций, по умолчанию {DEFAULT_MIX}")
+    parser.add_argument("--output", default=None, help="Файл для json отчета")
+    logging.basicConfig(level=logging.WARNING)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,27 @@ import black
 # Рутовая папка
 ROOT: Final[Path] = Path(__file__).parent.parent
 # Имена файлов которые надо игнорировать
-IGNORE_FILES: Final[tuple[str, ...]] = ("__init__.py", "presets.py", "_meta.py", "_request.py", "_session.py")
+IGNORE_FILES: Final[tuple[str, ...]] = (
+    "__init__.py",
+    "presets.py",
+    "_meta.py",
+    "_request.py",
+    "_route.py",
+    "_session.py",
+    "_batch.py",
+    "_cache.py",
+    "_cassette.py",
+    "_histogram.py",
+    "_load.py",
+    "_paginate.py",
+    "_stream.py",
+    "_timings.py",
+    "_journal.py",
+    "_json.py",
+    "_validation.py",
+    "_wait.py",
+    "_wait_group.py",
+)
 # Путь к папке с клиентами
 FIND_FILES_DIR: Final[str] = "clients"
 # Максимальная длина строки
@@ -26,15 +46,51 @@ REGEXES: Final[tuple[tuple[str, str], ...]] = (
     (r"@category\(.*\)", "@property"),
     (r"return \w+\(.*\)", ""),
     (r"(def \w+\(.*\) -> \w+:)", r"\1 ..."),
+    # Класс, у которого было только описание
+    (r"^(class \w+\(.*\):)\s*\n(?=\S|\Z)", r"\1 ...\n\n"),
 )
+# Категория и свойства запросов/категорий в pyi
+CATEGORY: Final[re.Pattern] = re.compile(r"^class (\w+)\(MetaCategory\):\n((?:(?:    .*)?\n)*)", re.MULTILINE)
+ASYNC_CLIENT: Final[re.Pattern] = re.compile(r"^class (Async\w+)\(AsyncSession, (\w+)\): \.\.\.\n", re.MULTILINE)
+PROPERTY: Final[re.Pattern] = re.compile(r"    @property\n    def (\w+)\(self\) -> (\w+): \.\.\.\n")
+
+
+def add_async(data: str) -> str:
+    """
+    Типы асинхронных клиентов: у категорий асинхронного клиента запросы возвращают AsyncRequest.
+    Категории Async* существуют только в pyi
+    """
+    categories = {name: body for name, body in CATEGORY.findall(data)}
+    async_categories = []
+    for name, body in categories.items():
+        body = PROPERTY.sub(lambda match: f"    @property\n    def {match[1]}(self) -> AsyncRequest: ...\n", body)
+        async_categories.append(f"@type_check_only\nclass Async{name}({name}):\n{body}")
+
+    def client(match: re.Match) -> str:
+        sync = re.search(rf"^class {match[2]}\(.*\):\n((?:(?:    .*)?\n)*)", data, re.MULTILINE)
+        body = sync[1] if sync else ""
+        properties = [
+            f"    @property\n    def {name}(self) -> Async{kind}: ...\n"
+            for name, kind in PROPERTY.findall(body)
+            if kind in categories
+        ]
+        return f"class {match[1]}(AsyncSession, {match[2]}):\n{''.join(properties) or '    ...'}\n"
+
+    if not categories or not ASYNC_CLIENT.search(data):
+        return data
+    data = ASYNC_CLIENT.sub(client, data)
+    data = data.replace("from .._request import Request\n", "from .._request import AsyncRequest, Request\n", 1)
+    data = re.sub(r"^from \.", "from typing import type_check_only\n\nfrom .", data, count=1, flags=re.MULTILINE)
+    return data.rstrip("\n") + "\n\n" + "\n".join(async_categories)
 
 
 def generate(path: Path) -> None:
     with path.open("rb") as file:
         data = file.read().decode("utf-8")
     for pattern, repl in REGEXES:
-        data = re.sub(pattern, repl, data)
+        data = re.sub(pattern, repl, data, flags=re.MULTILINE)
     data = black.format_str(data, mode=black.Mode(is_pyi=True, line_length=LINE_LENGTH))
+    data = black.format_str(add_async(data), mode=black.Mode(is_pyi=True, line_length=LINE_LENGTH))
     data = f"# Auto-generate {datetime.utcnow().isoformat(sep=' ', timespec='seconds')} UTC\n\n{data}"
     data = autoflake.fix_code(data, remove_all_unused_imports=True)
     pyi_path = path.parent / f"{path.stem}.pyi"
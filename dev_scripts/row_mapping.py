@@ -0,0 +1,61 @@
+"""
+Замер скорости создания моделей из строк БД: построчно и пакетно, с валидацией и без
+Строки берутся из sqlite в памяти, запросом с колонками в порядке, отличном от порядка полей модели
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Final
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import UserResponse  # noqa: E402 pylint: disable=wrong-import-position
+
+# Число строк в выборке
+ROWS: Final[int] = 50_000
+# Число повторов замера, берется лучший
+REPEATS: Final[int] = 3
+
+
+def load_rows() -> list[Any]:
+    """Строки пользователей из sqlite"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, age INTEGER)"))
+        connection.execute(
+            text("INSERT INTO users VALUES (:id, :username, :email, :age)"),
+            [
+                {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "age": 20 + i % 50}
+                for i in range(ROWS)
+            ],
+        )
+        return list(connection.execute(text("SELECT email, age, id, username FROM users")).fetchall())
+
+
+def measure(convert: Callable[[list[Any]], Any], rows: list[Any]) -> float:
+    """Строк в секунду, лучший из повторов"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        convert(rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best
+
+
+def main() -> None:
+    rows = load_rows()
+    cases: dict[str, Callable[[list[Any]], Any]] = {
+        "from_db_tuple": lambda rows: [UserResponse.from_db_tuple(row) for row in rows],
+        "from_db_tuple trusted": lambda rows: [UserResponse.from_db_tuple(row, trusted=True) for row in rows],
+        "from_db_rows": UserResponse.from_db_rows,
+        "from_db_rows trusted": lambda rows: UserResponse.from_db_rows(rows, trusted=True),
+    }
+    for name, convert in cases.items():
+        print(f"{name:<22} {measure(convert, rows):>12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Замер накладных расходов степов в каждом режиме отчета
+Степы открываются так же, как в Request.__call__: степ запроса с телом и вложенные степы проверок
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final
+
+from allure_commons import hookimpl, plugin_manager
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.cases import ReportMode, report_mode, step  # noqa: E402 pylint: disable=wrong-import-position
+
+# Число итераций на режим
+ITERATIONS: Final[int] = 20_000
+# Тело запроса, которое попадает в параметры степа
+BODY: Final[dict[str, Any]] = {"json": {"items": [{"id": i, "name": f"user{i}"} for i in range(200)]}}
+
+
+class _Listener:
+    """Подписчик, аналогичный allure listener: принимает степы и ничего не пишет"""
+
+    @hookimpl
+    def start_step(self, uuid: Any, title: str, params: dict[str, str]) -> None:
+        """Start step"""
+
+    @hookimpl
+    def stop_step(self, uuid: Any, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Stop step"""
+
+
+def _request_steps() -> None:
+    with step("Создать пользователя"):
+        with step("Запрос: POST /users", args=BODY):
+            pass
+        with step("Проверить код ответа: '201'"):
+            pass
+        with step("Десериализация ответа хендлером: json"):
+            pass
+
+
+def measure(mode: ReportMode) -> float:
+    """Среднее время одного степа в микросекундах"""
+    with report_mode(mode):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            _request_steps()
+        elapsed = time.perf_counter() - start
+    return elapsed / (ITERATIONS * 4) * 1_000_000
+
+
+def main() -> None:
+    listener = _Listener()
+    plugin_manager.register(listener)
+    try:
+        for mode in ReportMode:
+            print(f"{mode:<8} {measure(mode):8.2f} us/step")
+    finally:
+        plugin_manager.unregister(listener)
+    print(f"{'no allure':<8} {measure(ReportMode.FULL):8.2f} us/step")
+
+
+if __name__ == "__main__":
+    main()
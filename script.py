@@ -1,8 +1,9 @@
 #!/usr/bin/python3
 import logging
 import subprocess
+import sys
 import time
-from argparse import ArgumentParser, Namespace
+from argparse import REMAINDER, ArgumentParser, Namespace
 from functools import wraps
 from pathlib import Path
 from typing import Any, Callable, Final
@@ -31,6 +32,11 @@ def get_all_py_files() -> list[str]:  # noqa:  CCR001
 ALL_PY: Final[list[str]] = get_all_py_files()
 
 
+def forwarded(args: list[str]) -> list[str]:
+    """Параметры для скрипта команды без разделителя --"""
+    return args[1:] if args[:1] == ["--"] else args
+
+
 def cmd_log(func: Callable[[Namespace], Any]) -> Callable[[Namespace], Any]:
     """Декоратор логирования вызовов команд"""
 
@@ -98,6 +104,18 @@ def pyi_generate(arg: Namespace) -> None:
     subprocess.run(BASE_CMD + ("python", str(ROOT / "dev_scripts" / "pyi_generator.py")))
 
 
+@cmd_log
+def load_command(arg: Namespace) -> None:
+    """Запускает нагрузку на Users сервис"""
+    subprocess.run(BASE_CMD + ("python", str(ROOT / "dev_scripts" / "load.py"), *forwarded(arg.args)))
+
+
+@cmd_log
+def imports_command(arg: Namespace) -> None:
+    """Показывает время импорта модулей"""
+    subprocess.run(BASE_CMD + ("python", str(ROOT / "dev_scripts" / "import_time.py"), *forwarded(arg.args)))
+
+
 parser = ArgumentParser(description="Cli скрипт для удобной настройки", prog="CLI")
 subparser = parser.add_subparsers(dest="command", required=True, title="Команды")
 
@@ -127,6 +145,29 @@ format_parser.set_defaults(func=format_command)
 pyi_parser = subparser.add_parser("pyi", help="Генерация .pyi файлов")
 pyi_parser.set_defaults(func=pyi_generate)
 
+load_parser = subparser.add_parser("load", help="Нагрузка на Users сервис, параметры: load --help", add_help=False)
+load_parser.add_argument("args", nargs=REMAINDER, help="Параметры dev_scripts/load.py, можно после --")
+load_parser.set_defaults(func=load_command, forward=True)
+
+imports_parser = subparser.add_parser(
+    "imports", help="Время импорта модулей, параметры: imports --help", add_help=False
+)
+imports_parser.add_argument("args", nargs=REMAINDER, help="Параметры dev_scripts/import_time.py, можно после --")
+imports_parser.set_defaults(func=imports_command, forward=True)
+
+
+def parse(argv: list[str] | None = None) -> Namespace:
+    """Разбор параметров. У команд со скриптом все после имени команды передается скрипту как есть"""
+    argv = sys.argv[1:] if argv is None else argv
+    cmd_args, unknown = parser.parse_known_args(argv)
+    if getattr(cmd_args, "forward", False):
+        start = argv.index(cmd_args.command) + 1
+        cmd_args.args = forwarded(argv[start:])
+    elif unknown:
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+    return cmd_args
+
+
 if __name__ == "__main__":
-    cmd_args = parser.parse_args()
+    cmd_args = parse()
     cmd_args.func(cmd_args)
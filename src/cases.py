@@ -1,15 +1,124 @@
 """Модуль для хранения функций реализующих взаимодействие с allure и тест кейсами"""
 
-from contextlib import nullcontext
-from typing import Any
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from enum import StrEnum
+from typing import Any, Final, Iterator
 
 import allure
+from allure_commons import plugin_manager
 from allure_commons._allure import StepContext
 
+# Максимальная длина строкового представления параметра степа
+DEFAULT_PARAM_LIMIT: Final[int] = 1024
+# Глубина вложенности степов в режиме summary
+SUMMARY_DEPTH: Final[int] = 2
 
-def _parameters(**kwargs) -> dict[str, str]:
-    """Приводит все аргументы к строке"""
-    return {str(key): str(value) for key, value in kwargs.items()}
+
+class ReportMode(StrEnum):
+    """Режим отчета: full - все степы с параметрами, summary - верхние уровни без параметров, off - без степов"""
+
+    FULL = "full"
+    SUMMARY = "summary"
+    OFF = "off"
+
+
+class _Depth(threading.local):
+    """Глубина вложенности степов потока"""
+
+    value = 0
+
+
+class _Report:
+    """Настройки отчета процесса"""
+
+    mode: ReportMode = ReportMode(os.environ.get("REPORT_MODE", ReportMode.FULL))
+    param_limit: int = DEFAULT_PARAM_LIMIT
+    depth = _Depth()
+
+
+_report = _Report()
+
+
+def get_report_mode() -> ReportMode:
+    """Текущий режим отчета"""
+    return _report.mode
+
+
+def set_report_mode(mode: ReportMode | str, param_limit: int | None = None) -> None:
+    """Установить режим отчета и ограничение длины параметров"""
+    _report.mode = ReportMode(mode)
+    if param_limit is not None:
+        _report.param_limit = param_limit
+
+
+@contextmanager
+def report_mode(mode: ReportMode | str) -> Iterator[None]:
+    """Временно изменить режим отчета"""
+    previous = _report.mode
+    set_report_mode(mode)
+    try:
+        yield
+    finally:
+        _report.mode = previous
+
+
+def _listening() -> bool:
+    """Есть ли подписчики на степы (allure запущен с --alluredir)"""
+    return bool(plugin_manager.hook.start_step.get_hookimpls())
+
+
+def _parameters(params: dict[Any, Any], limit: int = DEFAULT_PARAM_LIMIT) -> dict[str, str]:
+    """Приводит все аргументы к строке не длиннее limit"""
+    result = {}
+    for key, value in params.items():
+        text = str(value)
+        result[str(key)] = text if len(text) <= limit else f"{text[:limit]}... ({len(text)} total)"
+    return result
+
+
+def _recorded(mode: ReportMode, depth: int) -> bool:
+    """Попадает ли в отчет степ на глубине depth"""
+    if mode is ReportMode.SUMMARY:
+        return depth <= SUMMARY_DEPTH
+    return mode is not ReportMode.OFF
+
+
+class _Step:
+    """
+    Степ, который решает попадать ли в отчет только при входе
+    Параметры приводятся к строке только если степ будет записан в режиме full
+    """
+
+    __slots__ = ("_title", "_params", "_kwargs", "_context")
+
+    def __init__(self, title: str, params: dict[Any, Any] | None, kwargs: dict[str, Any]):
+        self._title = title
+        self._params = params
+        self._kwargs = kwargs
+        self._context: StepContext | None = None
+
+    def __enter__(self) -> None:
+        mode = _report.mode
+        _report.depth.value += 1
+        if not _recorded(mode, _report.depth.value) or not _listening():
+            return
+        self._context = StepContext(title=self._title, params=self._parameters(mode))
+        self._context.__enter__()
+
+    def _parameters(self, mode: ReportMode) -> dict[str, str]:
+        """Параметры степа пишутся только в режиме full"""
+        if mode is not ReportMode.FULL or not (self._params or self._kwargs):
+            return {}
+        return _parameters({**(self._params or {}), **self._kwargs}, _report.param_limit)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
+        _report.depth.value -= 1
+        if self._context is not None:
+            self._context.__exit__(exc_type, exc_val, exc_tb)
+            self._context = None
 
 
 def step(
@@ -17,7 +126,7 @@ def step(
     _params: dict[Any, Any] | None = None,
     _empty: bool = False,
     **kwargs,
-) -> StepContext | nullcontext:
+) -> _Step | nullcontext:
     """
     Менеджер контекста для степа
     :param _title: Название степа
@@ -27,10 +136,21 @@ def step(
     """
     if _empty or _title is None:
         return nullcontext()
-    _params = _params or {}
-    _params.update(**kwargs)
-    params = _parameters(**_params)
-    return StepContext(title=_title, params=params)
+    return _Step(_title, _params, kwargs)
+
+
+def attach(name: str, data: Any) -> None:
+    """Приложить данные к текущему степу allure, словари и списки прикладываются как json"""
+    if _report.mode is ReportMode.OFF or not _listening():
+        return
+    if isinstance(data, (dict, list)):
+        allure.attach(
+            json.dumps(data, ensure_ascii=False, indent=2, default=str),
+            name=name,
+            attachment_type=allure.attachment_type.JSON,
+        )
+    else:
+        allure.attach(str(data), name=name, attachment_type=allure.attachment_type.TEXT)
 
 
 def case(*, id: int, title: str) -> Any:  # pylint: disable=redefined-builtin
@@ -51,4 +171,4 @@ def case(*, id: int, title: str) -> Any:  # pylint: disable=redefined-builtin
     return _wrap
 
 
-__all__ = ["case", "step"]
+__all__ = ["ReportMode", "attach", "case", "get_report_mode", "report_mode", "set_report_mode", "step"]
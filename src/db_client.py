@@ -1,17 +1,167 @@
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Self
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Final, Generic, Iterable, Iterator, Self, Sequence, TypeVar
 
 import allure
 from pydantic import ValidationError
-from sqlalchemy import create_engine
+from sqlalchemy import Connection, Engine, QueuePool, StaticPool, TextClause, bindparam, create_engine, event, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
-from src.models import OrderResponse, UserResponse
+from clients import ExponentialBackoff, Poller, WaitRequestError, WaitStrategy
+from src.cases import attach, step
+from src.models import BaseModelWithDB, OrderResponse, UserResponse
+from src.user_types import DBSettings
 
 logger = logging.getLogger(__name__)
 
+# Размер чанка id для IN (...) запросов
+DEFAULT_CHUNK_SIZE: Final[int] = 500
+# Размер пачки строк, получаемой из курсора за раз
+DEFAULT_FETCH_SIZE: Final[int] = 1000
+# Таймаут ожидания появления строк в БД
+DEFAULT_ROWS_TIMEOUT: Final[float] = 10.0
+
+M = TypeVar("M", bound=BaseModelWithDB)
+
+
+def chunked(values: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Разбить последовательность на списки по size элементов"""
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@dataclass(slots=True)
+class BulkResult(Generic[M]):
+    """Результат пакетного поиска по id"""
+
+    found: dict[int, M] = field(default_factory=dict)
+    missing: set[int] = field(default_factory=set)
+
+    def __getitem__(self, item_id: int) -> M:
+        return self.found[item_id]
+
+    def __len__(self) -> int:
+        return len(self.found)
+
+    def assert_complete(self) -> Self:
+        """Упасть, если какие-то id не найдены"""
+        assert not self.missing, f"Not found in the database: {sorted(self.missing)}"
+        return self
+
+
+@dataclass(slots=True)
+class EngineStats:
+    """Статистика пула соединений движка"""
+
+    connects: int = 0
+    checkouts: int = 0
+    checkout_wait: float = 0.0
+    checkout_wait_max: float = 0.0
+
+    @property
+    def checkout_wait_avg(self) -> float:
+        """Среднее время получения соединения из пула"""
+        return self.checkout_wait / self.checkouts if self.checkouts else 0.0
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool, замеряющий время получения соединения"""
+
+    stats: EngineStats
+
+    def connect(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            wait = time.perf_counter() - start
+            self.stats.checkouts += 1
+            self.stats.checkout_wait += wait
+            self.stats.checkout_wait_max = max(self.stats.checkout_wait_max, wait)
+
+
+class EngineRegistry:
+    """Общие для процесса движки и фабрики сессий по настройкам подключения"""
+
+    def __init__(self) -> None:
+        self._engines: dict[DBSettings, tuple[Engine, sessionmaker, EngineStats]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create(settings: DBSettings) -> tuple[Engine, sessionmaker, EngineStats]:
+        stats = EngineStats()
+        if settings.client == "sqlite" and settings.name:
+            # Файл базы: у каждого потока свое соединение из пула
+            engine = create_engine(f"sqlite:///{settings.name}")
+        elif settings.client == "sqlite":
+            # Одно соединение на процесс: база в памяти живет, пока открыто соединение
+            engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        else:
+            connection_string = (
+                f"mysql+pymysql://{settings.user}:{settings.password}@{settings.host}:{settings.port}/{settings.name}"
+            )
+            pool_class = type("TimedQueuePool", (TimedQueuePool,), {"stats": stats})
+            engine = create_engine(
+                connection_string,
+                poolclass=pool_class,
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_pre_ping=settings.pool_pre_ping,
+                pool_recycle=settings.pool_recycle,
+            )
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(*_: Any) -> None:
+            stats.connects += 1
+
+        logger.debug(
+            f"Create engine {settings.client}: {settings.host}:{settings.port} {settings.name} {settings.user}"
+        )
+        return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine), stats
+
+    def _get(self, settings: DBSettings) -> tuple[Engine, sessionmaker, EngineStats]:
+        if (entry := self._engines.get(settings)) is None:
+            with self._lock:
+                if (entry := self._engines.get(settings)) is None:
+                    entry = self._engines[settings] = self._create(settings)
+        return entry
+
+    def engine(self, settings: DBSettings) -> Engine:
+        """Движок для настроек, создается при первом обращении"""
+        return self._get(settings)[0]
+
+    def session(self, settings: DBSettings) -> Session:
+        """Новая сессия на общем движке"""
+        return self._get(settings)[1]()
+
+    def stats(self, settings: DBSettings) -> EngineStats:
+        """Статистика пула движка"""
+        return self._get(settings)[2]
+
+    def dispose_all(self) -> None:
+        """Закрыть все движки"""
+        with self._lock:
+            for settings, (engine, _, stats) in self._engines.items():
+                logger.debug(f"Dispose engine {settings.host}:{settings.port} {settings.name}: {stats}")
+                engine.dispose()
+            self._engines.clear()
+
+
+engines = EngineRegistry()
+
+
+@lru_cache(maxsize=256)
+def compile_statement(statement: str) -> TextClause:
+    """Закешированная text() конструкция для строки запроса"""
+    return text(statement)
+
 
 @dataclass(slots=True)
 class DataBaseMeta:
@@ -22,16 +172,42 @@ class DataBaseMeta:
     database: str
     user: str
     password: str
+    client: str = "mysql"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_pre_ping: bool = True
+    pool_recycle: int = 3600
+    trusted_rows: bool = False
     engine: Any = field(init=False, default=None)
     session: Session = field(init=False, default=None)
 
+    @property
+    def settings(self) -> DBSettings:
+        """Настройки подключения, ключ движка в реестре"""
+        return DBSettings(
+            host=self.host,
+            port=self.port,
+            name=self.database,
+            user=self.user,
+            password=self.password,
+            client=self.client,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=self.pool_pre_ping,
+            pool_recycle=self.pool_recycle,
+            trusted_rows=self.trusted_rows,
+        )
+
+    @property
+    def engine_stats(self) -> EngineStats:
+        """Статистика пула соединений общего движка"""
+        return engines.stats(self.settings)
+
     def connect(self) -> None:
-        """Коннект"""
-        connection_string = f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
-        self.engine = create_engine(connection_string)
-        logger.debug(f"Connection DB: {self.host}:{self.port} {self.database} {self.user}")
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self.session = SessionLocal()
+        """Коннект: сессия на общем для процесса движке"""
+        settings = self.settings
+        self.engine = engines.engine(settings)
+        self.session = engines.session(settings)
         logger.debug("Create session")
 
     def __enter__(self) -> Self:
@@ -42,20 +218,27 @@ class DataBaseMeta:
         if self.session is not None:
             logger.debug("Close session")
             self.session.close()
-        if self.engine is not None:
-            logger.debug("Dispose engine")
-            self.engine.dispose()
 
-    def execute(self, statement: str, params: dict = None) -> Any:
-        """Выполнить SQL"""
+    def execute(
+        self,
+        statement: str | TextClause,
+        params: dict = None,
+        connection: Connection | Session | None = None,
+    ) -> Any:
+        """
+        Выполнить SQL
+        :param connection: Соединение для запроса, по умолчанию сессия клиента
+        """
         logger.debug(f"Execute: {statement} {params}")
+        if isinstance(statement, str):
+            statement = compile_statement(statement)
         try:
-            return self.session.execute(statement, params)
+            return (self.session if connection is None else connection).execute(statement, params)
         except SQLAlchemyError as err:
             logger.error(f"Execute error: {err}")
             raise err
 
-    def fetchone(self, statement: str, params: dict = None) -> Any:
+    def fetchone(self, statement: str | TextClause, params: dict = None) -> Any:
         """Получить одну строку"""
         logger.debug(f"Fetch one: {statement} {params}")
         try:
@@ -65,6 +248,44 @@ class DataBaseMeta:
             logger.error(f"Fetch one error: {err}")
             raise err
 
+    def partitions(
+        self,
+        statement: str | TextClause,
+        params: dict = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
+        connection: Connection | Session | None = None,
+    ) -> Iterator[Sequence[Any]]:
+        """Чтение результата пачками по fetch_size строк без загрузки всего результата в память"""
+        result = self.execute(statement, params, connection)
+        try:
+            while rows := result.fetchmany(fetch_size):
+                yield rows
+        finally:
+            result.close()
+
+    def stream(
+        self,
+        statement: str | TextClause,
+        params: dict = None,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
+    ) -> Iterator[Any]:
+        """Построчное чтение результата пачками по fetch_size"""
+        for rows in self.partitions(statement, params, fetch_size):
+            yield from rows
+
+    @contextmanager
+    def fresh_reads(self) -> Iterator[Connection | Session]:
+        """
+        Соединение для чтения чужих коммитов, не завершающее транзакцию сессии.
+        Короткое соединение из пула со своим снимком данных. При StaticPool соединение одно на процесс,
+        закрытие откатило бы работу сессии - читается через сессию, общее соединение и так видит все записи
+        """
+        if isinstance(self.engine.pool, StaticPool):
+            yield self.session
+            return
+        with self.engine.connect() as connection:
+            yield connection
+
     def commit(self) -> None:
         """Коммит изменений"""
         logger.debug("Commit transaction")
@@ -79,16 +300,24 @@ class DataBaseMeta:
 class DataBaseClient(DataBaseMeta):
     """Клиент БД"""
 
+    USER_BY_ID = text("SELECT id, username, email, age FROM users WHERE id=:id")
+    ORDER_BY_ID = text("SELECT id, user_id, product_name, quantity FROM orders WHERE id=:id")
+    USERS_BY_IDS = text("SELECT id, username, email, age FROM users WHERE id IN :ids").bindparams(
+        bindparam("ids", expanding=True),
+    )
+    ORDERS_BY_IDS = text("SELECT id, user_id, product_name, quantity FROM orders WHERE id IN :ids").bindparams(
+        bindparam("ids", expanding=True),
+    )
+
     @allure.step("Получить пользователя из базы данных по ID")
     def get_user_by_id(self, user_id: int) -> UserResponse:
         """Получить пользователя из базы данных по ID"""
-        statement = "SELECT id, username, email, age FROM users WHERE id=:id"
         try:
-            result = self.fetchone(statement, {"id": user_id})
+            result = self.fetchone(self.USER_BY_ID, {"id": user_id})
             if result is None:
                 raise ValueError(f"User with ID {user_id} not found in the database.")
-            # Преобразование кортежа в словарь
-            return UserResponse.from_db_tuple(result)
+            # Преобразование строки в модель
+            return UserResponse.from_db_tuple(result, trusted=self.trusted_rows)
         except SQLAlchemyError as err:
             logger.error(f"Error fetching user by ID: {err}")
             raise err
@@ -99,16 +328,132 @@ class DataBaseClient(DataBaseMeta):
     @allure.step("Получить заказ из базы данных по ID")
     def get_order_by_id(self, order_id: int) -> OrderResponse:
         """Получить заказ из базы данных по ID"""
-        statement = "SELECT id, user_id, product_name, quantity FROM orders WHERE id=:id"
         try:
-            result = self.fetchone(statement, {"id": order_id})
+            result = self.fetchone(self.ORDER_BY_ID, {"id": order_id})
             if result is None:
                 raise ValueError(f"Order with ID {order_id} not found in the database.")
-            # Преобразование кортежа в словарь
-            return OrderResponse.from_db_tuple(result)
+            # Преобразование строки в модель
+            return OrderResponse.from_db_tuple(result, trusted=self.trusted_rows)
         except SQLAlchemyError as err:
             logger.error(f"Error fetching order by ID: {err}")
             raise err
         except ValidationError as err:
             logger.error(f"Validation error for order data: {err}")
             raise err
+
+    def iter_by_ids(
+        self,
+        statement: TextClause,
+        model: type[M],
+        ids: Iterable[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        connection: Connection | Session | None = None,
+    ) -> Iterator[M]:
+        """
+        Потоковое чтение моделей по id: один запрос IN (...) на чанк
+        :param statement: Запрос с expanding параметром :ids
+        :param connection: Соединение для запросов, по умолчанию сессия клиента
+        """
+        for chunk in chunked(dict.fromkeys(ids), chunk_size):
+            for rows in self.partitions(statement, {"ids": chunk}, connection=connection):
+                yield from model.from_db_rows(rows, trusted=self.trusted_rows)
+
+    def get_by_ids(
+        self,
+        statement: TextClause,
+        model: type[M],
+        ids: Iterable[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        connection: Connection | Session | None = None,
+    ) -> BulkResult[M]:
+        """Модели по id с множеством ненайденных id"""
+        ids = list(dict.fromkeys(ids))
+        result: BulkResult[M] = BulkResult()
+        for item in self.iter_by_ids(statement, model, ids, chunk_size, connection):
+            result.found[item.id] = item  # type: ignore[attr-defined]
+        result.missing = set(ids) - result.found.keys()
+        return result
+
+    def get_users_by_ids(
+        self, user_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BulkResult[UserResponse]:
+        """Получить пользователей из базы данных по списку ID"""
+        user_ids = list(user_ids)
+        with step("Получить пользователей из базы данных по ID", count=len(user_ids)):
+            return self.get_by_ids(self.USERS_BY_IDS, UserResponse, user_ids, chunk_size)
+
+    def get_orders_by_ids(
+        self, order_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> BulkResult[OrderResponse]:
+        """Получить заказы из базы данных по списку ID"""
+        order_ids = list(order_ids)
+        with step("Получить заказы из базы данных по ID", count=len(order_ids)):
+            return self.get_by_ids(self.ORDERS_BY_IDS, OrderResponse, order_ids, chunk_size)
+
+    def iter_users_by_ids(
+        self, user_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[UserResponse]:
+        """Потоково получить пользователей по ID, память не зависит от числа ID"""
+        return self.iter_by_ids(self.USERS_BY_IDS, UserResponse, user_ids, chunk_size)
+
+    def iter_orders_by_ids(
+        self, order_ids: Iterable[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[OrderResponse]:
+        """Потоково получить заказы по ID, память не зависит от числа ID"""
+        return self.iter_by_ids(self.ORDERS_BY_IDS, OrderResponse, order_ids, chunk_size)
+
+    def wait_for_rows(  # noqa: CCR001
+        self,
+        statement: TextClause,
+        model: type[M],
+        ids: Iterable[int],
+        *,
+        predicate: Callable[[M], bool] | None = None,
+        timeout: float = DEFAULT_ROWS_TIMEOUT,
+        strategy: WaitStrategy | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> list[M]:
+        """
+        Дождаться появления строк по id: один пакетный запрос на тик только по неготовым id
+        :param statement: Запрос с expanding параметром :ids
+        :param predicate: Дополнительное условие на модель, строка без него считается неготовой
+        :param strategy: Стратегия пауз, по умолчанию экспоненциальная
+        :return: Модели в порядке id
+        :raises WaitRequestError: Со списком id, не дождавшихся условия
+        """
+        ids = list(dict.fromkeys(ids))
+        pending = set(ids)
+        found: dict[int, M] = {}
+        poller = Poller(timeout=timeout, strategy=strategy or ExponentialBackoff())
+        try:
+            while True:
+                poller.attempt()
+                # Новый снимок данных на каждый тик: в REPEATABLE READ транзакция сессии не видит чужие коммиты,
+                # а незакоммиченные записи теста должны остаться в ней
+                with self.fresh_reads() as connection:
+                    rows = self.get_by_ids(statement, model, pending, chunk_size, connection).found
+                for item in rows.values():
+                    if predicate is None or predicate(item):
+                        found[item.id] = item  # type: ignore[attr-defined]
+                        pending.discard(item.id)  # type: ignore[attr-defined]
+                logger.debug(f"Wait rows tick {poller.stats.attempts}: {len(found)}/{len(ids)} done")
+                if not pending:
+                    poller.success()
+                    return [found[item_id] for item_id in ids]
+                if not poller.pause():
+                    break
+        finally:
+            attach("Wait stats", poller.stats.as_dict() | {"done": len(found), "targets": len(ids)})
+        raise WaitRequestError(f"Rows did not appear {len(pending)}/{len(ids)}: {sorted(pending)}")
+
+    def wait_for_users(self, user_ids: Iterable[int], **kwargs: Any) -> list[UserResponse]:
+        """Дождаться появления пользователей в базе данных, параметры как у wait_for_rows"""
+        user_ids = list(user_ids)
+        with step("Дождаться пользователей в базе данных", count=len(user_ids)):
+            return self.wait_for_rows(self.USERS_BY_IDS, UserResponse, user_ids, **kwargs)
+
+    def wait_for_orders(self, order_ids: Iterable[int], **kwargs: Any) -> list[OrderResponse]:
+        """Дождаться появления заказов в базе данных, параметры как у wait_for_rows"""
+        order_ids = list(order_ids)
+        with step("Дождаться заказов в базе данных", count=len(order_ids)):
+            return self.wait_for_rows(self.ORDERS_BY_IDS, OrderResponse, order_ids, **kwargs)
@@ -0,0 +1,101 @@
+"""
+Время тестов между запусками и порядок запуска по нему
+Время хранится в json {nodeid: секунды} и сглаживается между запусками. Модули запускаются от самых долгих,
+с pytest-xdist --dist loadgroup модули распределяются по воркерам от самых долгих к наименее загруженному (LPT)
+"""
+
+import heapq
+import json
+import logging
+import os
+import statistics
+from functools import cached_property
+from pathlib import Path
+from typing import Final, Iterable
+
+from src.workers import file_lock
+
+logger = logging.getLogger(__name__)
+
+# Время теста без замеров, пока в хранилище нет ни одного замера
+DEFAULT_DURATION: Final[float] = 1.0
+# Вес нового замера при сглаживании с сохраненным
+SMOOTHING: Final[float] = 0.5
+
+
+def module_of(nodeid: str) -> str:
+    """Модуль теста: tests/tests_a.py::test_b[1] -> tests/tests_a.py"""
+    return nodeid.split("::", 1)[0]
+
+
+class DurationStore:
+    """Время тестов в секундах: сохраненное с прошлых запусков и замеренное в текущем"""
+
+    def __init__(self, path: Path | None, smoothing: float = SMOOTHING):
+        """
+        :param path: json файл хранилища, None - время не сохраняется
+        :param smoothing: Вес нового замера, 1 - сохраняется только последний
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self.known = self._load()
+        self.measured: dict[str, float] = {}
+
+    def _load(self) -> dict[str, float]:
+        if self.path is None or not self.path.is_file():
+            return {}
+        try:
+            return {str(nodeid): float(seconds) for nodeid, seconds in json.loads(self.path.read_text("utf-8")).items()}
+        except (OSError, ValueError, AttributeError) as err:
+            logger.warning(f"Durations store {self.path} is broken, ignore: {err}")
+            return {}
+
+    @cached_property
+    def default(self) -> float:
+        """Время теста без замеров - медиана известных"""
+        return statistics.median(self.known.values()) if self.known else DEFAULT_DURATION
+
+    def estimate(self, nodeid: str) -> float:
+        """Ожидаемое время теста"""
+        return self.known.get(nodeid, self.default)
+
+    def record(self, nodeid: str, seconds: float) -> None:
+        """Замер теста в текущем запуске"""
+        self.measured[nodeid] = seconds
+
+    def module_costs(self, nodeids: Iterable[str]) -> dict[str, float]:
+        """Ожидаемое время модулей в порядке первого появления"""
+        costs: dict[str, float] = {}
+        for nodeid in nodeids:
+            module = module_of(nodeid)
+            costs[module] = costs.get(module, 0.0) + self.estimate(nodeid)
+        return costs
+
+    def save(self) -> None:
+        """Слить замеры с хранилищем. Воркеры сохраняют свои замеры по очереди под блокировкой"""
+        if self.path is None or not self.measured:
+            return
+        with file_lock(self.path.with_suffix(".lock")):
+            data = self._load()
+            for nodeid, seconds in self.measured.items():
+                old = data.get(nodeid)
+                data[nodeid] = round(seconds if old is None else old + self.smoothing * (seconds - old), 6)
+            temp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(dict(sorted(data.items())), indent=1), encoding="utf-8")
+            temp.replace(self.path)
+
+
+def longest_first(costs: dict[str, float]) -> list[str]:
+    """Имена от самого долгого, при равенстве - в исходном порядке"""
+    return sorted(costs, key=lambda name: -costs[name])
+
+
+def lpt(costs: dict[str, float], workers: int) -> dict[str, int]:
+    """Номер воркера для каждого имени: от самого долгого к наименее загруженному воркеру"""
+    loads = [(0.0, index) for index in range(max(workers, 1))]
+    result = {}
+    for name in longest_first(costs):
+        load, index = heapq.heappop(loads)
+        result[name] = index
+        heapq.heappush(loads, (load + costs[name], index))
+    return result
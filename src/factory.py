@@ -0,0 +1,138 @@
+"""
+Фабрика тестовых данных: пулы заранее сгенерированных данных, разделенные по воркерам pytest-xdist
+Faker генерирует данные пачками с детерминированным сидом (сид, тип, воркер, номер пачки).
+Уникальные поля получают суффикс из метки запуска, номера воркера и счетчика, поэтому не пересекаются
+ни между воркерами, ни между запусками, даже если пачки прочитаны с диска
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Final
+
+from src.workers import worker_index
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED: Final[int] = 0
+DEFAULT_POOL_SIZE: Final[int] = 500
+_DIGITS: Final[str] = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _base36(number: int) -> str:
+    result = ""
+    while True:
+        number, rest = divmod(number, 36)
+        result = _DIGITS[rest] + result
+        if not number:
+            return result
+
+
+def _user(fake: "Faker") -> dict[str, Any]:
+    return {"username": fake.user_name(), "email": fake.email(), "age": fake.random_int(min=1, max=99)}
+
+
+def _order(fake: "Faker") -> dict[str, Any]:
+    return {"product_name": fake.word(), "quantity": fake.random_int(min=1, max=10)}
+
+
+# Генераторы данных по типу
+GENERATORS: Final[dict[str, Callable[["Faker"], dict[str, Any]]]] = {"user": _user, "order": _order}
+
+
+class DataFactory:
+    """Пулы сгенерированных данных по типу, пополняемые пачками по pool_size"""
+
+    def __init__(
+        self, seed: int = DEFAULT_SEED, pool_size: int = DEFAULT_POOL_SIZE, cache_dir: Path | str | None = None
+    ):
+        self._lock = threading.Lock()
+        self._fake: "Faker | None" = None
+        self._counter = itertools.count()
+        self._run = _base36(time.time_ns() // 1_000_000)
+        self.configure(seed=seed, pool_size=pool_size, cache_dir=cache_dir)
+
+    def configure(
+        self, seed: int | None = None, pool_size: int | None = None, cache_dir: Path | str | None = None
+    ) -> None:
+        """Изменить настройки, пулы начинаются заново"""
+        self.seed = DEFAULT_SEED if seed is None else seed
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.worker = worker_index()
+        self._pools: dict[str, deque[dict[str, Any]]] = {kind: deque() for kind in GENERATORS}
+        self._batches: dict[str, int] = dict.fromkeys(GENERATORS, 0)
+
+    def unique(self) -> str:
+        """Уникальный для запуска и воркера суффикс из букв и цифр"""
+        return f"{self._run}w{self.worker}n{_base36(next(self._counter))}"
+
+    def user(self) -> dict[str, Any]:
+        """Данные пользователя с уникальными username и email"""
+        data = self._take("user")
+        suffix = self.unique()
+        local, domain = data["email"].split("@", 1)
+        return data | {"username": f"{data['username']}{suffix}", "email": f"{local}.{suffix}@{domain}"}
+
+    def order(self, user_id: int) -> dict[str, Any]:
+        """Данные заказа пользователя"""
+        return {"user_id": user_id} | self._take("order")
+
+    def warm(self, *kinds: str) -> None:
+        """Заранее заполнить пулы, по умолчанию все"""
+        with self._lock:
+            for kind in kinds or GENERATORS:
+                if not self._pools[kind]:
+                    self._refill(kind)
+
+    def _take(self, kind: str) -> dict[str, Any]:
+        with self._lock:
+            pool = self._pools[kind]
+            if not pool:
+                self._refill(kind)
+            return pool.popleft()
+
+    def _refill(self, kind: str) -> None:
+        number = self._batches[kind]
+        self._batches[kind] += 1
+        self._pools[kind].extend(self._batch(kind, number))
+
+    def _path(self, kind: str, number: int) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{kind}-s{self.seed}-w{self.worker}-n{self.pool_size}-b{number}.json"
+
+    def _batch(self, kind: str, number: int) -> list[dict[str, Any]]:
+        """Пачка данных: с диска, если сохранена, иначе генерация с сидом пачки"""
+        path = self._path(kind, number)
+        if path is not None and path.exists():
+            try:
+                return json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as err:
+                logger.warning(f"Data pool {path} is broken, regenerate: {err}")
+        if self._fake is None:
+            # Faker загружается при первой генерации, а не при импорте
+            from faker import Faker  # pylint: disable=import-outside-toplevel
+
+            self._fake = Faker()
+        self._fake.seed_instance(f"{self.seed}:{kind}:{self.worker}:{number}")
+        generate = GENERATORS[kind]
+        batch = [generate(self._fake) for _ in range(self.pool_size)]
+        logger.debug(f"Generate data pool {kind} #{number}: {len(batch)} items")
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(batch), encoding="utf-8")
+            temp.replace(path)
+        return batch
+
+
+factory = DataFactory()
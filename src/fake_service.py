@@ -0,0 +1,163 @@
+"""
+Заглушка Users сервиса: /users и /orders на StubServer в текущем процессе
+Данные пишутся в БД через SQLAlchemy, по умолчанию в sqlite в памяти. С движком из src.db_client.engines
+на файле sqlite (DATABASE_CLIENT=sqlite) DataBaseClient видит данные, созданные через API заглушки
+"""
+
+import threading
+from http import HTTPStatus
+from typing import Any, Final, Self
+
+from pydantic import ValidationError
+from sqlalchemy import Connection, Engine, StaticPool, create_engine, text
+
+from src.factory import factory
+from src.models import OrderCreate, UserCreate
+from src.stub import StubRequest, StubResponse, StubServer
+
+SCHEMA: Final[tuple[str, ...]] = (
+    "CREATE TABLE IF NOT EXISTS users ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL UNIQUE, email TEXT NOT NULL, age INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS orders ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL REFERENCES users (id), "
+    "product_name TEXT NOT NULL, quantity INTEGER NOT NULL)",
+)
+USER_BY_ID: Final[str] = "SELECT id, username, email, age FROM users WHERE id = :id"
+USERS_PAGE: Final[str] = "SELECT id, username, email, age FROM users ORDER BY id LIMIT :limit OFFSET :offset"
+# Размер страницы списка без ?limit
+DEFAULT_PAGE_LIMIT: Final[int] = 1000
+ORDER_BY_ID: Final[str] = "SELECT id, user_id, product_name, quantity FROM orders WHERE id = :id"
+
+
+def _error(status: int, message: str) -> StubResponse:
+    return StubResponse(status=status, body={"error": message})
+
+
+def _id(value: str) -> int:
+    return int(value) if value.isdigit() else 0
+
+
+def _positive(query: dict[str, list[str]], name: str, default: int) -> int:
+    """Положительное целое из query, иначе default"""
+    value = query.get(name, [""])[0]
+    return int(value) if value.isdigit() and int(value) > 0 else default
+
+
+class FakeUsersService:
+    """
+    Users сервис: создание и получение пользователей и заказов.
+    Повторный username - 400 "Username already exists", как в настоящем сервисе
+    """
+
+    def __init__(self, engine: Engine | None = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param engine: Движок БД с пулом соединений, по умолчанию своя sqlite в памяти.
+            Движок со StaticPool нельзя делить с другими клиентами: соединение у них было бы одно на всех
+        """
+        assert engine is None or not isinstance(engine.pool, StaticPool), "Shared StaticPool engine is not supported"
+        self.engine = engine or create_engine(
+            "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+        )
+        self.server = StubServer(host, port)
+        # Запросы заглушки выполняются по одному: у sqlite в памяти одно соединение, у файла - одна запись за раз
+        self._lock = threading.Lock()
+        with self.engine.begin() as connection:
+            for statement in SCHEMA:
+                connection.execute(text(statement))
+        self.server.route("POST", "/users")(self._create_user)
+        self.server.route("GET", "/users")(self._list_users)
+        self.server.route("GET", "/users/{user_id}")(self._get_user)
+        self.server.route("POST", "/orders")(self._create_order)
+        self.server.route("GET", "/orders/{order_id}")(self._get_order)
+
+    @property
+    def url(self) -> str:
+        """Адрес сервиса"""
+        return self.server.url
+
+    def seed(self, users: int = 0, orders: int = 0) -> Self:
+        """Добавить пользователей и заказы из фабрики данных, заказы распределяются по новым пользователям"""
+        assert users or not orders, "Orders require users"
+        with self._lock, self.engine.begin() as connection:
+            user_ids = [self._insert_user(connection, factory.user())["id"] for _ in range(users)]
+            for index in range(orders):
+                self._insert_order(connection, factory.order(user_ids[index % len(user_ids)]))
+        return self
+
+    @staticmethod
+    def _insert_user(connection: Connection, user: dict[str, Any]) -> dict[str, Any]:
+        result = connection.execute(
+            text("INSERT INTO users (username, email, age) VALUES (:username, :email, :age)"),
+            user,
+        )
+        return {"id": result.lastrowid} | user
+
+    @staticmethod
+    def _insert_order(connection: Connection, order: dict[str, Any]) -> dict[str, Any]:
+        result = connection.execute(
+            text("INSERT INTO orders (user_id, product_name, quantity) VALUES (:user_id, :product_name, :quantity)"),
+            order,
+        )
+        return {"id": result.lastrowid} | order
+
+    def _fetch(self, statement: str, item_id: int) -> dict[str, Any] | None:
+        with self._lock, self.engine.connect() as connection:
+            row = connection.execute(text(statement), {"id": item_id}).one_or_none()
+        return None if row is None else dict(row._mapping)  # pylint: disable=protected-access
+
+    def _create_user(self, request: StubRequest) -> StubResponse:
+        try:
+            user = UserCreate.model_validate(request.json() or {}).model_dump()
+        except ValidationError as err:
+            return _error(HTTPStatus.BAD_REQUEST, str(err))
+        with self._lock, self.engine.begin() as connection:
+            exists = connection.execute(text("SELECT 1 FROM users WHERE username = :username"), user).first()
+            if exists is not None:
+                return _error(HTTPStatus.BAD_REQUEST, "Username already exists")
+            user = self._insert_user(connection, user)
+        return StubResponse(status=HTTPStatus.CREATED, body=user)
+
+    def _list_users(self, request: StubRequest) -> StubResponse:
+        limit = _positive(request.query, "limit", DEFAULT_PAGE_LIMIT)
+        offset = (_positive(request.query, "page", 1) - 1) * limit
+        with self._lock, self.engine.connect() as connection:
+            rows = connection.execute(text(USERS_PAGE), {"limit": limit, "offset": offset}).mappings().all()
+        return StubResponse(body=[dict(row) for row in rows])
+
+    def _get_user(self, request: StubRequest) -> StubResponse:
+        user = self._fetch(USER_BY_ID, _id(request.params["user_id"]))
+        if user is None:
+            return _error(HTTPStatus.NOT_FOUND, "User not found")
+        return StubResponse(body=user)
+
+    def _create_order(self, request: StubRequest) -> StubResponse:
+        try:
+            order = OrderCreate.model_validate(request.json() or {}).model_dump()
+        except ValidationError as err:
+            return _error(HTTPStatus.BAD_REQUEST, str(err))
+        with self._lock, self.engine.begin() as connection:
+            if connection.execute(text("SELECT 1 FROM users WHERE id = :user_id"), order).first() is None:
+                return _error(HTTPStatus.NOT_FOUND, "User not found")
+            order = self._insert_order(connection, order)
+        return StubResponse(status=HTTPStatus.CREATED, body=order)
+
+    def _get_order(self, request: StubRequest) -> StubResponse:
+        order = self._fetch(ORDER_BY_ID, _id(request.params["order_id"]))
+        if order is None:
+            return _error(HTTPStatus.NOT_FOUND, "Order not found")
+        return StubResponse(body=order)
+
+    def start(self) -> Self:
+        """Запустить сервис в фоновом потоке"""
+        self.server.start()
+        return self
+
+    def stop(self) -> None:
+        """Остановить сервис"""
+        self.server.stop()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
+        self.stop()
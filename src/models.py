@@ -1,21 +1,62 @@
-from typing import Tuple, Type, TypeVar
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Sequence, Tuple, Type, TypeVar
 
-from faker import Faker
 from pydantic import BaseModel, EmailStr, Field
 
-fake = Faker()
-
+from src.factory import factory
 
 T = TypeVar("T", bound="BaseModelWithDB")
 
 
+@lru_cache(maxsize=256)
+def _row_mapper(model: Type["BaseModelWithDB"], columns: Tuple[str, ...]) -> Callable[[Sequence[Any]], dict[str, Any]]:
+    """
+    Закешированное по (модель, набор колонок) преобразование строки в словарь полей модели.
+    Колонки сопоставляются с полями по имени или алиасу, лишние колонки пропускаются
+    """
+    known = set(model.model_fields) | {info.alias for info in model.model_fields.values() if info.alias}
+    pairs = [(index, column) for index, column in enumerate(columns) if column in known]
+    keys = tuple(column for _, column in pairs)
+    if not pairs:
+        return lambda row: {}
+    if len(pairs) == 1:
+        index, key = pairs[0]
+        return lambda row: {key: row[index]}
+    getter = itemgetter(*(index for index, _ in pairs))
+    return lambda row: dict(zip(keys, getter(row)))
+
+
 class BaseModelWithDB(BaseModel):
     @classmethod
-    def from_db_tuple(cls: Type[T], db_tuple: Tuple) -> T:
-        """Создать объект модели из кортежа, полученного из БД"""
-        keys = cls.__fields__.keys()  # Получаем имена полей модели
-        data = dict(zip(keys, db_tuple))  # Преобразуем кортеж в словарь
-        return cls(**data)  # Валидируем данные через Pydantic
+    def _columns(cls, row: Sequence[Any]) -> Tuple[str, ...]:
+        """Имена колонок строки SQLAlchemy, для простого кортежа - поля модели по порядку"""
+        return tuple(getattr(row, "_fields", None) or cls.model_fields)
+
+    @classmethod
+    def from_db_tuple(cls: Type[T], db_tuple: Sequence[Any], trusted: bool = False) -> T:
+        """
+        Создать объект модели из строки, полученной из БД
+        :param db_tuple: Строка SQLAlchemy (колонки по именам) или кортеж в порядке полей модели
+        :param trusted: Без валидации pydantic, для данных из своей БД
+        """
+        data = _row_mapper(cls, cls._columns(db_tuple))(db_tuple)
+        return cls.model_construct(**data) if trusted else cls(**data)
+
+    @classmethod
+    def from_db_rows(cls: Type[T], rows: Iterable[Sequence[Any]], trusted: bool = False) -> list[T]:
+        """
+        Создать объекты модели из всего результата запроса за один проход
+        :param rows: Результат session.execute(...) или последовательность строк
+        :param trusted: Без валидации pydantic, для данных из своей БД
+        """
+        columns = tuple(rows.keys()) if hasattr(rows, "keys") else None
+        rows = list(rows)
+        if not rows:
+            return []
+        to_dict = _row_mapper(cls, columns or cls._columns(rows[0]))
+        construct = cls.model_construct if trusted else cls
+        return [construct(**to_dict(row)) for row in rows]
 
 
 # Модель для создания пользователя
@@ -26,12 +67,8 @@ class UserCreate(BaseModel):
 
     @classmethod
     def generate(cls) -> "UserCreate":
-        """Генерация данных для создания пользователя"""
-        return cls(
-            username=fake.user_name(),
-            email=fake.email(),
-            age=fake.random_int(min=1, max=99),
-        )
+        """Генерация данных для создания пользователя из пула фабрики, username и email уникальны"""
+        return cls(**factory.user())
 
 
 # Модель для ответа о пользователе
@@ -50,12 +87,8 @@ class OrderCreate(BaseModel):
 
     @classmethod
     def generate(cls, user_id: int) -> "OrderCreate":
-        """Генерация данных для создания заказа"""
-        return cls(
-            user_id=user_id,
-            product_name=fake.word(),
-            quantity=fake.random_int(min=1, max=10),
-        )
+        """Генерация данных для создания заказа из пула фабрики"""
+        return cls(**factory.order(user_id))
 
 
 # Модель для ответа о заказе
@@ -0,0 +1,173 @@
+"""In-process HTTP заглушка для проверки клиентов без внешних сервисов"""
+
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Final, Self
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"{(\w+)}")
+# Период проверки флага остановки serve_forever, по умолчанию 0.5 с на каждую остановку
+POLL_INTERVAL: Final[float] = 0.01
+
+
+@dataclass(slots=True, kw_only=True)
+class StubRequest:
+    """Запрос пришедший в заглушку"""
+
+    method: str
+    path: str
+    params: dict[str, str] = field(default_factory=dict)
+    query: dict[str, list[str]] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self) -> Any:
+        """Тело запроса как json"""
+        return json.loads(self.body) if self.body else None
+
+
+@dataclass(slots=True, kw_only=True)
+class StubResponse:
+    """Ответ заглушки"""
+
+    status: int = 200
+    body: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def encode(self) -> bytes:
+        """Сериализация тела ответа"""
+        if self.body is None:
+            return b""
+        if isinstance(self.body, bytes):
+            return self.body
+        return json.dumps(self.body).encode("utf-8")
+
+
+StubHandler = Callable[[StubRequest], StubResponse]
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Обработчик соединения заглушки, подкласс с сервером создается в StubServer"""
+
+    stub: "StubServer"
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело пишутся отдельно: без TCP_NODELAY ответ ждет delayed ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        with self.stub._lock:  # pylint: disable=protected-access
+            self.stub.connections += 1
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # Клиент закрыл соединение, не дочитав потоковый ответ
+            logger.debug(f"Connection closed by client: {self.client_address}")
+
+    def _handle(self) -> None:
+        self._write(self.stub.dispatch(self._read()))
+
+    def _read(self) -> StubRequest:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        return StubRequest(
+            method=self.command,
+            path=url.path,
+            query=parse_qs(url.query),
+            headers=dict(self.headers.items()),
+            body=self.rfile.read(length) if length else b"",
+        )
+
+    def _write(self, response: StubResponse) -> None:
+        body = response.encode()
+        self.send_response(response.status)
+        headers = {"Content-Type": "application/json", **response.headers, "Content-Length": str(len(body))}
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle  # noqa: N815
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        logger.debug(format, *args)
+
+
+class StubServer:
+    """
+    HTTP сервер в отдельном потоке текущего процесса
+    Обработчики регистрируются декоратором route, путь задается шаблоном как в клиентах: /users/{user_id}
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._routes: list[tuple[str, re.Pattern, StubHandler]] = []
+        self._lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Адрес заглушки"""
+        host, port = self._server.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method: str, path: str) -> Callable[[StubHandler], StubHandler]:
+        """Декоратор регистрации обработчика"""
+        pattern = re.compile("^" + _PLACEHOLDER.sub(r"(?P<\1>[^/]+)", path) + "$")
+
+        def wrapper(func: StubHandler) -> StubHandler:
+            self._routes.append((method.upper(), pattern, func))
+            return func
+
+        return wrapper
+
+    def dispatch(self, request: StubRequest) -> StubResponse:
+        """Найти обработчик и выполнить его"""
+        with self._lock:
+            self.requests += 1
+        for method, pattern, func in self._routes:
+            if method == request.method and (match := pattern.match(request.path)):
+                request.params = match.groupdict()
+                return func(request)
+        return StubResponse(status=404, body={"error": "Not found"})
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        return type("_Handler", (_RequestHandler,), {"stub": self})
+
+    def start(self) -> Self:
+        """Запустить сервер в фоновом потоке"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            args=(POLL_INTERVAL,),
+            name="stub-server",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.debug(f"Stub server started: {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Остановить сервер"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        logger.debug("Stub server stopped")
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: ANN001
+        self.stop()
@@ -20,8 +20,16 @@ class DBSettings:
     name: str
     user: str
     password: str = field(repr=False)
-
-    def get(self) -> dict[str, str | int]:
+    # mysql или sqlite, для sqlite name - файл базы, пустое имя - база в памяти
+    client: str = "mysql"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_pre_ping: bool = True
+    pool_recycle: int = 3600
+    # Строки из своей БД создаются без валидации pydantic, на ключ движка не влияет
+    trusted_rows: bool = field(default=False, compare=False)
+
+    def get(self) -> dict[str, str | int | bool]:
         """Получить словарь"""
         return {
             "host": self.host,
@@ -29,4 +37,21 @@ class DBSettings:
             "database": self.name,
             "user": self.user,
             "password": self.password,
+            "client": self.client,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_recycle": self.pool_recycle,
+            "trusted_rows": self.trusted_rows,
         }
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PoolSettings:
+    """HTTP connection pool settings"""
+
+    connections: int = 10
+    maxsize: int = 10
+    block: bool = False
+    keep_alive: bool = True
+    retries: int = 0
@@ -0,0 +1,90 @@
+"""
+Воркеры pytest-xdist: номер воркера, разделение данных между воркерами и однократная настройка
+через файловую блокировку в общей для воркеров временной папке
+"""
+
+import json
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Значение worker_id без xdist, как у фикстуры worker_id из pytest-xdist
+MASTER = "master"
+
+
+def worker_id() -> str:
+    """Имя воркера pytest-xdist: gw0, gw1... Без xdist - master"""
+    return os.environ.get("PYTEST_XDIST_WORKER", MASTER)
+
+
+def worker_index() -> int:
+    """Номер воркера pytest-xdist (gw3 -> 3), без xdist - 0"""
+    digits = worker_id().lstrip("gw")
+    return int(digits) if digits.isdigit() else 0
+
+
+def worker_count() -> int:
+    """Число воркеров pytest-xdist, без xdist - 1"""
+    return int(os.environ.get("PYTEST_XDIST_WORKER_COUNT") or 1)
+
+
+def partition(items: Sequence[T]) -> Sequence[T]:
+    """Доля элементов текущего воркера: каждый worker_count-й, начиная с номера воркера"""
+    index, step = worker_index(), worker_count()
+    return items[index::step]
+
+
+def id_range(size: int, start: int = 1) -> range:
+    """Непересекающийся между воркерами диапазон id длиной size"""
+    first = start + worker_index() * size
+    return range(first, first + size)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Эксклюзивная блокировка файла между процессами. Без fcntl блокировка не выполняется"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class Rendezvous:
+    """Однократное выполнение настройки на все воркеры: первый выполняет, остальные читают результат"""
+
+    def __init__(self, root: Path):
+        """
+        :param root: Общая для воркеров папка, для xdist - родитель basetemp воркера
+        """
+        self.root = root
+
+    def run_once(self, name: str, func: Callable[[], Any]) -> Any:
+        """
+        Выполнить func один раз на запуск
+        :param func: Настройка, результат должен сериализоваться в json
+        :return: Результат настройки, одинаковый для всех воркеров
+        """
+        result = self.root / f"{name}.json"
+        with file_lock(self.root / f"{name}.lock"):
+            if result.is_file():
+                return json.loads(result.read_text(encoding="utf-8"))
+            logger.info(f"Worker {worker_id()} runs setup {name}")
+            data = func()
+            result.write_text(json.dumps(data), encoding="utf-8")
+            return data
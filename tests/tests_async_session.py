@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+
+from clients import AsyncRequest, AsyncUsersClient, WaitRequestError
+from src.models import UserCreate, UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Заглушка users сервиса с задержкой ответа"""
+    server = StubServer()
+    ids = iter(range(1, 10_000))
+    lock = threading.Lock()
+
+    @server.route("POST", "/users")
+    def _create_user(request: StubRequest) -> StubResponse:
+        time.sleep(0.05)
+        with lock:
+            user_id = next(ids)
+        return StubResponse(status=HTTPStatus.CREATED, body={"id": user_id, **request.json()})
+
+    with server:
+        yield server
+
+
+def test_async_requests_run_concurrently(stub_server: StubServer):
+    """Запросы через asyncio.gather выполняются конкурентно поверх общего пула соединений"""
+
+    async def _main() -> list:
+        async with AsyncUsersClient(host=stub_server.url, concurrency=10) as client:
+            request = client.post.create_user
+            assert isinstance(request, AsyncRequest)
+            return await asyncio.gather(
+                *(
+                    client.post.create_user.body(_data=UserCreate.generate())(
+                        status=HTTPStatus.CREATED,
+                        schema=UserResponse,
+                    )
+                    for _ in range(30)
+                ),
+            )
+
+    start = time.monotonic()
+    results = asyncio.run(_main())
+    elapsed = time.monotonic() - start
+
+    assert len({user.id for user in results}) == 30
+    assert elapsed < 30 * 0.05 / 2
+    assert stub_server.connections <= 10
+
+
+def test_async_request_status_check(stub_server: StubServer):
+    """Проверка кода ответа работает и для асинхронного запроса"""
+
+    async def _main() -> None:
+        async with AsyncUsersClient(host=stub_server.url) as client:
+            await client.get.get_user.path(user_id=1)(status=HTTPStatus.OK)
+
+    with pytest.raises(AssertionError, match="Status code error"):
+        asyncio.run(_main())
+
+
+def test_async_wait_polls_without_blocking_loop():
+    """Асинхронные ожидания идут конкурентно: общее время - самое долгое ожидание, а не сумма"""
+    server = StubServer()
+    attempts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        user_id = request.params["user_id"]
+        with lock:
+            attempts[user_id] = attempts.get(user_id, 0) + 1
+            ready = attempts[user_id] > 3
+        body = {"id": int(user_id), "username": "user", "email": "u@example.com", "age": 30 if ready else 0}
+        return StubResponse(body=body)
+
+    async def _main() -> list:
+        async with AsyncUsersClient(host=server.url) as client:
+            waits = [
+                client.get.get_user.path(user_id=user_id).wait(lambda user: user.age > 0, timeout=5, interval=0.1)
+                for user_id in range(1, 6)
+            ]
+            results = await asyncio.gather(*(wait(status=HTTPStatus.OK) for wait in waits))
+            assert all(wait.stats.attempts == 4 and wait.stats.success for wait in waits)
+            return results
+
+    with server:
+        start = time.monotonic()
+        results = asyncio.run(_main())
+        elapsed = time.monotonic() - start
+
+    assert [user.id for user in results] == [1, 2, 3, 4, 5]
+    assert elapsed < 5 * 3 * 0.1 / 2
+
+
+def test_async_wait_timeout():
+    """По истечении времени поднимается последняя ошибка попытки"""
+    server = StubServer()
+
+    async def _main() -> None:
+        async with AsyncUsersClient(host=server.url) as client:
+            wait = client.get.get_user.path(user_id=1).wait(lambda response: False, timeout=0.3, interval=0.05)
+            await wait(status=HTTPStatus.NOT_FOUND)
+
+    with server, pytest.raises(WaitRequestError, match="result=False"):
+        asyncio.run(_main())
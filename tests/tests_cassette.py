@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from clients import Cassette, CassetteMiss, CassetteMode, UsersClient
+from src.models import UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+
+
+def _stub() -> StubServer:
+    """Заглушка: счетчик версий пользователя и эхо создания"""
+    server = StubServer()
+    versions: dict[str, int] = {}
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        user_id = request.params["user_id"]
+        versions[user_id] = versions.get(user_id, 0) + 1
+        body = {"id": int(user_id), "username": "alice", "email": "alice@example.com", "age": versions[user_id]}
+        return StubResponse(body=body)
+
+    @server.route("POST", "/users")
+    def _create_user(request: StubRequest) -> StubResponse:
+        return StubResponse(status=HTTPStatus.CREATED, body=request.json() | {"id": 1})
+
+    return server
+
+
+def test_record_then_replay_offline(tmp_path: Path):
+    """Записанные обмены воспроизводятся без сети, повторы одного запроса - по порядку записи"""
+    path = tmp_path / "cassette.jsonl"
+    with _stub() as server:
+        host = server.url
+        recorder = Cassette(path, mode=CassetteMode.RECORD)
+        with UsersClient(host=host, cassette=recorder) as client:
+            for _ in range(2):
+                client.get.get_user.path(user_id=1).query(fields="all")(status=HTTPStatus.OK)
+            client.post.create_user.body(username="bob")(status=HTTPStatus.CREATED)
+        recorder.close()
+
+    player = Cassette(path, mode=CassetteMode.REPLAY)
+    with UsersClient(host=host, cassette=player) as client:
+        request = client.get.get_user.path(user_id=1).query(fields="all")
+        ages = [request(status=HTTPStatus.OK, schema=UserResponse, return_model=True).age for _ in range(3)]
+        created = client.post.create_user.body(username="bob")(status=HTTPStatus.CREATED)
+        with pytest.raises(CassetteMiss, match="POST"):
+            client.post.create_user.body(username="eve")(status=HTTPStatus.CREATED)
+    player.close()
+
+    assert (recorder.recorded, player.played, len(player)) == (3, 4, 0)
+    assert ages == [1, 2, 2]
+    assert created.id == 1
+
+
+def test_template_rule_and_concurrent_append(tmp_path: Path):
+    """Правило template сопоставляет запросы по шаблону пути, параллельная запись не рвет строки"""
+    path = tmp_path / "cassette.jsonl"
+    with _stub() as server:
+        recorder = Cassette(path, mode=CassetteMode.RECORD, match=("method", "template"))
+        with UsersClient(host=server.url, cassette=recorder) as client, ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda index: client.get.get_user.path(user_id=index)(status=HTTPStatus.OK), range(50)))
+        recorder.close()
+
+    lines = path.read_bytes().splitlines()
+    assert len(lines) == 50 and all(line.startswith(b'{"key": "') and line.endswith(b"}") for line in lines)
+    player = Cassette(path, mode="replay", match=("method", "template"))
+    with UsersClient(host="http://offline", cassette=player) as client:
+        assert client.get.get_user.path(user_id=999)(status=HTTPStatus.OK).username == "alice"
+    player.close()
+
+
+def test_auto_replays_recorded_exchange(tmp_path: Path):
+    """В режиме auto повтор записанного запроса воспроизводится, без сети и новой записи"""
+    path = tmp_path / "cassette.jsonl"
+    with _stub() as server:
+        cassette = Cassette(path, mode=CassetteMode.AUTO)
+        with UsersClient(host=server.url, cassette=cassette) as client:
+            request = client.get.get_user.path(user_id=1)
+            ages = [request(status=HTTPStatus.OK, schema=UserResponse, return_model=True).age for _ in range(3)]
+        cassette.close()
+
+    assert ages == [1, 1, 1]
+    assert (cassette.recorded, cassette.played) == (1, 2)
+    assert len(path.read_bytes().splitlines()) == 1
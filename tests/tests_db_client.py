@@ -0,0 +1,102 @@
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from clients import FastThenSlow, WaitRequestError
+from src.db_client import DataBaseClient
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    """Файловая sqlite база, доступная из нескольких соединений"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_client(engine: Engine) -> Iterator[DataBaseClient]:
+    """Клиент БД поверх sqlite с таблицами users и orders"""
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, age INTEGER)"))
+        connection.execute(
+            text("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER, product_name TEXT, quantity INTEGER)")
+        )
+        connection.execute(
+            text("INSERT INTO users VALUES (:id, :username, :email, :age)"),
+            [
+                {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "age": 20 + i % 50}
+                for i in range(1, 1201)
+            ],
+        )
+    client = DataBaseClient(host="sqlite", port=0, database="", user="", password="")
+    client.engine = engine
+    client.session = sessionmaker(bind=engine)()
+    yield client
+    client.session.close()
+
+
+def test_get_users_by_ids_chunks_and_reports_missing(db_client: DataBaseClient):
+    """Пакетный поиск разбивает id на чанки, дубликаты схлопываются, ненайденные id возвращаются отдельно"""
+    ids = [*range(1, 1101), 5, 7, 5000, 6000]
+    result = db_client.get_users_by_ids(ids, chunk_size=250)
+
+    assert len(result) == 1100
+    assert result[7].username == "user7"
+    assert result.missing == {5000, 6000}
+    with pytest.raises(AssertionError, match=r"\[5000, 6000\]"):
+        result.assert_complete()
+
+
+def test_iter_users_by_ids_is_lazy(db_client: DataBaseClient):
+    """Потоковое чтение отдает модели по мере чтения курсора"""
+    users = db_client.iter_users_by_ids(range(1, 1201), chunk_size=100)
+
+    assert next(users).id == 1
+    assert sum(1 for _ in users) == 1199
+    assert not db_client.get_orders_by_ids([1, 2]).found
+
+
+def test_wait_for_rows_polls_only_pending_ids(db_client: DataBaseClient, engine: Engine):
+    """Ожидание возвращает модели, как только появились все строки и выполнено условие"""
+
+    def _insert_orders() -> None:
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO orders VALUES (1, 1, 'book', 1), (2, 1, 'pen', 0)"))
+        time.sleep(0.1)
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO orders VALUES (3, 2, 'cup', 2)"))
+            connection.execute(text("UPDATE orders SET quantity = 5 WHERE id = 2"))
+
+    writer = threading.Timer(0.05, _insert_orders)
+    writer.start()
+    start = time.monotonic()
+    orders = db_client.wait_for_orders(
+        [3, 2, 1], predicate=lambda order: order.quantity > 0, strategy=FastThenSlow(fast=0.02, fast_attempts=50)
+    )
+    writer.join()
+
+    assert [order.id for order in orders] == [3, 2, 1]
+    assert orders[1].quantity == 5
+    assert time.monotonic() - start < 1
+
+
+def test_wait_for_rows_reports_missing_ids(db_client: DataBaseClient):
+    """Несошедшиеся id перечисляются в ошибке"""
+    with pytest.raises(WaitRequestError, match=r"1/2: \[9999\]"):
+        db_client.wait_for_users([1, 9999], timeout=0.2, strategy=FastThenSlow(fast=0.05))
+
+
+def test_wait_for_rows_keeps_pending_writes(db_client: DataBaseClient, engine: Engine):
+    """Ожидание не коммитит незавершенную транзакцию теста"""
+    db_client.execute("INSERT INTO orders VALUES (10, 1, 'draft', 1)")
+    assert db_client.wait_for_users([1, 2], strategy=FastThenSlow(fast=0.02))[0].id == 1
+
+    db_client.session.rollback()
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM orders")).scalar() == 0
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from src.durations import DEFAULT_DURATION, DurationStore, longest_first, lpt
+
+
+def test_store_smooths_and_merges(tmp_path: Path):
+    """Замеры сглаживаются с прошлыми, замеры разных процессов сливаются"""
+    path = tmp_path / "durations.json"
+    first = DurationStore(path, smoothing=0.5)
+    assert first.estimate("tests/tests_a.py::test_a") == DEFAULT_DURATION
+    first.record("tests/tests_a.py::test_a", 4.0)
+    first.save()
+    second, other = DurationStore(path, smoothing=0.5), DurationStore(path, smoothing=0.5)
+    second.record("tests/tests_a.py::test_a", 2.0)
+    other.record("tests/tests_b.py::test_b", 1.0)
+    second.save()
+    other.save()
+
+    store = DurationStore(path)
+    assert store.known == {"tests/tests_a.py::test_a": 3.0, "tests/tests_b.py::test_b": 1.0}
+    assert store.estimate("tests/tests_c.py::test_c") == 2.0
+    nodeids = ["tests/tests_a.py::test_a", "tests/tests_c.py::test_c[1]", "tests/tests_c.py::test_d"]
+    assert store.module_costs(nodeids) == {"tests/tests_a.py": 3.0, "tests/tests_c.py": 4.0}
+
+
+def test_broken_store_is_ignored(tmp_path: Path):
+    """Испорченный файл не ломает запуск"""
+    path = tmp_path / "durations.json"
+    path.write_text("[1, 2", encoding="utf-8")
+    assert not DurationStore(path).known
+
+
+def test_lpt_balances_workers():
+    """Долгие модули первыми и на наименее загруженный воркер"""
+    costs = {"a": 1.0, "b": 7.0, "c": 4.0, "d": 3.0, "e": 2.0, "f": 1.0}
+    assert longest_first(costs) == ["b", "c", "d", "e", "a", "f"]
+    groups = lpt(costs, workers=2)
+    loads = [sum(cost for name, cost in costs.items() if groups[name] == worker) for worker in (0, 1)]
+    assert sorted(loads) == [9.0, 9.0]
+    assert set(lpt(costs, workers=1).values()) == {0}
@@ -0,0 +1,26 @@
+import json
+from http import HTTPStatus
+from pathlib import Path
+
+from clients import EndpointTimings, UsersClient
+from src.fake_service import FakeUsersService
+from src.models import UserCreate
+
+
+def test_timings_by_endpoint_template(tmp_path: Path):
+    """Время запросов копится по шаблону эндпоинта, а не по итоговому урлу"""
+    endpoint_timings = EndpointTimings()
+    with FakeUsersService() as service, UsersClient(host=service.url, endpoint_timings=endpoint_timings) as client:
+        user = client.post.create_user.body(_data=UserCreate.generate().model_dump())(status=HTTPStatus.CREATED)
+        for user_id in (user.id, user.id, 404):
+            client.get.get_user.path(user_id=user_id)(status=HTTPStatus.OK if user_id != 404 else HTTPStatus.NOT_FOUND)
+
+    assert list(endpoint_timings) == ["POST /users", "GET /users/{user_id}"]
+    timing = endpoint_timings["GET /users/{user_id}"]
+    assert timing.wall.count == timing.ttfb.count == 3
+    assert 0 < timing.ttfb.max <= timing.wall.max
+
+    path = tmp_path / "timings.json"
+    endpoint_timings.dump(path)
+    summary = json.loads(path.read_text(encoding="utf-8"))
+    assert set(summary["GET /users/{user_id}"]["wall_ms"]) == {"count", "min", "mean", "p50", "p95", "p99", "max"}
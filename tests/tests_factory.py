@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pytest
+
+from src.factory import DataFactory
+from src.models import OrderCreate, UserCreate
+from src.workers import worker_index
+
+
+def test_pools_are_deterministic_per_worker(monkeypatch: pytest.MonkeyPatch):
+    """Данные зависят только от сида и воркера, уникальные поля не совпадают между воркерами"""
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    first, second = DataFactory(seed=7, pool_size=10), DataFactory(seed=7, pool_size=10)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+    other = DataFactory(seed=7, pool_size=10)
+
+    assert worker_index() == 2
+    users = [[factory.user() for _ in range(25)] for factory in (first, second, other)]
+    assert [user["age"] for user in users[0]] == [user["age"] for user in users[1]]
+    assert [user["age"] for user in users[0]] != [user["age"] for user in users[2]]
+    usernames = [user["username"] for worker in (users[0], users[2]) for user in worker]
+    assert len(set(usernames)) == len(usernames)
+
+
+def test_pool_is_persisted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Сохраненные пачки читаются с диска вместо генерации"""
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    factory = DataFactory(seed=1, pool_size=5, cache_dir=tmp_path)
+    generated = [factory.order(user_id=1) for _ in range(6)]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["order-s1-w0-n5-b0.json", "order-s1-w0-n5-b1.json"]
+
+    restored = DataFactory(seed=1, pool_size=5, cache_dir=tmp_path)
+    monkeypatch.setattr(restored, "_fake", "must not be used")
+    assert [restored.order(user_id=1) for _ in range(6)] == generated
+
+
+def test_models_are_generated_from_factory():
+    """Модели создаются из пула и проходят валидацию"""
+    users = [UserCreate.generate() for _ in range(50)]
+
+    assert len({user.username for user in users}) == 50
+    assert OrderCreate.generate(user_id=3).user_id == 3
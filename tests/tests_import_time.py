@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from dev_scripts.import_time import by_package, parse
+
+ROOT = Path(__file__).parent.parent
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     box.box
+import time:        50 |        150 |   box
+import time:      2000 |       2150 | clients
+import time:       300 |        300 | src.cases
+"""
+
+
+def test_parse_importtime():
+    """Строки importtime разбираются в модули с глубиной вложенности"""
+    times = parse(OUTPUT)
+    assert [(item.name, item.depth) for item in times] == [("box.box", 2), ("box", 1), ("clients", 0), ("src.cases", 0)]
+    assert by_package(times) == {"clients": 2000, "src": 300, "box": 150}
+
+
+def test_heavy_dependencies_are_lazy():
+    """Импорт conftest и моделей не загружает SQLAlchemy, Faker и Box"""
+    code = "import sys, conftest, src.models; print(sorted({'sqlalchemy', 'faker', 'box'} & set(sys.modules)))"
+    process = subprocess.run((sys.executable, "-c", code), cwd=ROOT, capture_output=True, text=True, check=True)
+    assert process.stdout.strip() == "[]"
+
+
+def test_http_only_run_skips_database(tmp_path: Path):
+    """С настоящим HOST клиент Users сервиса создается без настроек БД и импорта SQLAlchemy"""
+    test = tmp_path / "test_http_only.py"
+    test.write_text(
+        "import sys\n\n\n"
+        "def test_client(not_authorize_users_client):\n"
+        "    assert 'sqlalchemy' not in sys.modules\n",
+        encoding="utf-8",
+    )
+    env = os.environ | {"HOST": "http://127.0.0.1:9"}
+    process = subprocess.run(
+        (sys.executable, "-m", "pytest", str(test), "-p", "conftest", "-p", "no:cacheprovider", "--durations-store="),
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert process.returncode == 0, process.stdout[-2000:]
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+
+from clients import LatencyHistogram, LoadContext, LoadRunner, Operation, Request, UsersClient
+from src.fake_service import FakeUsersService
+from src.models import UserCreate
+
+
+@pytest.fixture
+def client() -> Iterator[UsersClient]:
+    """Клиент заглушки Users сервиса"""
+    with FakeUsersService() as service, UsersClient(host=service.url) as session:
+        yield session
+
+
+def test_histogram_percentiles():
+    """Перцентили считаются с погрешностью не больше процента, память не зависит от числа значений"""
+    histogram = LatencyHistogram()
+    for value in range(1, 10_001):
+        histogram.record(value / 1000)
+
+    summary = histogram.as_dict()
+    assert summary["count"] == 10_000
+    assert summary["p50"] == pytest.approx(5000, rel=0.01)
+    assert summary["p99"] == pytest.approx(9900, rel=0.01)
+    assert summary["max"] == pytest.approx(10_000)
+
+
+def test_load_runner_mix(client: UsersClient):
+    """Нагрузка по смеси операций с заданным RPS собирает задержки и ошибки по операциям"""
+
+    def _get_user(request: Request, context: LoadContext) -> Request | None:
+        user_id = context.choice("user_id")
+        return None if user_id is None else request.path(user_id=user_id)
+
+    operations = [
+        Operation(
+            route="post.create_user",
+            status=HTTPStatus.CREATED,
+            prepare=lambda request, context: request.body(_data=UserCreate.generate().model_dump()),
+            collect=lambda response, context: context.remember("user_id", response.json()["id"]),
+        ),
+        Operation(route="get.get_user", weight=3, prepare=_get_user),
+        Operation(route="get.get_order", prepare=lambda request, context: request.path(order_id=404)),
+    ]
+    report = LoadRunner(client, operations, rps=200, concurrency=4, duration=0.5, ramp_up=0.2).run()
+
+    stats = report.operations
+    assert 50 < report.total <= 100
+    assert stats["post.create_user"].count and not stats["post.create_user"].errors
+    assert stats["get.get_user"].latency.count == stats["get.get_user"].count
+    assert stats["get.get_order"].errors["404"] == stats["get.get_order"].count
+    assert "total" in str(report)
+
+
+def test_load_runner_counts_operation_exceptions(client: UsersClient):
+    """Исключения prepare и collect учитываются ошибками операции, потоки нагрузки не падают"""
+
+    def _broken_prepare(request: Request, context: LoadContext) -> Request | None:
+        raise KeyError("user_id")
+
+    operations = [
+        Operation(route="get.get_user", prepare=_broken_prepare),
+        Operation(route="get.get_users", collect=lambda response, context: response.json()["missing"]),
+    ]
+    stats = LoadRunner(client, operations, rps=100, concurrency=2, duration=0.2).run().operations
+
+    assert stats["get.get_user"].count and stats["get.get_user"].errors["KeyError"] == stats["get.get_user"].count
+    assert stats["get.get_users"].count and stats["get.get_users"].errors["TypeError"] == stats["get.get_users"].count
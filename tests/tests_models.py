@@ -0,0 +1,39 @@
+from typing import Iterator
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import Connection, create_engine, text
+
+from src.models import OrderResponse, UserResponse
+
+
+@pytest.fixture(scope="module")
+def connection() -> Iterator[Connection]:
+    """Соединение с sqlite в памяти с таблицей users"""
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, email TEXT, age INTEGER)"))
+        connection.execute(
+            text("INSERT INTO users VALUES (1, 'alice', 'alice@example.com', 30), (2, 'bob', 'not-an-email', 40)")
+        )
+        yield connection
+    engine.dispose()
+
+
+def test_row_is_mapped_by_column_names(connection: Connection):
+    """Колонки сопоставляются с полями по именам, лишние колонки пропускаются, кортеж - по порядку полей"""
+    row = connection.execute(text("SELECT age, 'x' AS extra, username, email, id FROM users WHERE id = 1")).one()
+
+    assert UserResponse.from_db_tuple(row) == UserResponse(id=1, username="alice", email="alice@example.com", age=30)
+    assert OrderResponse.from_db_tuple((1, 2, "book", 3)).product_name == "book"
+
+
+def test_from_db_rows_trusted_skips_validation(connection: Connection):
+    """Пакетное создание моделей, trusted режим не валидирует данные"""
+    query = text("SELECT email, id, username, age FROM users ORDER BY id")
+
+    users = UserResponse.from_db_rows(connection.execute(query), trusted=True)
+    assert [(user.id, user.email) for user in users] == [(1, "alice@example.com"), (2, "not-an-email")]
+    with pytest.raises(ValidationError, match="email"):
+        UserResponse.from_db_rows(connection.execute(query))
+    assert UserResponse.from_db_rows([]) == []
@@ -0,0 +1,193 @@
+# mypy: disable-error-code="empty-body"
+import threading
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Iterator
+
+import pytest
+
+from clients import (
+    CursorPagination,
+    Handler,
+    LinkPagination,
+    OffsetPagination,
+    PagePagination,
+    Pagination,
+    Request,
+    register_decoder,
+)
+from clients._json import DECODERS
+from clients._meta import MetaCategory, category, request
+from clients._session import Session
+from src.models import UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+
+TOTAL = 95
+LIMIT = 10
+# Путь списка для каждого вида пагинации
+PATHS = {"page": "/users/pages", "offset": "/users/offsets", "cursor": "/users/cursor", "link": "/users/links"}
+
+
+class PagesGet(MetaCategory):
+    """Get запросы списков с разной пагинацией"""
+
+    @request.get("/users/pages")
+    def by_page(self) -> Request:
+        """?page=1&limit=10"""
+
+    @request.get("/users/offsets")
+    def by_offset(self) -> Request:
+        """?offset=0&limit=10"""
+
+    @request.get("/users/cursor")
+    def by_cursor(self) -> Request:
+        """{"items": [...], "next_cursor": "..."}"""
+
+    @request.get("/users/links")
+    def by_link(self) -> Request:
+        """Заголовок Link со ссылкой на следующую страницу"""
+
+
+class PagesClient(Session):
+    """Клиент заглушки списков"""
+
+    @category(PagesGet)
+    def get(self) -> PagesGet:
+        """GET Requests"""
+
+
+def _user(user_id: int) -> dict:
+    return {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com", "age": 30}
+
+
+class _Users:
+    """Заглушка списка пользователей со всеми видами пагинации: page, offset, cursor, link"""
+
+    def __init__(self, server: StubServer):
+        self.users = [_user(user_id) for user_id in range(TOTAL)]
+        self.fetched: list[dict] = []
+        self.broken_page: int | None = None
+        self.changed = threading.Condition()
+        self.url = server.url
+        for kind, path in PATHS.items():
+            server.route("GET", path)(partial(self.handle, kind))
+
+    def wait_fetched(self, count: int, timeout: float) -> bool:
+        """Дождаться запроса count страниц"""
+        with self.changed:
+            return self.changed.wait_for(lambda: len(self.fetched) >= count, timeout)
+
+    def handle(self, kind: str, request: StubRequest) -> StubResponse:
+        query = {key: values[0] for key, values in request.query.items()}
+        with self.changed:
+            self.fetched.append(query)
+            self.changed.notify_all()
+        limit = int(query.get("limit", LIMIT))
+        page = int(query.get("page", 1))
+        if kind in ("page", "link") and page == self.broken_page:
+            return StubResponse(status=HTTPStatus.INTERNAL_SERVER_ERROR)
+        start = self._start(kind, query, limit)
+        end = start + limit
+        items = self.users[start:end]
+        if kind == "cursor":
+            return StubResponse(body={"items": items, "next_cursor": str(end) if end < TOTAL else None})
+        headers = {}
+        if kind == "link" and end < TOTAL:
+            headers["Link"] = f'<{self.url}{PATHS["link"]}?page={page + 1}&limit={limit}>; rel="next"'
+        return StubResponse(body=items, headers=headers)
+
+    @staticmethod
+    def _start(kind: str, query: dict[str, str], limit: int) -> int:
+        """Индекс первого элемента страницы"""
+        if kind == "cursor":
+            return int(query.get("cursor", 0))
+        if kind == "offset":
+            return int(query["offset"])
+        return (int(query.get("page", 1)) - 1) * limit
+
+
+@pytest.fixture
+def users() -> Iterator[_Users]:
+    """Заглушка со списком пользователей"""
+    server = StubServer()
+    stub = _Users(server)
+    with server:
+        yield stub
+
+
+@pytest.fixture
+def client(users: _Users) -> Iterator[PagesClient]:
+    """Клиент заглушки"""
+    with PagesClient(host=users.url) as session:
+        yield session
+
+
+@pytest.mark.parametrize(
+    "route, strategy",
+    [
+        ("by_page", PagePagination(limit=LIMIT)),
+        ("by_offset", OffsetPagination(limit=LIMIT)),
+        ("by_cursor", CursorPagination()),
+        ("by_link", LinkPagination(limit=LIMIT)),
+    ],
+)
+def test_paginate_all_strategies(client: PagesClient, users: _Users, route: str, strategy: Pagination):
+    """Все элементы всех страниц по порядку, страницы валидируются схемой"""
+    pages = getattr(client.get, route).paginate(HTTPStatus.OK, strategy, schema=UserResponse)
+    result = list(pages)
+
+    assert [user.id for user in result] == list(range(TOTAL))
+    assert all(isinstance(user, UserResponse) for user in result)
+    assert pages.pages == len(users.fetched) == 10
+
+
+def test_prefetch_is_bounded(client: PagesClient, users: _Users):
+    """Следующие страницы подгружаются в фоне, но не дальше prefetch"""
+    items = iter(client.get.by_page.paginate(HTTPStatus.OK, PagePagination(limit=LIMIT), prefetch=2))
+    assert next(items)["id"] == 0
+    assert users.wait_fetched(3, timeout=5)
+    # Четвертая страница не запрашивается, пока не обработана вторая
+    assert not users.wait_fetched(4, timeout=0.1)
+    assert sum(1 for _ in items) == TOTAL - 1
+    assert [int(query["page"]) for query in users.fetched] == list(range(1, 11))
+
+
+def test_page_status_is_checked(client: PagesClient, users: _Users):
+    """Неверный код страницы роняет обход после элементов предыдущих страниц, следующие не запрашиваются"""
+    users.broken_page = 3
+    seen = []
+    with pytest.raises(AssertionError, match="Expected: '200'. Actual: '500'"):
+        for user in client.get.by_page.paginate(HTTPStatus.OK, PagePagination(limit=LIMIT)):
+            seen.append(user["id"])
+    assert seen == list(range(2 * LIMIT))
+    assert len(users.fetched) == 3
+
+
+def test_early_stop_and_max_pages(client: PagesClient, users: _Users):
+    """Прерванный обход останавливает подгрузку, max_pages ограничивает число страниц"""
+    by_offset = client.get.by_offset
+    with by_offset.paginate(HTTPStatus.OK, OffsetPagination(limit=LIMIT)) as pages:
+        for _ in pages:
+            break
+    assert len(users.fetched) <= 2
+
+    users.fetched.clear()
+    assert len(list(by_offset.paginate(HTTPStatus.OK, OffsetPagination(limit=LIMIT), max_pages=3))) == 3 * LIMIT
+    assert len(users.fetched) == 3
+
+
+def test_pages_use_configured_decoder(client: PagesClient, monkeypatch: pytest.MonkeyPatch):
+    """Тело страницы разбирается декодером из Handler.decoder"""
+    calls = []
+
+    def _decoder(content: bytes) -> Any:
+        calls.append(content)
+        return [_user(len(calls))]
+
+    monkeypatch.setitem(DECODERS, "pages", None)
+    register_decoder("pages", _decoder)
+    monkeypatch.setattr(Handler, "decoder", "pages")
+    pages = client.get.by_page.paginate(HTTPStatus.OK, PagePagination(limit=1), max_pages=2)
+
+    assert [user["id"] for user in pages] == [1, 2]
+    assert len(calls) == 2
@@ -0,0 +1,70 @@
+from typing import Any, Iterator
+
+import pytest
+from allure_commons import hookimpl, plugin_manager
+
+from src.cases import ReportMode, report_mode, set_report_mode, step
+
+
+class _Recorder:
+    """Подписчик на степы, запоминающий их параметры"""
+
+    def __init__(self) -> None:
+        self.steps: list[tuple[str, dict[str, str]]] = []
+
+    @hookimpl
+    def start_step(self, uuid: Any, title: str, params: dict[str, str]) -> None:
+        """Start step"""
+        self.steps.append((title, params))
+
+    @hookimpl
+    def stop_step(self, uuid: Any, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Stop step"""
+
+
+@pytest.fixture
+def recorder() -> Iterator[_Recorder]:
+    """Подписчик на степы на время теста"""
+    listener = _Recorder()
+    plugin_manager.register(listener)
+    yield listener
+    plugin_manager.unregister(listener)
+
+
+def _steps() -> None:
+    with step("outer"):
+        with step("request", args={"json": "x" * 5000}):
+            with step("inner"):
+                pass
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [
+        (ReportMode.FULL, ["outer", "request", "inner"]),
+        (ReportMode.SUMMARY, ["outer", "request"]),
+        (ReportMode.OFF, []),
+    ],
+)
+def test_report_mode_filters_steps(recorder: _Recorder, mode: ReportMode, expected: list[str]):
+    """Режим отчета определяет, какие степы попадают в allure"""
+    with report_mode(mode):
+        _steps()
+
+    assert [title for title, _ in recorder.steps] == expected
+
+
+def test_step_parameters_are_capped(recorder: _Recorder):
+    """Параметры степа обрезаются до заданной длины, в summary режиме не формируются"""
+    set_report_mode(ReportMode.FULL, param_limit=100)
+    try:
+        _steps()
+        with report_mode(ReportMode.SUMMARY):
+            _steps()
+    finally:
+        set_report_mode(ReportMode.FULL, param_limit=1024)
+
+    full, summary = recorder.steps[1][1], recorder.steps[4][1]
+    assert full["args"].startswith("{'json': 'xxx") and full["args"].endswith("... (5012 total)")
+    assert len(full["args"]) < 130
+    assert not summary
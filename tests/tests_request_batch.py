@@ -0,0 +1,66 @@
+import time
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+
+from clients import RequestBatch, UsersClient
+from clients._batch import BatchStage
+from src.models import UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+from src.user_types import PoolSettings
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Заглушка users сервиса: пользователи с четным id не найдены"""
+    server = StubServer()
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        time.sleep(0.05)
+        user_id = int(request.params["user_id"])
+        if user_id % 2 == 0:
+            return StubResponse(status=HTTPStatus.NOT_FOUND, body={"error": "Not found"})
+        email = "broken" if user_id == 3 else f"user{user_id}@example.com"
+        return StubResponse(body={"id": user_id, "username": f"user{user_id}", "email": email, "age": 30})
+
+    with server:
+        yield server
+
+
+def test_batch_runs_in_parallel_and_keeps_order(stub_server: StubServer):
+    """Запросы пакета выполняются параллельно, результаты в порядке добавления"""
+    with UsersClient(host=stub_server.url) as client:
+        requests = [client.get.get_user.path(user_id=user_id) for user_id in (1, 5, 7, 9, 11, 13, 15, 17)]
+        start = time.monotonic()
+        results = RequestBatch(requests, status=HTTPStatus.OK, schema=UserResponse, workers=8).run()
+        elapsed = time.monotonic() - start
+
+    assert [item.result.id for item in results.raise_for_errors()] == [1, 5, 7, 9, 11, 13, 15, 17]
+    assert elapsed < 8 * 0.05 / 2
+
+
+def test_batch_collects_failures(stub_server: StubServer):
+    """Ошибки не прерывают пакет и собираются по этапам"""
+    with UsersClient(host=stub_server.url) as client:
+        batch = RequestBatch()
+        for user_id in (1, 2, 3):
+            batch.add(client.get.get_user.path(user_id=user_id), status=HTTPStatus.OK, schema=UserResponse)
+        results = batch.run()
+
+    assert [item.stage for item in results] == [None, BatchStage.STATUS, BatchStage.SCHEMA]
+    with pytest.raises(AssertionError, match="Batch errors 2/3"):
+        results.raise_for_errors()
+
+
+def test_batch_reuses_pooled_connections(stub_server: StubServer):
+    """Блокирующий пул ограничивает число соединений, остальные запросы их переиспользуют"""
+    with UsersClient(host=stub_server.url, pool=PoolSettings(maxsize=2, block=True)) as client:
+        requests = [client.get.get_user.path(user_id=1) for _ in range(8)]
+        RequestBatch(requests, status=HTTPStatus.OK, workers=8).run().raise_for_errors()
+        stats = client.pool_stats()[stub_server.url]
+
+    assert stats.opened <= 2
+    assert stats.reused == 8 - stats.opened
+    assert stub_server.connections == stats.opened
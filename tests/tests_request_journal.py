@@ -0,0 +1,50 @@
+import json
+import logging
+from http import HTTPStatus
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from clients import RequestJournal, UsersClient
+from src.stub import StubRequest, StubResponse, StubServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Заглушка с большим телом ответа"""
+    server = StubServer()
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        return StubResponse(body={"id": int(request.params["user_id"]), "payload": "x" * 10_000})
+
+    with server:
+        yield server
+
+
+def test_journal_keeps_truncated_ring_buffer(stub_server: StubServer, tmp_path: Path):
+    """В буфере хранятся только последние обмены с обрезанными телами, файл пишется в фоне"""
+    journal = RequestJournal(body_limit=100, buffer_size=3, path=tmp_path / "journal.jsonl")
+    with UsersClient(host=stub_server.url, request_journal=journal) as client:
+        for user_id in range(1, 6):
+            client.get.get_user.path(user_id=user_id)(status=HTTPStatus.OK)
+    journal.close()
+
+    assert [exchange.number for exchange in journal.exchanges()] == [3, 4, 5]
+    assert len(journal.exchanges()[0].body) == 100
+    assert "/users/5" in journal.dump(since=4) and "/users/4" not in journal.dump(since=4)
+    records = [json.loads(line) for line in (tmp_path / "journal.jsonl").read_text().splitlines()]
+    assert len(records) == 5
+    assert records[0]["body"].endswith("(10024 total)")
+
+
+def test_journal_skips_formatting_when_level_disabled(stub_server: StubServer, caplog: pytest.LogCaptureFixture):
+    """При выключенном уровне логирования тела не форматируются"""
+    journal = RequestJournal(level=logging.DEBUG, buffer_size=0)
+    caplog.set_level(logging.INFO, logger="clients")
+    with UsersClient(host=stub_server.url, request_journal=journal) as client:
+        client.get.get_user.path(user_id=1)(status=HTTPStatus.OK)
+
+    assert not [record for record in caplog.records if record.name == "clients"]
+    assert journal.dump() == ""
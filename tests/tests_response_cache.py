@@ -0,0 +1,74 @@
+import time
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+
+from clients import ResponseCache, UsersClient
+from src.models import UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Заглушка: пользователь с ETag, на совпадающий If-None-Match отвечает 304"""
+    server = StubServer()
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        user_id = request.params["user_id"]
+        etag = f'"user-{user_id}"'
+        if request.headers.get("If-None-Match") == etag:
+            return StubResponse(status=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        body = {"id": int(user_id), "username": "alice", "email": "alice@example.com", "age": 30}
+        return StubResponse(body=body, headers={"ETag": etag})
+
+    @server.route("POST", "/users")
+    def _create_user(request: StubRequest) -> StubResponse:
+        return StubResponse(status=HTTPStatus.CREATED, body=request.json())
+
+    with server:
+        yield server
+
+
+def test_cached_get_runs_checks(stub_server: StubServer):
+    """Повторный GET отдается из кеша, проверки кода и схемы выполняются на закешированном ответе"""
+    cache = ResponseCache(ttl=60)
+    with UsersClient(host=stub_server.url, cache=cache) as client:
+        users = [
+            client.get.get_user.path(user_id=11)(
+                status=HTTPStatus.OK, schema=UserResponse, strict=True, return_model=True
+            )
+            for _ in range(5)
+        ]
+        client.get.get_user.path(user_id=11).no_cache()(status=HTTPStatus.OK)
+        client.post.create_user.body(username="bob")(status=HTTPStatus.CREATED)
+        client.post.create_user.body(username="bob")(status=HTTPStatus.CREATED)
+        with pytest.raises(AssertionError, match="Status code error"):
+            client.get.get_user.path(user_id=11)(status=HTTPStatus.CREATED)
+
+    assert all(user.id == 11 for user in users)
+    assert stub_server.requests == 4
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.bypassed) == (5, 1, 2)
+
+
+def test_stale_entry_is_revalidated_and_evicted():
+    """Устаревшая запись ревалидируется по ETag, при превышении размера вытесняется самая старая"""
+    cache = ResponseCache(ttl=0.05, maxsize=2)
+    with StubServer() as server, UsersClient(host=server.url, cache=cache) as client:
+
+        @server.route("GET", "/users/{user_id}")
+        def _get_user(request: StubRequest) -> StubResponse:
+            if request.headers.get("If-None-Match") == '"v1"':
+                return StubResponse(status=HTTPStatus.NOT_MODIFIED)
+            return StubResponse(body={"id": int(request.params["user_id"])}, headers={"ETag": '"v1"'})
+
+        client.get.get_user.path(user_id=1)(status=HTTPStatus.OK)
+        time.sleep(0.06)
+        assert client.get.get_user.path(user_id=1)(status=HTTPStatus.OK).id == 1
+        assert client.get.get_user.path(user_id=1)(status=HTTPStatus.OK).id == 1
+        client.get.get_user.path(user_id=2)(status=HTTPStatus.OK)
+        client.get.get_user.path(user_id=3)(status=HTTPStatus.OK)
+
+    assert (cache.stats.revalidated, cache.stats.hits, cache.stats.evictions) == (1, 1, 1)
+    assert len(cache) == 2
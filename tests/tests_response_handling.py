@@ -0,0 +1,91 @@
+from http import HTTPStatus
+from typing import Any, Iterator
+
+import pytest
+from requests import Response
+
+from clients import Handler, JsonListView, JsonView, UsersClient, register_decoder
+from clients._json import DECODERS
+from src.models import UserError, UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Заглушка users сервиса"""
+    server = StubServer()
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        user_id = int(request.params["user_id"])
+        return StubResponse(body={"id": user_id, "username": f"user{user_id}", "email": "u@example.com", "age": 30})
+
+    @server.route("GET", "/orders/{order_id}")
+    def _get_orders(request: StubRequest) -> StubResponse:
+        return StubResponse(body=[{"id": i, "user": {"id": 1}} for i in range(3)])
+
+    with server:
+        yield server
+
+
+@pytest.fixture
+def client(stub_server: StubServer) -> Iterator[UsersClient]:
+    """Клиент заглушки"""
+    with UsersClient(host=stub_server.url) as session:
+        yield session
+
+
+def test_lazy_handler_gives_dot_access(client: UsersClient):
+    """Ленивое представление дает доступ через точку без полного оборачивания"""
+    orders = client.get.get_order.path(order_id=1)(status=HTTPStatus.OK, handler="lazy")
+
+    assert isinstance(orders, JsonListView)
+    assert isinstance(orders[1], JsonView)
+    assert orders[1].user.id == 1
+    assert orders[2]["user.id"] == 1
+    assert orders.to_list()[0] == {"id": 0, "user": {"id": 1}}
+
+
+def test_registered_handler_and_decoder(client: UsersClient, monkeypatch: pytest.MonkeyPatch):
+    """Зарегистрированные обработчик и декодер доступны по имени"""
+    # Регистрации снимаются после теста
+    monkeypatch.setattr(Handler, "user_id", None, raising=False)
+    monkeypatch.setitem(DECODERS, "test", None)
+    calls = []
+
+    def _decoder(content: bytes) -> Any:
+        calls.append(content)
+        return {"decoded": True}
+
+    @Handler.register("user_id")
+    def _user_id(response: Response) -> int:
+        return Handler.raw(response)["id"]
+
+    register_decoder("test", _decoder)
+    assert client.get.get_user.path(user_id=7)(status=HTTPStatus.OK, handler="user_id") == 7
+
+    monkeypatch.setattr(Handler, "decoder", "test")
+    assert client.get.get_user.path(user_id=7)(status=HTTPStatus.OK).decoded is True
+    assert calls
+
+
+@pytest.mark.parametrize("handler", [None, Handler.json, "lazy"])
+def test_schema_returns_model(client: UsersClient, handler: Any):
+    """Схема валидирует ответ и возвращает модель независимо от хендлера"""
+    user = client.get.get_user.path(user_id=3)(
+        status=HTTPStatus.OK,
+        handler=handler,
+        schema=UserResponse,
+        return_model=True,
+    )
+
+    assert user == UserResponse(id=3, username="user3", email="u@example.com", age=30)
+
+
+def test_list_schema_and_strict_mode(client: UsersClient):
+    """Списочная схема [Model] валидирует каждый элемент, strict режим падает на ошибке"""
+    request = client.get.get_order.path(order_id=1)
+
+    assert request(status=HTTPStatus.OK, schema=[UserError], return_model=True) is None
+    with pytest.raises(AssertionError, match="Schema error"):
+        request(status=HTTPStatus.OK, schema=[UserError], strict=True)
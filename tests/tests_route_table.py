@@ -0,0 +1,38 @@
+from clients import AsyncUsersClient, Request, UsersClient
+from clients._route import compile_path
+
+
+def test_route_table_is_built_at_class_creation():
+    """Таблица маршрутов клиента собирается из декораторов категорий"""
+    table = UsersClient.route_table
+
+    assert table.endpoints == {
+        "get.get_users": "/users",
+        "get.get_user": "/users/{user_id}",
+        "get.get_order": "/orders/{order_id}",
+        "post.create_user": "/users",
+        "post.create_order": "/orders",
+    }
+    assert table.methods["post.create_order"] == "POST"
+    assert table.placeholders["get.get_user"] == ("user_id",)
+    assert AsyncUsersClient.route_table.endpoints == table.endpoints
+
+
+def test_categories_are_cached_and_routes_resolved():
+    """Объекты категорий создаются один раз на сессию, маршрут доступен по имени"""
+    client = UsersClient(host="http://localhost")
+
+    assert client.get is client.get
+    assert UsersClient(host="http://localhost").get is not client.get
+    request = client.route("get.get_user")
+    assert isinstance(request, Request)
+    assert request.endpoint == "/users/{user_id}"
+
+
+def test_compiled_path_template():
+    """Скомпилированный шаблон подставляет значения и сохраняет неизвестные подстановки"""
+    template = compile_path("/users/{user_id}/orders/{order_id}")
+
+    assert template is compile_path("/users/{user_id}/orders/{order_id}")
+    assert template.placeholders == ("user_id", "order_id")
+    assert template.format({"user_id": 1}, {"user_id": 2}) == "/users/2/orders/{order_id}"
@@ -0,0 +1,43 @@
+import sys
+from argparse import Namespace
+
+import pytest
+
+import script
+
+
+def _run(argv: list[str], monkeypatch: pytest.MonkeyPatch) -> tuple[str, ...]:
+    """Выполнить команду script.py, вернув запущенную команду скрипта"""
+    calls = []
+    monkeypatch.setattr(script.subprocess, "run", lambda cmd, *args, **kwargs: calls.append(tuple(cmd)))
+    args: Namespace = script.parse(argv)
+    args.func(args)
+    assert len(calls) == 1
+    return calls[0]
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["load", "--rps", "200", "--mix", "get.get_user=1"],
+        ["load", "--", "--rps", "200", "--mix", "get.get_user=1"],
+    ],
+)
+def test_load_forwards_options(argv: list[str], monkeypatch: pytest.MonkeyPatch):
+    """Параметры load передаются dev_scripts/load.py как есть, с разделителем -- и без"""
+    command = _run(argv, monkeypatch)
+    assert command[-5].endswith("load.py")
+    assert command[-4:] == ("--rps", "200", "--mix", "get.get_user=1")
+
+
+@pytest.mark.parametrize("argv", [["imports", "--", "clients", "--top", "5"], ["imports", "clients", "--top", "5"]])
+def test_imports_reports_modules(argv: list[str], monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture):
+    """imports передает модули dev_scripts/import_time.py без разделителя -- и скрипт строит отчет"""
+    command = _run(argv, monkeypatch)
+    assert command[-3:] == ("clients", "--top", "5")
+    monkeypatch.undo()
+    start = command.index("python") + 1
+    script.subprocess.run((sys.executable, *command[start:]), check=True)
+    report = capfd.readouterr().out
+    assert report.startswith("Total: ")
+    assert "  clients\n" in report
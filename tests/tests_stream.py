@@ -0,0 +1,119 @@
+# mypy: disable-error-code="empty-body"
+import json
+import tracemalloc
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+
+from clients import Request, ResponseCache, StreamError, iter_json_array
+from clients._meta import MetaCategory, category, request
+from clients._session import Session
+from src.models import UserResponse
+from src.stub import StubRequest, StubResponse, StubServer
+
+USERS = 5_000
+
+
+class ListGet(MetaCategory):
+    """Get запросы списков"""
+
+    @request.get("/users")
+    def list_users(self) -> Request:
+        """Все пользователи одним json массивом"""
+
+
+class ListClient(Session):
+    """Клиент заглушки со списком пользователей"""
+
+    @category(ListGet)
+    def get(self) -> ListGet:
+        """GET Requests"""
+
+
+def _user(user_id: int) -> dict:
+    return {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com", "age": 30}
+
+
+def _chunks(data: bytes, size: int) -> Iterator[bytes]:
+    for start in range(0, len(data), size):
+        end = start + size
+        yield data[start:end]
+
+
+@pytest.fixture
+def client() -> Iterator[ListClient]:
+    """Клиент заглушки, отдающей большой список пользователей с одним невалидным"""
+    server = StubServer()
+    users = [_user(user_id) for user_id in range(USERS)]
+    users[7]["age"] = "old"
+    body = json.dumps(users).encode("utf-8")
+
+    @server.route("GET", "/users")
+    def _list(request: StubRequest) -> StubResponse:
+        return StubResponse(body=body)
+
+    with server, ListClient(host=server.url, cache=ResponseCache()) as session:
+        yield session
+
+
+@pytest.mark.parametrize("size", [1, 3, 4096])
+def test_iter_json_array_any_chunk_boundaries(size: int):
+    """Элементы, числа и многобайтные символы на границах чанков разбираются целиком"""
+    data = [12345, -1.5e3, "привет", {"a": [1, {"b": None}]}, [], True, False, None, '"]']
+    raw = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+    assert list(iter_json_array(_chunks(raw, size))) == data
+    assert list(iter_json_array([b" [ ] "])) == []
+
+
+@pytest.mark.parametrize("raw", [b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1] 2", b'[{"a": ]'])
+def test_iter_json_array_errors(raw: bytes):
+    """Не массив и оборванный массив дают StreamError"""
+    with pytest.raises(StreamError):
+        list(iter_json_array(_chunks(raw, 2)))
+
+
+def test_iter_items_validates_each_item(client: ListClient):
+    """Элементы приходят моделями, невалидный пропускается и попадает в статистику"""
+    list_users = client.get.list_users
+    users = list_users.iter_items(HTTPStatus.OK, schema=UserResponse, chunk_size=1024)
+
+    first = next(users)
+    assert isinstance(first, UserResponse) and first.id == 0
+    assert sum(1 for _ in users) == USERS - 2
+    assert list_users.last_response.raw.closed
+    stats = list_users.stream_stats
+    assert (stats.items, stats.invalid, stats.valid) == (USERS, 1, USERS - 1)
+    assert stats.errors[0].startswith("[7] Ошибка в поле 'age'")
+
+
+def test_iter_items_keeps_request_unchanged(client: ListClient):
+    """Потоковая отправка идет копией: обычные вызовы того же запроса по-прежнему кешируются"""
+    list_users = client.get.list_users
+    assert sum(1 for _ in list_users.iter_items(HTTPStatus.OK)) == USERS
+    list_users(status=HTTPStatus.OK)
+    list_users(status=HTTPStatus.OK)
+
+    assert client.cache is not None
+    assert client.cache.stats.hits == 1
+
+
+def test_iter_items_strict(client: ListClient):
+    """strict - падение на первом невалидном элементе"""
+    users = client.get.list_users.iter_items(HTTPStatus.OK, schema=[UserResponse], strict=True)
+    with pytest.raises(AssertionError, match="Schema error"):
+        list(users)
+
+
+def test_stream_summary_memory_is_flat(client: ListClient):
+    """Пиковая память разбора зависит от размера чанка, а не от размера тела ответа"""
+    # Прогрев: ленивые импорты валидатора email и соединения не относятся к разбору
+    client.get.list_users.stream_summary(HTTPStatus.OK, schema=UserResponse)
+    tracemalloc.start()
+    try:
+        stats = client.get.list_users.stream_summary(HTTPStatus.OK, schema=UserResponse, chunk_size=8192)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert stats.valid == USERS - 1
+    assert peak < stats.bytes / 4, f"peak {peak} of {stats.bytes} bytes"
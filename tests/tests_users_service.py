@@ -17,18 +17,19 @@ def test_creating_user_and_saving_to_db(
         request = not_authorize_users_client.post.create_user.body(
             _data=user_data,
         )
-        request(
+        user = request(
             status=HTTPStatus.CREATED,
             step_name="Создать пользователя",
             schema=UserResponse,
             handler=None,
+            strict=True,
+            return_model=True,
         )
 
     with step("Проверить, что пользователь сохранен в базе данных"):
-        # Данные из БД возвращаются в виде кортежа
-        user_from_db = db_client.get_user_by_id(user_data.id)
-        db_user = UserResponse.from_db_tuple(db_tuple=user_from_db)
-        assert db_user == user_data
+        db_user = db_client.get_user_by_id(user.id)
+        assert db_user == user
+        assert db_user.model_dump(exclude={"id"}) == user_data.model_dump()
 
 
 @case(id=1002, title="Проверка обработки ошибки при создании пользователя с дублирующимся username")
@@ -43,16 +44,17 @@ def test_creating_user_with_duplicate_username(
         request = not_authorize_users_client.post.create_user.body(
             _data=user_data,
         )
-        request(
+        user = request(
             status=HTTPStatus.CREATED,
             step_name="Создать пользователя",
             schema=UserResponse,
             handler=None,
+            strict=True,
+            return_model=True,
         )
     with step("Проверить, что пользователь сохранен в базе данных"):
-        user_from_db = db_client.get_user_by_id(user_data.id)
-        db_user = UserResponse.from_db_tuple(db_tuple=user_from_db)
-        assert db_user == user_data
+        db_user = db_client.get_user_by_id(user.id)
+        assert db_user == user
 
     with step("Попытаться создать пользователя с таким же username"):
         duplicate_name_user_data = user_data
@@ -76,26 +78,30 @@ def test_creating_user_with_duplicate_username(
 def test_creating_order(
     not_authorize_users_client: UsersClient,
     db_client: DataBaseClient,
+    worker_user_ids: list[int],
 ):
     """Тест на создание заказа через API и проверку сохранения данных в БД"""
 
     order_data = OrderCreate.generate(
-        user_id=1,
+        user_id=worker_user_ids[0],
     )
     with step("Создать заказ через API"):
         request = not_authorize_users_client.post.create_order.body(
             _data=order_data,
         )
-        request(
+        order = request(
             status=HTTPStatus.CREATED,
             step_name="Создать заказ",
             schema=OrderResponse,
             handler=None,
+            strict=True,
+            return_model=True,
         )
 
     with step("Проверить, что заказ сохранен в базе данных"):
-        order_from_db = db_client.get_order_by_id(order_data.id)  # type: ignore
-        assert order_from_db == order_data
+        order_from_db = db_client.get_order_by_id(order.id)
+        assert order_from_db == order
+        assert order_from_db.model_dump(exclude={"id"}) == order_data.model_dump()
 
 
 @case(id=1004, title="Проверка получения информации о пользователе по ID")
@@ -108,14 +114,15 @@ def test_get_user_by_id(
     user_id = 11  # Предполагаем, что пользователь с таким ID существует в базе данных
 
     with step("Получить информацию о пользователе через API"):
-        request = not_authorize_users_client.get.user_by_id(user_id=user_id)
-        response = request(
+        request = not_authorize_users_client.get.get_user.path(user_id=user_id)
+        user_data = request(
             status=HTTPStatus.OK,
             step_name="Получить информацию о пользователе",
             schema=UserResponse,
             handler=None,
+            strict=True,
+            return_model=True,
         )
-        user_data = UserResponse(**response.json())
 
     with step("Проверить, что данные пользователя корректны"):
         user_from_db = db_client.get_user_by_id(user_id)
@@ -133,13 +140,14 @@ def test_get_order_by_id(
 
     with step("Получить информацию о заказе через API"):
         request = not_authorize_users_client.get.get_order.path(order_id=order_id)
-        response = request(
+        order_data = request(
             status=HTTPStatus.OK,
             step_name="Получить информацию о заказе",
             schema=OrderResponse,
             handler=None,
+            strict=True,
+            return_model=True,
         )
-        order_data = OrderResponse(**response.json())
 
     with step("Проверить, что данные заказа корректны"):
         order_from_db = db_client.get_order_by_id(order_id)
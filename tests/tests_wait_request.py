@@ -0,0 +1,119 @@
+import time
+from http import HTTPStatus
+from typing import Iterator
+
+import pytest
+
+from clients import (
+    ExponentialBackoff,
+    FastThenSlow,
+    RetryAfter,
+    UsersClient,
+    WaitRequestError,
+    WaitStrategy,
+    wait_all,
+    wait_any,
+)
+from src.stub import StubRequest, StubResponse, StubServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """Заглушка: пользователь появляется с третьего запроса, до этого 404 с Retry-After"""
+    server = StubServer()
+    calls: dict[str, int] = {}
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        user_id = request.params["user_id"]
+        calls[user_id] = calls.get(user_id, 0) + 1
+        if user_id == "0" or calls[user_id] < 3:
+            return StubResponse(status=HTTPStatus.NOT_FOUND, body={"error": "Not found"}, headers={"Retry-After": "0"})
+        return StubResponse(body={"id": int(user_id)})
+
+    with server:
+        yield server
+
+
+@pytest.fixture
+def client(stub_server: StubServer) -> Iterator[UsersClient]:
+    """Клиент заглушки"""
+    with UsersClient(host=stub_server.url) as session:
+        yield session
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [ExponentialBackoff(initial=0.01, max_delay=0.05), FastThenSlow(fast=0.01, slow=1), RetryAfter()],
+    ids=repr,
+)
+def test_wait_strategy_collects_stats(client: UsersClient, strategy):
+    """Стратегия определяет паузы, ожидание сохраняет статистику"""
+    wait = client.get.get_user.path(user_id=1).wait(lambda user: user.id == 1, timeout=5, strategy=strategy)
+    wait(status=HTTPStatus.OK)
+
+    assert wait.stats.attempts == 3
+    assert wait.stats.success
+    assert wait.stats.waited < 0.2
+    assert wait.stats.time_to_success == wait.stats.elapsed
+
+
+def test_wait_does_not_overshoot_timeout(client: UsersClient):
+    """Пауза ограничена оставшимся временем, после дедлайна выполняется последняя попытка"""
+    wait = client.get.get_user.path(user_id=0).wait(lambda user: True, timeout=0.3, interval=10)
+    start = time.monotonic()
+    with pytest.raises(AssertionError, match="Status code error"):
+        wait(status=HTTPStatus.OK)
+
+    assert time.monotonic() - start < 1
+    assert wait.stats.attempts == 2
+    assert not wait.stats.success
+
+
+def test_wait_error_message(client: UsersClient):
+    """Непрошедшая проверка поднимает WaitRequestError с сообщением"""
+    wait = client.get.get_user.path(user_id=5).wait(lambda user: False, timeout=0.1, interval=0.01, err_msg="never")
+    with pytest.raises(WaitRequestError, match="never"):
+        wait(status=HTTPStatus.OK)
+
+
+def test_wait_all_polls_targets_concurrently(client: UsersClient, stub_server: StubServer):
+    """Цели опрашиваются по общему расписанию, готовые исключаются из опроса"""
+    waits = [client.get.get_user.path(user_id=user_id).wait(lambda user: True) for user_id in range(1, 21)]
+    start = time.monotonic()
+    users = wait_all(*waits, status=HTTPStatus.OK, timeout=5, strategy=ExponentialBackoff(initial=0.05, jitter=0))
+
+    assert [user.id for user in users] == list(range(1, 21))
+    assert time.monotonic() - start < 1
+    assert stub_server.requests == 20 * 3
+    assert all(wait.stats.attempts == 3 and wait.stats.success for wait in waits)
+
+
+def test_wait_any_and_convergence_report(client: UsersClient):
+    """wait_any возвращает первую готовую цель, wait_all сообщает о несошедшихся целях"""
+    never = client.get.get_user.path(user_id=0).wait(lambda user: True, interval=0.05)
+    ready = client.get.get_user.path(user_id=7).wait(lambda user: True, interval=0.05)
+
+    assert wait_any(never, ready, status=HTTPStatus.OK, timeout=2, return_result=True) == (1, True)
+    with pytest.raises(WaitRequestError, match=r"did not converge 1/2:\n.*/users/\{user_id\}.*404"):
+        wait_all(ready, never, status=HTTPStatus.OK, timeout=0.2)
+
+
+def test_wait_group_pauses_by_pending_target_response():
+    """Пауза группы берет Retry-After из ответа неготовой цели, а не из ответа уже готовой"""
+    server = StubServer()
+    calls: list[str] = []
+
+    @server.route("GET", "/users/{user_id}")
+    def _get_user(request: StubRequest) -> StubResponse:
+        calls.append(request.params["user_id"])
+        if request.params["user_id"] == "0" and calls.count("0") < 2:
+            return StubResponse(status=HTTPStatus.NOT_FOUND, headers={"Retry-After": "0"})
+        return StubResponse(body={"id": int(request.params["user_id"])})
+
+    with server, UsersClient(host=server.url) as client:
+        waits = [client.get.get_user.path(user_id=user_id).wait(lambda user: True) for user_id in range(2)]
+        start = time.monotonic()
+        wait_all(*waits, status=HTTPStatus.OK, timeout=5, strategy=RetryAfter(fallback=WaitStrategy(interval=2)))
+
+    assert time.monotonic() - start < 1
@@ -0,0 +1,47 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.workers import Rendezvous, id_range, partition, worker_count, worker_index
+
+
+def _setup(root: Path) -> dict:
+    """Настройка, считающая свои запуски в файле"""
+    counter = root / "calls"
+
+    def func() -> dict:
+        with counter.open("a", encoding="utf-8") as file:
+            file.write("1")
+        return {"ids": [1, 2, 3]}
+
+    return Rendezvous(root).run_once("seed", func)
+
+
+@pytest.mark.parametrize("worker, expected", [("gw0", [0, 3, 6, 9]), ("gw2", [2, 5, 8])])
+def test_partition(monkeypatch: pytest.MonkeyPatch, worker: str, expected: list[int]):
+    """Данные делятся между воркерами без пересечений"""
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER_COUNT", "3")
+    assert worker_count() == 3
+    assert list(partition(range(10))) == expected
+
+
+def test_id_range(monkeypatch: pytest.MonkeyPatch):
+    """Без xdist - весь диапазон с начала, у воркеров - свой отрезок"""
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER_COUNT", raising=False)
+    assert (worker_index(), worker_count()) == (0, 1)
+    assert id_range(100) == range(1, 101)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert id_range(100, start=1000) == range(1300, 1400)
+
+
+def test_run_once_across_processes(tmp_path: Path):
+    """Настройку выполняет один процесс, остальные получают ее результат"""
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_setup, [tmp_path] * 8))
+    assert results == [{"ids": [1, 2, 3]}] * 8
+    assert (tmp_path / "calls").read_text(encoding="utf-8") == "1"
+    assert json.loads((tmp_path / "seed.json").read_text(encoding="utf-8")) == {"ids": [1, 2, 3]}